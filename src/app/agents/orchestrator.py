@@ -7,6 +7,7 @@ import json
 import logging
 import re
 import time
+from pathlib import Path
 from typing import TYPE_CHECKING, Protocol
 
 from app.agents.tailor import TailorAgent
@@ -29,7 +30,7 @@ from app.schemas import (
     TailorInput,
     TailorOutput,
 )
-from app.services.llm import LLMService
+from app.services.llm import LLMService, get_llm_service
 
 
 if TYPE_CHECKING:
@@ -41,6 +42,9 @@ if TYPE_CHECKING:
 MAX_ROMA_DEPTH = 5
 logger = logging.getLogger(__name__)
 
+_TOPIC_SEPARATOR = re.compile(r"\band\b|\bvs\b|\bversus\b", re.IGNORECASE)
+_TOPIC_PREFIX = re.compile(r"^(compare|versus|vs)\s+", re.IGNORECASE)
+
 
 def _summary_formatting_instructions() -> str:
     return (
@@ -50,8 +54,9 @@ def _summary_formatting_instructions() -> str:
 
 
 def _summary_min_citations(contexts: Sequence[RetrievedContext]) -> int:
+    # str.split() breaks on the same whitespace as r"\s+" without the regex.
     unique_content = {
-        re.sub(r"\s+", " ", context.content).strip().lower()
+        " ".join(context.content.lower().split())
         for context in contexts
         if context.content and context.content.strip()
     }
@@ -100,15 +105,13 @@ class ROMAOrchestrator:
         state_store: dict[str, ConversationState] | None = None,
         max_depth: int = MAX_ROMA_DEPTH,
     ) -> None:
-        from pathlib import Path
-
         self._guardrails = guardrails or GuardrailsAgent()
         # MemoryAgent requires db_path parameter - use default if not provided
         self._memory_agent = memory_agent or MemoryAgent(
             db_path=str(Path.cwd() / "data" / "lancedb")
         )
         self._tailor_agent = tailor_agent or TailorAgent()
-        self._llm_service = llm_service or LLMService()
+        self._llm_service = llm_service or get_llm_service()
         self._stream_chunk_pause = stream_chunk_pause_ms / 1000
         self._state_store = state_store or {}
         self._max_depth = max_depth
@@ -426,12 +429,9 @@ class ROMAOrchestrator:
         if not any(keyword in lowered for keyword in ("compare", " vs ", " versus ")):
             return []
 
-        parts = re.split(r"\band\b|\bvs\b|\bversus\b", query, flags=re.IGNORECASE)
         topics: list[str] = []
-        for part in parts:
-            cleaned = re.sub(
-                r"^(compare|versus|vs)\s+", "", part.strip(), flags=re.IGNORECASE
-            )
+        for part in _TOPIC_SEPARATOR.split(query):
+            cleaned = _TOPIC_PREFIX.sub("", part.strip(), count=1)
             if cleaned:
                 topics.append(cleaned)
         return topics[:5]
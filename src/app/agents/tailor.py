@@ -21,11 +21,14 @@ from app.schemas import (
     TailorInput,
     TailorOutput,
 )
-from app.services.llm import LLMService
+from app.services.llm import LLMService, get_llm_service
 
 
 logger = logging.getLogger(__name__)
 
+# Citation markers like [1], [2], etc.
+_CITATION_PATTERN = re.compile(r"\[(\d+)\]")
+
 
 class TailorAgent:
     """Persona-aware response synthesizer using LLM.
@@ -39,7 +42,7 @@ class TailorAgent:
         self, *, agent_id: str = "tailor", llm_service: LLMService | None = None
     ) -> None:
         self._agent_id = agent_id
-        self._llm_service = llm_service or LLMService()
+        self._llm_service = llm_service or get_llm_service()
 
     async def process(self, payload: TailorInput) -> TailorOutput:
         """Generate a grounded TailorOutput using LLM or raise AgentFailureError."""
@@ -192,9 +195,7 @@ Synthesize a grounded answer with citations."""
         self, response: str, chunks: list[RetrievedContext]
     ) -> list[SourceCitation]:
         """Extract citation markers from response and map to chunks."""
-        # Find all citation markers like [1], [2], etc.
-        citation_pattern = r"\[(\d+)\]"
-        matches = re.findall(citation_pattern, response)
+        matches = _CITATION_PATTERN.findall(response)
 
         citations: list[SourceCitation] = []
         seen_indices: set[int] = set()
@@ -283,7 +284,8 @@ def _deduplicate_context(chunks: Iterable[RetrievedContext]) -> list[RetrievedCo
     for chunk in chunks:
         if chunk.chunk_id in seen_ids:
             continue
-        normalized = re.sub(r"\s+", " ", chunk.content).strip().lower()
+        # Collapse whitespace runs and trim in one pass, without a regex.
+        normalized = " ".join(chunk.content.lower().split())
         if normalized in seen_content:
             continue
         seen_ids.add(chunk.chunk_id)
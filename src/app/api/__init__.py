@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import os
+import tempfile
 import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from functools import lru_cache
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, Literal, cast
+
+import pyarrow as pa  # type: ignore[import-untyped]
 
 from fastapi import (
     Depends,
@@ -14,17 +21,21 @@ from fastapi import (
     File,
     Header,
     HTTPException,
+    Query,
+    Request,
     UploadFile,
     status,
 )
 from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
 
 from app.agents import ROMAOrchestrator
+from app.api.middleware import UploadSizeLimitMiddleware
 from app.config import get_settings
 from app.exceptions import AgentFailureError
-from app.ingestion import IngestionService
+from app.ingestion import IngestionService, IngestItem
 from ingestion.dolphin import DolphinParser
 from app.memory import MemoryAgent
 from app.schemas import (
@@ -37,10 +48,11 @@ from app.schemas import (
     StreamEvent,
     TailorOutput,
 )
+from app.services.llm import close_llm_service
 
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, AsyncIterator
 
 
 logger = logging.getLogger(__name__)
@@ -48,6 +60,8 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 
 _UPLOAD_FILE_PARAM = File(...)
+_INSPECT_SAMPLE_SIZE = 5
+_INGEST_BATCH_MAX_JOBS = 8
 
 
 @lru_cache
@@ -62,7 +76,16 @@ def _get_memory_agent() -> MemoryAgent:
     # Use the /data volume mount for persistent storage
 
 
-    return MemoryAgent(db_path="/data/lancedb")
+    return MemoryAgent(
+
+
+        db_path="/data/lancedb",
+
+
+        quantized_index=settings.vector_index_quantized,
+
+
+    )
 
 
 
@@ -128,6 +151,56 @@ def _get_orchestrator() -> ROMAOrchestrator:
 
 
 
+async def _preload_embedding_model() -> None:
+    """Load the shared embedding model off the event loop before serving."""
+
+    try:
+        memory = await asyncio.to_thread(_get_memory_agent)
+        await asyncio.to_thread(memory.embedding_generator.preload)
+    except Exception:
+        # Serving can still start; the model loads lazily on first use.
+        logger.warning("Embedding model preload failed", exc_info=True)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Run a bounded ingestion worker pool for the lifetime of the app.
+
+    On shutdown, uploads already accepted get up to
+    ``ingest_drain_timeout_seconds`` to finish before the workers are
+    cancelled; any that do not are logged by task ID. The shared LLM
+    client's pooled connections are closed too.
+    """
+
+    await _preload_embedding_model()
+    queue = _IngestQueue(
+        maxsize=settings.ingest_queue_size,
+        max_bytes=settings.ingest_queue_max_bytes,
+    )
+    workers = [
+        asyncio.create_task(_ingest_worker(queue))
+        for _ in range(settings.ingest_concurrency)
+    ]
+    app.state.ingest_queue = queue
+    try:
+        yield
+    finally:
+        del app.state.ingest_queue
+        try:
+            await asyncio.wait_for(
+                queue.join(), timeout=settings.ingest_drain_timeout_seconds
+            )
+        except TimeoutError:
+            logger.warning(
+                "Ingestion queue not drained at shutdown; dropping tasks %s",
+                queue.pending_task_ids(),
+            )
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        await close_llm_service()
+
+
 app = FastAPI(
 
 
@@ -140,6 +213,16 @@ app = FastAPI(
     description="Multi-Source Agentic RAG System API",
 
 
+    lifespan=_lifespan,
+
+
+)
+
+
+# Registered before CORS so that 413 rejections still carry CORS headers.
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_upload_bytes=settings.max_upload_bytes,
 )
 
 
@@ -172,7 +255,6 @@ app.add_middleware(
 
 
 
-
 @app.get("/health", response_model=HealthStatus)
 
 
@@ -197,7 +279,7 @@ async def health() -> HealthStatus:
 
 
 
-@app.get("/inspect-database")
+@app.get("/inspect-database", response_model=None)
 
 
 async def inspect_database(
@@ -206,7 +288,10 @@ async def inspect_database(
     memory_agent: MemoryAgent = Depends(_get_memory_agent),
 
 
-) -> dict[str, Any]:
+    output_format: Literal["json", "arrow"] = Query(default="json", alias="format"),
+
+
+) -> dict[str, Any] | FileResponse:
 
 
     """
@@ -218,6 +303,15 @@ async def inspect_database(
     the data from the 'documents' table.
 
 
+    With ``?format=arrow`` the sample is written to an Arrow IPC stream on disk
+
+
+    and served via ``FileResponse`` so the bytes go out through ``sendfile``
+
+
+    instead of being JSON-encoded record by record.
+
+
     """
 
 
@@ -248,6 +342,15 @@ async def inspect_database(
 
 
 
+    if output_format == "arrow":
+
+
+        return _arrow_sample_response(table)
+
+
+
+
+
     # Get schema and convert to a readable string format
 
 
@@ -263,7 +366,7 @@ async def inspect_database(
     try:
 
 
-        sample_data = table.search().limit(5).to_list()
+        sample_data = table.search().limit(_INSPECT_SAMPLE_SIZE).to_list()
 
 
     except Exception as e:
@@ -320,10 +423,34 @@ async def inspect_database(
     }
 
 
+def _arrow_sample_response(table: Any) -> FileResponse:
+    """Serialize a table sample to an Arrow IPC stream file and serve it."""
 
+    try:
+        sample = table.search().limit(_INSPECT_SAMPLE_SIZE).to_arrow()
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to retrieve data from table. It might be empty. Error: {e}",
+        ) from e
+    if "embedding" in sample.column_names:
+        sample = sample.drop_columns(["embedding"])
 
-
-
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".arrow")  # noqa: SIM115
+    try:
+        with tmp, pa.ipc.new_stream(tmp, sample.schema) as writer:
+            writer.write_table(sample)
+
+        return FileResponse(
+            tmp.name,
+            media_type="application/vnd.apache.arrow.stream",
+            filename="documents_sample.arrow",
+            background=BackgroundTask(os.unlink, tmp.name),
+        )
+    except Exception:
+        # The background task only runs once the response is sent.
+        os.unlink(tmp.name)
+        raise
 
 
 @app.get("/memory/status", response_model=MemoryStatus)
@@ -407,18 +534,126 @@ async def _stream_sse(
 ) -> AsyncGenerator[str, None]:
     """Convert StreamEvent objects into SSE formatted strings."""
 
+    # Token streams yield thousands of events; bind lookups to locals once.
+    dumps = json.dumps
+    encode = jsonable_encoder
     async for event in events:
         data = event.data
-        serialized = (
-            data if isinstance(data, str) else json.dumps(jsonable_encoder(data))
-        )
+        # Exact type check: token payloads are plain str, never subclasses.
+        serialized = data if type(data) is str else dumps(encode(data))
         yield f"event: {event.event}\ndata: {serialized}\n\n"
 
 
-async def _noop_ingest_job(filename: str, size_bytes: int) -> None:
-    """Placeholder background ingestion task."""
+@dataclass(frozen=True, slots=True)
+class _IngestJob:
+    """An upload waiting to be parsed and indexed by the worker pool."""
+
+    task_id: str
+    filename: str
+    content: bytes
+    content_type: str
+
 
-    logger.debug("Ingested %s (%d bytes)", filename, size_bytes)
+class _IngestQueue(asyncio.Queue[_IngestJob]):
+    """Ingestion queue bounded by job count and by total upload bytes.
+
+    A job's bytes count from enqueue until the worker calls ``job_done``, so
+    uploads being processed still count against ``max_bytes``. A job is
+    always accepted while nothing else is held, whatever its size.
+    """
+
+    def __init__(self, maxsize: int, max_bytes: int) -> None:
+        super().__init__(maxsize=maxsize)
+        self._max_bytes = max_bytes
+        self._held_bytes = 0
+        self._accepted: dict[str, _IngestJob] = {}
+
+    def put_nowait(self, item: _IngestJob) -> None:
+        if self._held_bytes and self._held_bytes + len(item.content) > self._max_bytes:
+            raise asyncio.QueueFull
+        super().put_nowait(item)
+
+    def _put(self, item: _IngestJob) -> None:
+        super()._put(item)
+        self._accepted[item.task_id] = item
+        self._held_bytes += len(item.content)
+
+    def job_done(self, job: _IngestJob) -> None:
+        """Release a processed job's bytes and mark it done."""
+        del self._accepted[job.task_id]
+        self._held_bytes -= len(job.content)
+        self.task_done()
+
+    def pending_task_ids(self) -> list[str]:
+        """Return the IDs of accepted jobs that have not finished."""
+        return list(self._accepted)
+
+
+def _ingest_item(job: _IngestJob) -> IngestItem:
+    return IngestItem(
+        content=job.content,
+        filename=job.filename,
+        source_id=f"upload::{job.task_id}",
+        source_type="local",
+        extra_metadata={"content_type": job.content_type},
+    )
+
+
+async def _run_ingest_job(ingestion_service: IngestionService, job: _IngestJob) -> None:
+    """Parse and index a single upload."""
+
+    item = _ingest_item(job)
+    await ingestion_service.ingest_document(
+        content=item.content,
+        filename=item.filename,
+        source_id=item.source_id,
+        source_type=item.source_type,
+        extra_metadata=item.extra_metadata,
+    )
+
+
+async def _run_ingest_batch(
+    ingestion_service: IngestionService, jobs: list[_IngestJob]
+) -> None:
+    """Parse and index queued uploads with a single embedding pass."""
+
+    results = await ingestion_service.ingest_documents(
+        [_ingest_item(job) for job in jobs]
+    )
+    for job, result in zip(jobs, results, strict=True):
+        if isinstance(result, AgentFailure):
+            logger.warning(
+                "Ingestion task %s failed: %s::%s - %s",
+                job.task_id,
+                result.agent_id,
+                result.error_code,
+                result.message,
+            )
+        else:
+            logger.info("Ingested %s via task %s", job.filename, job.task_id)
+
+
+async def _ingest_worker(queue: _IngestQueue) -> None:
+    """Drain the ingestion queue until cancelled at shutdown.
+
+    Uploads already waiting when a worker wakes are taken together (up to
+    ``_INGEST_BATCH_MAX_JOBS``) so their chunks share one embedding pass. An
+    idle queue still hands a lone upload over immediately. The service is
+    resolved per batch so a failing factory is logged against that batch
+    rather than killing the worker.
+    """
+
+    while True:
+        jobs = [await queue.get()]
+        while len(jobs) < _INGEST_BATCH_MAX_JOBS and not queue.empty():
+            jobs.append(queue.get_nowait())
+        try:
+            await _run_ingest_batch(_get_ingestion_service(), jobs)
+        except Exception:
+            logger.exception("Ingestion batch %s crashed", [j.task_id for j in jobs])
+        finally:
+            for job in jobs:
+                queue.job_done(job)
 
 
 @app.post(
@@ -427,11 +662,11 @@ async def _noop_ingest_job(filename: str, size_bytes: int) -> None:
     response_model=IngestResponse,
 )
 async def ingest_document(
+    request: Request,
     file: UploadFile = _UPLOAD_FILE_PARAM,
     _: None = Depends(_authorize_ingest),
 ) -> IngestResponse:
     """Accept a file for asynchronous ingestion."""
-    ingestion_service = _get_ingestion_service()
 
     payload = await file.read()
     if not payload:
@@ -444,24 +679,42 @@ async def ingest_document(
             ),
         )
 
-    task_id = str(uuid.uuid4())
-    filename = file.filename or "upload.bin"
-    try:
-        await ingestion_service.ingest_document(
-            content=payload,
-            filename=filename,
-            source_id=f"upload::{task_id}",
-            source_type="local",
-            extra_metadata={
-                "content_type": file.content_type or "application/octet-stream"
-            },
+    job = _IngestJob(
+        task_id=str(uuid.uuid4()),
+        filename=file.filename or "upload.bin",
+        content=payload,
+        content_type=file.content_type or "application/octet-stream",
+    )
+
+    queue: _IngestQueue | None = getattr(
+        request.app.state, "ingest_queue", None
+    )
+    if queue is not None:
+        try:
+            queue.put_nowait(job)
+        except asyncio.QueueFull as exc:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=_agent_failure(
+                    agent_id="api.ingest",
+                    error_code=ErrorCodes.CONNECTOR_RATE_LIMIT,
+                    message="Ingestion queue is full; retry later.",
+                ),
+            ) from exc
+        return IngestResponse(
+            task_id=job.task_id, filename=job.filename, status="queued"
         )
+
+    # No worker pool (lifespan not run, e.g. in-process ASGI transports):
+    # ingest inline so parser errors still reach the caller.
+    try:
+        await _run_ingest_job(_get_ingestion_service(), job)
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=_agent_failure(
                 agent_id="api.ingest",
-                error_code=ErrorCodes.PARSER_UNSUPPORTED,
+                error_code=ErrorCodes.PARSER_INVALID_INPUT,
                 message=str(exc),
             ),
         ) from exc
@@ -471,5 +724,7 @@ async def ingest_document(
             detail=jsonable_encoder(exc.failure),
         ) from exc
 
-    logger.info("Ingested %s via task %s", filename, task_id)
-    return IngestResponse(task_id=task_id, filename=filename, status="queued")
+    logger.info("Ingested %s via task %s", job.filename, job.task_id)
+    return IngestResponse(
+        task_id=job.task_id, filename=job.filename, status="queued"
+    )
@@ -0,0 +1,83 @@
+"""ASGI middleware for the FastAPI application."""
+
+from __future__ import annotations
+
+import json
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from fastapi.encoders import jsonable_encoder
+
+from app.schemas import AgentFailure, ErrorCodes
+
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized uploads from their Content-Length header.
+
+    The check runs before the request body is read, so an oversized upload
+    never reaches the multipart parser or spools to disk.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        max_upload_bytes: int,
+        paths: frozenset[str] = frozenset({"/ingest"}),
+    ) -> None:
+        self.app = app
+        self._max_upload_bytes = max_upload_bytes
+        self._paths = paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self._paths:
+            length = _content_length(scope)
+            if length is not None and length > self._max_upload_bytes:
+                await self._reject(send, length)
+                return
+        await self.app(scope, receive, send)
+
+    async def _reject(self, send: Send, length: int) -> None:
+        """Send a 413 response carrying an AgentFailure payload."""
+
+        failure = AgentFailure(
+            agent_id="api.ingest",
+            error_code=ErrorCodes.PARSER_INVALID_INPUT,
+            message=(
+                f"Upload of {length} bytes exceeds the "
+                f"{self._max_upload_bytes} byte limit."
+            ),
+            details={"max_upload_bytes": self._max_upload_bytes},
+        )
+        body = json.dumps({"detail": jsonable_encoder(failure)}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": HTTPStatus.REQUEST_ENTITY_TOO_LARGE.value,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"connection", b"close"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def _content_length(scope: Scope) -> int | None:
+    """Return the declared Content-Length, or None when absent or malformed."""
+
+    for name, value in scope["headers"]:
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+
+__all__ = ["UploadSizeLimitMiddleware"]
@@ -1,6 +1,6 @@
-"""Configuration management using pydantic-settings."""
+"""Configuration management backed by environment variables."""
 
-from app.config.settings import APISettings, get_settings
+from app.config.settings import APISettings, LLMCachePolicy, get_settings
 
 
-__all__ = ["APISettings", "get_settings"]
+__all__ = ["APISettings", "LLMCachePolicy", "get_settings"]
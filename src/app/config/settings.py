@@ -1,120 +1,201 @@
-"""Application configuration powered by pydantic-settings."""
+"""Application configuration loaded from environment variables.
+
+Settings are read once from ``os.environ`` (falling back to a local ``.env``
+file) into a frozen, slotted dataclass. The schema is small and static, so
+plain parsing avoids the model-validation overhead of pydantic-settings on
+every cold worker start.
+"""
 
 from __future__ import annotations
 
+import json
+import os
+from dataclasses import dataclass, field
 from functools import lru_cache
-from typing import Literal
+from pathlib import Path
+from typing import Literal, cast
+
+
+_ENV_FILE = ".env"
+_TRUE_VALUES = frozenset({"1", "true", "t", "yes", "y", "on"})
+_FALSE_VALUES = frozenset({"0", "false", "f", "no", "n", "off"})
+_DEFAULT_GDRIVE_SCOPES = ("https://www.googleapis.com/auth/drive.readonly",)
+_LLM_CACHE_POLICIES = frozenset(
+    {"enabled", "read-only", "write-only", "replay", "disabled"}
+)
 
-from pydantic import Field, field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+LLMCachePolicy = Literal["enabled", "read-only", "write-only", "replay", "disabled"]
 
 
-class APISettings(BaseSettings):
+@dataclass(frozen=True, slots=True)
+class APISettings:
     """Runtime configuration for the FastAPI application."""
 
-    app_name: str = Field(default="ROMA RAG API", alias="APP_NAME")
-    ingest_auth_token: str = Field(
-        default="local-dev-token",
-        alias="API_INGEST_TOKEN",
-        description="Bearer token required for /ingest uploads",
-    )
-    ingest_auth_enabled: bool = Field(
-        default=True,
-        alias="INGEST_AUTH_ENABLED",
-        description="When false, /ingest accepts requests without auth",
-    )
-    ingest_ocr_enabled: bool = Field(
-        default=False,
-        alias="INGEST_OCR_ENABLED",
-        description="Enable OCR for scanned PDFs during ingestion",
-    )
-    stream_chunk_pause_ms: int = Field(
-        default=0,
-        alias="STREAM_CHUNK_PAUSE_MS",
-        description="Artificial delay between streamed tokens (useful for demos/tests)",
-    )
+    app_name: str = "ROMA RAG API"
+    # Bearer token required for /ingest uploads
+    ingest_auth_token: str = "local-dev-token"
+    # When false, /ingest accepts requests without auth
+    ingest_auth_enabled: bool = True
+    # Enable OCR for scanned PDFs during ingestion
+    ingest_ocr_enabled: bool = False
+    # Artificial delay between streamed tokens (useful for demos/tests)
+    stream_chunk_pause_ms: int = 0
+    # Number of background workers draining the /ingest queue
+    ingest_concurrency: int = 2
+    # Maximum uploads waiting for a worker before /ingest returns 503
+    ingest_queue_size: int = 1024
+    # Maximum total bytes of uploads held in the queue before /ingest returns 503
+    ingest_queue_max_bytes: int = 512 * 1024 * 1024
+    # Seconds shutdown waits for queued uploads before cancelling the workers
+    ingest_drain_timeout_seconds: float = 30.0
+    # Largest /ingest request body accepted, checked via Content-Length
+    max_upload_bytes: int = 50 * 1024 * 1024
+    # Build the vector index with int8 scalar quantization (IVF_SQ)
+    vector_index_quantized: bool = False
 
     # LLM Configuration
-    llm_provider: Literal["openai", "anthropic"] = Field(
-        default="openai",
-        alias="LLM_PROVIDER",
-        description="LLM provider to use (openai or anthropic)",
-    )
-    llm_model: str = Field(
-        default="gpt-4o",
-        alias="LLM_MODEL",
-        description="Model name (e.g., gpt-4o, claude-sonnet-3.5)",
-    )
-    openai_api_key: str = Field(
-        default="",
-        alias="OPENAI_API_KEY",
-        description="OpenAI API key",
-    )
-    anthropic_api_key: str = Field(
-        default="",
-        alias="ANTHROPIC_API_KEY",
-        description="Anthropic API key",
-    )
-    llm_max_retries: int = Field(
-        default=3,
-        alias="LLM_MAX_RETRIES",
-        description="Maximum retry attempts for LLM requests",
-    )
-    llm_timeout_seconds: int = Field(
-        default=30,
-        alias="LLM_TIMEOUT_SECONDS",
-        description="Timeout for LLM requests in seconds",
-    )
-    llm_temperature: float = Field(
-        default=0.7,
-        alias="LLM_TEMPERATURE",
-        description="Temperature for LLM sampling (0.0-2.0)",
-    )
-    llm_max_tokens: int = Field(
-        default=2048,
-        alias="LLM_MAX_TOKENS",
-        description="Maximum tokens to generate",
-    )
+    llm_provider: Literal["openai", "anthropic"] = "openai"
+    llm_model: str = "gpt-4o"
+    openai_api_key: str = ""
+    anthropic_api_key: str = ""
+    llm_max_retries: int = 3
+    llm_timeout_seconds: int = 30
+    # Temperature for LLM sampling (0.0-2.0)
+    llm_temperature: float = 0.7
+    llm_max_tokens: int = 2048
+    # Response cache for temperature-0 calls: enabled, read-only, write-only,
+    # replay (cache hits only, never call the provider) or disabled
+    llm_cache_policy: LLMCachePolicy = "enabled"
 
     # Google Drive Configuration
-    gdrive_credentials_path: str = Field(
-        default="",
-        alias="GDRIVE_CREDENTIALS_PATH",
-        description="Path to Google Drive service account JSON credentials",
-    )
-    gdrive_scopes: list[str] = Field(
-        default=["https://www.googleapis.com/auth/drive.readonly"],
-        alias="GDRIVE_SCOPES",
-        description="Google Drive API OAuth scopes",
+    gdrive_credentials_path: str = ""
+    gdrive_scopes: list[str] = field(
+        default_factory=lambda: list(_DEFAULT_GDRIVE_SCOPES)
     )
 
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        case_sensitive=False,
-        env_prefix="RAG_",
-        extra="ignore",
-    )
+    def __post_init__(self) -> None:
+        """Validate values that have a constrained domain."""
+        if self.llm_provider not in ("openai", "anthropic"):
+            raise ValueError(f"Unsupported LLM provider: {self.llm_provider}")
+        if self.llm_cache_policy not in _LLM_CACHE_POLICIES:
+            raise ValueError(f"Unsupported LLM cache policy: {self.llm_cache_policy}")
+        if self.ingest_concurrency < 1:
+            raise ValueError(
+                f"Ingest concurrency must be at least 1, got {self.ingest_concurrency}"
+            )
+        if not 0.0 <= self.llm_temperature <= 2.0:
+            raise ValueError(
+                f"Temperature must be between 0.0 and 2.0, got {self.llm_temperature}"
+            )
 
-    @field_validator("llm_provider")
     @classmethod
-    def validate_llm_provider(cls, v: str) -> str:
-        """Validate LLM provider is supported."""
-        if v not in ("openai", "anthropic"):
-            raise ValueError(f"Unsupported LLM provider: {v}")
-        return v
+    def from_env(cls, env: dict[str, str] | None = None) -> APISettings:
+        """Build settings from environment variables.
 
-    @field_validator("llm_temperature")
-    @classmethod
-    def validate_temperature(cls, v: float) -> float:
-        """Validate temperature is in valid range."""
-        if not 0.0 <= v <= 2.0:
-            raise ValueError(f"Temperature must be between 0.0 and 2.0, got {v}")
-        return v
+        Variable names match case-insensitively, as they did under
+        pydantic-settings: ``openai_api_key`` sets ``OPENAI_API_KEY``.
+
+        Args:
+            env: Mapping to read from. Defaults to ``os.environ`` layered over
+                the ``.env`` file in the working directory.
+        """
+        source = _upper_keys(env if env is not None else _load_environment())
+
+        def _str(name: str, default: str) -> str:
+            return source.get(name, default)
+
+        def _int(name: str, default: int) -> int:
+            raw = source.get(name)
+            return default if raw is None or raw == "" else int(raw)
+
+        def _float(name: str, default: float) -> float:
+            raw = source.get(name)
+            return default if raw is None or raw == "" else float(raw)
+
+        def _bool(name: str, default: bool) -> bool:
+            raw = source.get(name)
+            if raw is None or raw == "":
+                return default
+            lowered = raw.strip().lower()
+            if lowered in _TRUE_VALUES:
+                return True
+            if lowered in _FALSE_VALUES:
+                return False
+            raise ValueError(f"Invalid boolean for {name}: {raw!r}")
+
+        return cls(
+            app_name=_str("APP_NAME", "ROMA RAG API"),
+            ingest_auth_token=_str("API_INGEST_TOKEN", "local-dev-token"),
+            ingest_auth_enabled=_bool("INGEST_AUTH_ENABLED", True),
+            ingest_ocr_enabled=_bool("INGEST_OCR_ENABLED", False),
+            stream_chunk_pause_ms=_int("STREAM_CHUNK_PAUSE_MS", 0),
+            ingest_concurrency=_int("INGEST_CONCURRENCY", 2),
+            ingest_queue_size=_int("INGEST_QUEUE_SIZE", 1024),
+            ingest_queue_max_bytes=_int("INGEST_QUEUE_MAX_BYTES", 512 * 1024 * 1024),
+            ingest_drain_timeout_seconds=_float("INGEST_DRAIN_TIMEOUT_SECONDS", 30.0),
+            max_upload_bytes=_int("MAX_UPLOAD_BYTES", 50 * 1024 * 1024),
+            vector_index_quantized=_bool("VECTOR_INDEX_QUANTIZED", False),
+            llm_provider=cast(
+                "Literal['openai', 'anthropic']", _str("LLM_PROVIDER", "openai")
+            ),
+            llm_model=_str("LLM_MODEL", "gpt-4o"),
+            openai_api_key=_str("OPENAI_API_KEY", ""),
+            anthropic_api_key=_str("ANTHROPIC_API_KEY", ""),
+            llm_max_retries=_int("LLM_MAX_RETRIES", 3),
+            llm_timeout_seconds=_int("LLM_TIMEOUT_SECONDS", 30),
+            llm_temperature=_float("LLM_TEMPERATURE", 0.7),
+            llm_max_tokens=_int("LLM_MAX_TOKENS", 2048),
+            llm_cache_policy=cast(
+                "LLMCachePolicy", _str("LLM_CACHE_POLICY", "enabled").strip().lower()
+            ),
+            gdrive_credentials_path=_str("GDRIVE_CREDENTIALS_PATH", ""),
+            gdrive_scopes=_parse_list(source.get("GDRIVE_SCOPES"))
+            or list(_DEFAULT_GDRIVE_SCOPES),
+        )
+
+
+def _parse_list(raw: str | None) -> list[str]:
+    """Parse a JSON array or comma-separated string into a list of strings."""
+    if not raw or not raw.strip():
+        return []
+    stripped = raw.strip()
+    if stripped.startswith("["):
+        return [str(item) for item in json.loads(stripped)]
+    return [item.strip() for item in stripped.split(",") if item.strip()]
+
+
+def _read_env_file(path: Path) -> dict[str, str]:
+    """Parse ``KEY=VALUE`` lines from a dotenv file (comments and quotes ok)."""
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return {}
+
+    values: dict[str, str] = {}
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#") or "=" not in stripped:
+            continue
+        key, _, value = stripped.removeprefix("export ").partition("=")
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        values[key.strip()] = value
+    return values
+
+
+def _upper_keys(env: dict[str, str]) -> dict[str, str]:
+    """Upper-case variable names; later entries win on a case-only clash."""
+    return {key.upper(): value for key, value in env.items()}
+
+
+def _load_environment() -> dict[str, str]:
+    """Return ``.env`` values overlaid with the process environment."""
+    return {**_read_env_file(Path(_ENV_FILE)), **os.environ}
 
 
 @lru_cache(maxsize=1)
 def get_settings() -> APISettings:
     """Return a cached settings instance."""
 
-    return APISettings()
+    return APISettings.from_env()
@@ -6,16 +6,163 @@ Reference: docs/03_INGESTION_STRATEGY.md
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import io
-from typing import Any, ClassVar
-
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, ClassVar
+
+import httplib2
 from google.auth.exceptions import GoogleAuthError
 from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseDownload
 
 from app.schemas import AgentFailure, ErrorCodes
+from app.services.backoff import backoff_delay
+
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+
+_AGENT_ID = "gdrive_connector"
+
+
+def _failure_factory(
+    error_code: str, *, recoverable: bool
+) -> Callable[..., AgentFailure]:
+    """Pre-bind the constant AgentFailure fields for one failure kind.
+
+    Failures built here only carry trusted values, so pydantic validation
+    is skipped with ``model_construct``.
+    """
+    return partial(
+        AgentFailure.model_construct,
+        agent_id=_AGENT_ID,
+        error_code=error_code,
+        recoverable=recoverable,
+    )
+
+
+_not_found = _failure_factory(ErrorCodes.CONNECTOR_NOT_FOUND, recoverable=False)
+_auth_failure = _failure_factory(ErrorCodes.CONNECTOR_AUTH, recoverable=False)
+_rate_limited = _failure_factory(ErrorCodes.CONNECTOR_RATE_LIMIT, recoverable=True)
+_network_retryable = _failure_factory(ErrorCodes.CONNECTOR_NETWORK, recoverable=True)
+_network_failure = _failure_factory(ErrorCodes.CONNECTOR_NETWORK, recoverable=False)
+
+_METADATA_FIELDS = "mimeType, modifiedTime, size"
+# size/modifiedTime feed the metadata cache alongside the listing itself
+_LIST_FIELDS = "nextPageToken, files(id, name, mimeType, size, modifiedTime)"
+# Pages fetched ahead of the consumer while it processes the current one
+_LIST_PREFETCH_PAGES = 2
+
+
+class _MetadataCache:
+    """Bounded LRU cache of Drive file metadata with a time-to-live.
+
+    Entries map a file ID to ``(mimeType, modifiedTime, size)``. Batch
+    callbacks fill the cache from executor threads while the event loop reads
+    it, so every access to the LRU order holds ``_lock``.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self._maxsize = maxsize
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, tuple[str, str, int]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, file_id: str) -> tuple[str, str, int] | None:
+        """Return cached metadata, or None when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(file_id)
+            if entry is None:
+                return None
+            expires_at, metadata = entry
+            if expires_at <= time.monotonic():
+                del self._entries[file_id]
+                return None
+            self._entries.move_to_end(file_id)
+            return metadata
+
+    def put(self, file_id: str, metadata: dict[str, Any]) -> None:
+        """Store the mimeType/modifiedTime/size of a Drive file resource."""
+        entry = (
+            time.monotonic() + self._ttl_seconds,
+            (
+                metadata.get("mimeType", ""),
+                metadata.get("modifiedTime", ""),
+                int(metadata.get("size") or 0),
+            ),
+        )
+        with self._lock:
+            self._entries[file_id] = entry
+            self._entries.move_to_end(file_id)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, file_id: str) -> None:
+        """Drop a file from the cache."""
+        with self._lock:
+            self._entries.pop(file_id, None)
+
+
+@lru_cache(maxsize=4)
+def _load_service_account_info(credentials_path: str) -> dict[str, Any]:
+    """Read and parse a service account key file once per path.
+
+    Key files do not change at runtime, so services built for different
+    scopes share one parse.
+    """
+    with Path(credentials_path).open("rb") as key_file:
+        info: dict[str, Any] = json.load(key_file)
+    return info
+
+
+@lru_cache(maxsize=8)
+def _load_drive_service(
+    credentials_path: str, scopes: tuple[str, ...]
+) -> tuple[Any, Any]:
+    """Load service account credentials and build a Drive v3 service.
+
+    Cached per ``(credentials_path, scopes)`` so new connector instances
+    skip re-reading the key file and rebuilding the client. The bundled
+    discovery document is used, avoiding a network fetch and the on-disk
+    discovery cache.
+    """
+    try:
+        creds = service_account.Credentials.from_service_account_info(  # type: ignore[no-untyped-call]
+            _load_service_account_info(credentials_path),
+            scopes=list(scopes),
+        )
+    except FileNotFoundError as e:
+        msg = f"Service account credentials not found: {credentials_path}"
+        raise ValueError(msg) from e
+    except GoogleAuthError as e:
+        msg = f"Invalid service account credentials: {e}"
+        raise ValueError(msg) from e
+
+    service = build(
+        "drive",
+        "v3",
+        credentials=creds,
+        cache_discovery=False,
+        static_discovery=True,
+    )
+    return creds, service
 
 
 class GDriveConnector:
@@ -33,41 +180,109 @@ class GDriveConnector:
 
     MAX_RETRIES: ClassVar[int] = 5
     INITIAL_BACKOFF_SECONDS: ClassVar[int] = 2
+    MAX_BACKOFF_SECONDS: ClassVar[int] = 30
+    # Drive allows at most 100 calls per HTTP batch request
+    BATCH_SIZE: ClassVar[int] = 100
+    METADATA_CACHE_SIZE: ClassVar[int] = 10_000
+    METADATA_CACHE_TTL_SECONDS: ClassVar[float] = 3600.0
+    # Bytes requested per media chunk; bounds memory held per download
+    DOWNLOAD_CHUNK_SIZE: ClassVar[int] = 8 * 1024 * 1024
+    # Smallest chunk used when fitting downloads into a memory budget
+    MIN_DOWNLOAD_CHUNK_SIZE: ClassVar[int] = 256 * 1024
+    # Threads running the blocking googleapiclient calls
+    MAX_WORKERS: ClassVar[int] = 16
+    # Include rendered error text in AgentFailure.details
+    CAPTURE_ERROR_DETAILS: ClassVar[bool] = True
 
     def __init__(
         self,
         credentials_path: str,
         scopes: list[str] | None = None,
+        changes_token_path: str | None = None,
+        *,
+        chunk_size: int | None = None,
+        download_memory_budget: int | None = None,
     ) -> None:
         """Initialize GDrive connector with service account credentials.
 
         Args:
             credentials_path: Path to service account JSON file.
             scopes: OAuth scopes (defaults to Drive readonly).
+            changes_token_path: File used to persist the Drive changes page
+                token between restarts (optional).
+            chunk_size: Bytes requested per media chunk (defaults to
+                ``DOWNLOAD_CHUNK_SIZE``).
+            download_memory_budget: Upper bound in bytes for chunk buffers
+                across all concurrent downloads. When set, the chunk size is
+                lowered so ``MAX_WORKERS`` downloads fit within it.
         """
         self._credentials_path = credentials_path
         self._scopes = scopes or self.DEFAULT_SCOPES
         self._service: Any = None
         self._credentials: Any = None
+        self._meta_cache = _MetadataCache(
+            self.METADATA_CACHE_SIZE, self.METADATA_CACHE_TTL_SECONDS
+        )
+        self._changes_token_path = (
+            Path(changes_token_path) if changes_token_path else None
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.MAX_WORKERS, thread_name_prefix="gdrive"
+        )
+        self._thread_state = threading.local()
+        self._chunk_size = self._resolve_chunk_size(chunk_size, download_memory_budget)
+
+    @classmethod
+    def _resolve_chunk_size(
+        cls, chunk_size: int | None, download_memory_budget: int | None
+    ) -> int:
+        """Pick the media chunk size from an explicit size and/or a budget."""
+        size = chunk_size or cls.DOWNLOAD_CHUNK_SIZE
+        if download_memory_budget is not None:
+            per_download = download_memory_budget // cls.MAX_WORKERS
+            # Keep chunks a multiple of the minimum so ranges stay aligned
+            per_download -= per_download % cls.MIN_DOWNLOAD_CHUNK_SIZE
+            size = min(size, max(per_download, cls.MIN_DOWNLOAD_CHUNK_SIZE))
+        return size
+
+    def close(self) -> None:
+        """Shut down the worker threads used for Drive API calls."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _thread_http(self) -> AuthorizedHttp:
+        """Return this worker thread's own authorized HTTP transport.
+
+        httplib2 connections are not thread-safe, so requests running on the
+        executor never share the service's default transport.
+        """
+        http: AuthorizedHttp | None = getattr(self._thread_state, "http", None)
+        if http is None:
+            http = AuthorizedHttp(self._credentials, http=httplib2.Http())
+            self._thread_state.http = http
+        return http
+
+    def _execute_in_thread(self, request: Any) -> Any:
+        """Execute a googleapiclient request on the current worker thread."""
+        request.http = self._thread_http()
+        return request.execute()
+
+    async def _execute(self, request: Any) -> Any:
+        """Execute a googleapiclient request without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._execute_in_thread, request
+        )
 
     def _get_service(self) -> Any:
-        """Get or create Google Drive API service instance."""
+        """Get or create Google Drive API service instance.
+
+        Credentials and the service are shared by every connector using the
+        same key file and scopes (see ``_load_drive_service``).
+        """
         if self._service is None:
-            try:
-                creds = service_account.Credentials.from_service_account_file(  # type: ignore[no-untyped-call]
-                    self._credentials_path,
-                    scopes=self._scopes,
-                )
-                self._credentials = creds
-                self._service = build("drive", "v3", credentials=creds)
-            except FileNotFoundError as e:
-                msg = f"Service account credentials not found: {
-                    self._credentials_path
-                }"
-                raise ValueError(msg) from e
-            except GoogleAuthError as e:
-                msg = f"Invalid service account credentials: {e}"
-                raise ValueError(msg) from e
+            self._credentials, self._service = _load_drive_service(
+                self._credentials_path, tuple(self._scopes)
+            )
 
         return self._service
 
@@ -85,68 +300,120 @@ class GDriveConnector:
         status = error.resp.status
 
         if status == 404:
-            return AgentFailure(
-                agent_id="gdrive_connector",
-                error_code=ErrorCodes.CONNECTOR_NOT_FOUND,
-                message=f"File not found: {file_id}",
-                recoverable=False,
-            )
+            return _not_found(message=f"File not found: {file_id}")
 
         if status == 403:
-            return AgentFailure(
-                agent_id="gdrive_connector",
-                error_code=ErrorCodes.CONNECTOR_AUTH,
+            details: dict[str, Any] = {"file_id": file_id}
+            if self.CAPTURE_ERROR_DETAILS:
+                details["error"] = error.reason
+            return _auth_failure(
                 message=f"Permission denied for file: {file_id}",
-                recoverable=False,
-                details={"file_id": file_id, "error": str(error)},
+                details=details,
             )
 
-        if status == 429:
-            # Rate limit - check if can retry
+        if status == 429 or status >= 500:
+            # Rate limit or server error - check if can retry
             if attempt < self.MAX_RETRIES - 1:
                 return None  # Signal retry
-            return AgentFailure(
-                agent_id="gdrive_connector",
-                error_code=ErrorCodes.CONNECTOR_RATE_LIMIT,
-                message=f"Rate limit exceeded after {self.MAX_RETRIES} retries",
-                recoverable=True,
-                details={"file_id": file_id, "retries": self.MAX_RETRIES},
-            )
-
-        if status >= 500:
-            # Server error - check if can retry
-            if attempt < self.MAX_RETRIES - 1:
-                return None  # Signal retry
-            return AgentFailure(
-                agent_id="gdrive_connector",
-                error_code=ErrorCodes.CONNECTOR_NETWORK,
+            if status == 429:
+                return _rate_limited(
+                    message=f"Rate limit exceeded after {self.MAX_RETRIES} retries",
+                    details={"file_id": file_id, "retries": self.MAX_RETRIES},
+                )
+            return _network_retryable(
                 message=f"Network error after {self.MAX_RETRIES} retries",
-                recoverable=True,
                 details={"file_id": file_id, "status": status},
             )
 
-        # Other HTTP error
-        return AgentFailure(
-            agent_id="gdrive_connector",
-            error_code=ErrorCodes.CONNECTOR_NETWORK,
-            message=f"HTTP error {status}: {error}",
-            recoverable=False,
+        # Other HTTP error; the parsed reason avoids rendering the full repr
+        return _network_failure(
+            message=f"HTTP error {status}: {error.reason}",
             details={"file_id": file_id, "status": status},
         )
 
+    def _media_request(
+        self,
+        service: Any,
+        file_id: str,
+        mime_type: str | None,
+        export_format: str | None,
+    ) -> Any:
+        """Build the export or download request for a file."""
+        if export_format is not None or mime_type in self.EXPORT_FORMATS:
+            export_mime = export_format or self.EXPORT_FORMATS[mime_type or ""]
+            return service.files().export_media(fileId=file_id, mimeType=export_mime)
+        return service.files().get_media(fileId=file_id)
+
+    def _download_into(self, request: Any, sink: BinaryIO) -> None:
+        """Download a media request chunk by chunk into ``sink``.
+
+        Runs on a worker thread; every chunk is a blocking HTTP call.
+        """
+        request.http = self._thread_http()
+        downloader = MediaIoBaseDownload(sink, request, chunksize=self._chunk_size)
+        done = False
+
+        while not done:
+            _, done = downloader.next_chunk()
+
     async def fetch_file(
         self,
         file_id: str,
         export_format: str | None = None,
+        *,
+        mime_type: str | None = None,
     ) -> bytes | AgentFailure:
-        """Download a file from Google Drive.
+        """Download a file from Google Drive into memory.
+
+        Prefer ``stream_file`` for large files; this wrapper holds the whole
+        payload in memory.
 
         Args:
             file_id: The Google Drive file ID.
             export_format: Export format for Google native files.
+            mime_type: Known Drive MIME type of the file, if any.
 
         Returns:
             File content as bytes or AgentFailure.
+        """
+        # No pooled buffers here: BytesIO.getvalue() hands over its internal
+        # bytes without copying, and a pooled bytearray would need a copy out
+        file_buffer = io.BytesIO()
+        result = await self.stream_file(
+            file_id, file_buffer, export_format, mime_type=mime_type
+        )
+        if isinstance(result, AgentFailure):
+            return result
+        return file_buffer.getvalue()
+
+    async def stream_file(
+        self,
+        file_id: str,
+        sink: BinaryIO,
+        export_format: str | None = None,
+        *,
+        mime_type: str | None = None,
+    ) -> int | AgentFailure:
+        """Download a file from Google Drive directly into ``sink``.
+
+        The metadata lookup is skipped when the caller already knows how to
+        fetch the file: either ``export_format`` is given (the file is a
+        Google native document) or ``mime_type`` is supplied, e.g. from a
+        previous ``list_files`` call. Otherwise the in-process metadata cache
+        is consulted before falling back to ``files().get``.
+
+        Content is written in fixed-size chunks, so memory use
+        stays bounded regardless of file size. ``sink`` must be seekable:
+        a retried download rewinds it to where it started.
+
+        Args:
+            file_id: The Google Drive file ID.
+            sink: Writable binary file object receiving the content.
+            export_format: Export format for Google native files.
+            mime_type: Known Drive MIME type of the file, if any.
+
+        Returns:
+            Number of bytes written or AgentFailure.
 
         Error Codes:
             - ERR_CONNECTOR_NOT_FOUND: File doesn't exist (404)
@@ -154,67 +421,168 @@ class GDriveConnector:
             - ERR_CONNECTOR_RATE_LIMIT: Too many requests (429)
             - ERR_CONNECTOR_NETWORK: Network error (503)
         """
+        start = sink.tell()
         for attempt in range(self.MAX_RETRIES):
             try:
                 service = self._get_service()
 
-                # Get file metadata to determine if it's a Google native file
-                file_metadata = service.files().get(fileId=file_id).execute()
-                mime_type = file_metadata.get("mimeType", "")
+                # Only look up the MIME type when the caller could not tell us
+                if export_format is None and mime_type is None:
+                    mime_type = await self._lookup_mime_type(service, file_id)
 
-                # Check if this is a Google native file that needs export
-                if mime_type in self.EXPORT_FORMATS:
-                    export_mime = export_format or self.EXPORT_FORMATS[mime_type]
-                    request = service.files().export_media(
-                        fileId=file_id,
-                        mimeType=export_mime,
-                    )
-                else:
-                    # Regular file download
-                    request = service.files().get_media(fileId=file_id)
-
-                # Download the file in chunks
-                file_buffer = io.BytesIO()
-                downloader = MediaIoBaseDownload(file_buffer, request)
-                done = False
-
-                while not done:
-                    _, done = downloader.next_chunk()
-
-                return file_buffer.getvalue()
+                request = self._media_request(
+                    service, file_id, mime_type, export_format
+                )
+                sink.seek(start)
+                sink.truncate()
+                await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self._download_into, request, sink
+                )
+                return sink.tell() - start
 
             except HttpError as e:
                 failure = self._handle_http_error(e, file_id, attempt)
                 if failure is None:
                     # Should retry
-                    backoff = self.INITIAL_BACKOFF_SECONDS * (2**attempt)
+                    retry_after = e.resp.get("retry-after")
+                    if not isinstance(retry_after, str):
+                        retry_after = None
+                    backoff = backoff_delay(
+                        attempt,
+                        initial_seconds=self.INITIAL_BACKOFF_SECONDS,
+                        max_seconds=self.MAX_BACKOFF_SECONDS,
+                        retry_after=retry_after,
+                    )
                     await asyncio.sleep(backoff)
                     continue
                 return failure
 
             except GoogleAuthError as e:
-                return AgentFailure(
-                    agent_id="gdrive_connector",
-                    error_code=ErrorCodes.CONNECTOR_AUTH,
-                    message=f"Authentication error: {e}",
-                    recoverable=False,
-                )
+                return _auth_failure(message=f"Authentication error: {e}")
 
             except Exception as e:
-                return AgentFailure(
-                    agent_id="gdrive_connector",
-                    error_code=ErrorCodes.CONNECTOR_NETWORK,
-                    message=f"Unexpected error: {e}",
-                    recoverable=False,
-                    details={"file_id": file_id, "error": str(e)},
-                )
+                return self._unexpected_failure(file_id, e)
 
         # Should never reach here, but just in case
-        return AgentFailure(
-            agent_id="gdrive_connector",
-            error_code=ErrorCodes.CONNECTOR_NETWORK,
-            message="Max retries exceeded",
-            recoverable=True,
+        return _network_retryable(message="Max retries exceeded")
+
+    async def _lookup_mime_type(self, service: Any, file_id: str) -> str:
+        """Return a file's MIME type, from cache when possible."""
+        cached = self._meta_cache.get(file_id)
+        if cached is not None:
+            return cached[0]
+
+        file_metadata = await self._execute(
+            service.files().get(fileId=file_id, fields=_METADATA_FIELDS)
+        )
+        self._meta_cache.put(file_id, file_metadata)
+        return str(file_metadata.get("mimeType", ""))
+
+    async def fetch_files(
+        self,
+        file_ids: list[str],
+    ) -> dict[str, bytes | AgentFailure]:
+        """Download many files, batching their metadata lookups.
+
+        MIME types are resolved with Drive HTTP batch requests (up to
+        ``BATCH_SIZE`` lookups per round-trip). Downloads then run
+        concurrently in worker threads, each with its own HTTP connection,
+        and retry rate-limit and server errors like ``fetch_file``.
+
+        Args:
+            file_ids: Google Drive file IDs to download.
+
+        Returns:
+            Mapping of file ID to file content or AgentFailure.
+        """
+        results: dict[str, bytes | AgentFailure] = {}
+        try:
+            service = self._get_service()
+            mime_types = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._batch_mime_types, service, file_ids, results
+            )
+        except GoogleAuthError as e:
+            failure = _auth_failure(message=f"Authentication error: {e}")
+            return dict.fromkeys(file_ids, failure)
+        except Exception as e:
+            return {
+                file_id: self._unexpected_failure(file_id, e) for file_id in file_ids
+            }
+
+        # Files whose lookup hit a transient error go through the retrying path
+        retry_ids = [
+            file_id
+            for file_id in file_ids
+            if file_id not in mime_types and file_id not in results
+        ]
+
+        # Downloads go through the retrying stream_file path with the batched
+        # MIME type, so a 429/5xx mid-download backs off like fetch_file does
+        download_ids = list(mime_types)
+        downloads = [
+            self.fetch_file(file_id, mime_type=mime_types[file_id])
+            for file_id in download_ids
+        ]
+        retries = [self.fetch_file(file_id) for file_id in retry_ids]
+        outcomes = await asyncio.gather(*downloads, *retries)
+        results.update(zip(download_ids + retry_ids, outcomes, strict=True))
+
+        return results
+
+    def _batch_mime_types(
+        self,
+        service: Any,
+        file_ids: list[str],
+        failures: dict[str, bytes | AgentFailure],
+    ) -> dict[str, str]:
+        """Resolve MIME types for many files with Drive batch requests.
+
+        Runs on a worker thread. Cached files are resolved locally.
+        Non-retryable lookup errors are recorded in ``failures``; files with
+        transient errors are left out of both mappings.
+        """
+        mime_types: dict[str, str] = {}
+        uncached: list[str] = []
+        for file_id in file_ids:
+            cached = self._meta_cache.get(file_id)
+            if cached is None:
+                uncached.append(file_id)
+            else:
+                mime_types[file_id] = cached[0]
+
+        def _callback(
+            request_id: str, response: dict[str, Any] | None, exception: Any
+        ) -> None:
+            if exception is None and response is not None:
+                self._meta_cache.put(request_id, response)
+                mime_types[request_id] = response.get("mimeType", "")
+                return
+            if isinstance(exception, HttpError):
+                failure = self._handle_http_error(exception, request_id, attempt=0)
+                if failure is not None:
+                    failures[request_id] = failure
+
+        for start in range(0, len(uncached), self.BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=_callback)
+            for file_id in uncached[start : start + self.BATCH_SIZE]:
+                batch.add(
+                    service.files().get(fileId=file_id, fields=_METADATA_FIELDS),
+                    request_id=file_id,
+                )
+            batch.execute(http=self._thread_http())
+
+        return mime_types
+
+    @classmethod
+    def _unexpected_failure(cls, file_id: str, error: BaseException) -> AgentFailure:
+        """Wrap an unexpected exception as a non-recoverable AgentFailure."""
+        error_text = str(error)
+        details: dict[str, Any] = {"file_id": file_id}
+        if cls.CAPTURE_ERROR_DETAILS:
+            details["error"] = error_text
+        return _network_failure(
+            message=f"Unexpected error: {error_text}",
+            details=details,
         )
 
     async def list_files(
@@ -234,85 +602,188 @@ class GDriveConnector:
             List of file metadata dicts or AgentFailure.
         """
         try:
-            service = self._get_service()
+            all_files: list[dict[str, Any]] = []
+            async for files in self.iter_file_pages(folder_id, mime_types, page_size):
+                all_files.extend(files)
+            return all_files
 
-            # Build query
-            query_parts = []
-            if folder_id:
-                query_parts.append(f"'{folder_id}' in parents")
-            if mime_types:
-                mime_query = " or ".join([f"mimeType='{mt}'" for mt in mime_types])
-                query_parts.append(f"({mime_query})")
+        except HttpError as e:
+            status = e.resp.status
+            if status == 404:
+                return _not_found(message=f"Folder not found: {folder_id}")
+            if status == 403:
+                return _auth_failure(
+                    message=f"Permission denied for folder: {folder_id}"
+                )
+            return _network_failure(
+                message=f"Error listing files: {e}",
+                details={"status": status},
+            )
 
-            query = " and ".join(query_parts) if query_parts else None
+        except GoogleAuthError as e:
+            return _auth_failure(message=f"Authentication error: {e}")
 
-            # Paginate through results
-            all_files: list[dict[str, Any]] = []
-            page_token = None
+        except Exception as e:
+            return _network_failure(message=f"Unexpected error: {e}")
 
-            while True:
-                file_fields = (
-                    "nextPageToken, files(id, name, mimeType, size, modifiedTime)"
-                )
-                results = (
-                    service.files()
-                    .list(
+    async def iter_file_pages(
+        self,
+        folder_id: str | None = None,
+        mime_types: list[str] | None = None,
+        page_size: int = 100,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield pages of file metadata from a Drive folder.
+
+        Pages are fetched on a worker thread so the event loop is never
+        blocked, and the next page is requested as soon as the previous
+        ``nextPageToken`` arrives, overlapping the round-trip with the
+        caller's processing of the current page.
+
+        Args:
+            folder_id: Folder ID (None = root).
+            mime_types: Filter by MIME types.
+            page_size: Number of results per page (max 1000).
+
+        Raises:
+            HttpError: If a Drive list call fails.
+        """
+        service = self._get_service()
+        query = self._list_query(folder_id, mime_types)
+        pages: asyncio.Queue[list[dict[str, Any]] | BaseException | None] = (
+            asyncio.Queue(maxsize=_LIST_PREFETCH_PAGES)
+        )
+
+        async def _produce() -> None:
+            page_token = None
+            try:
+                while True:
+                    request = service.files().list(
                         q=query,
                         pageSize=min(page_size, 1000),
-                        fields=file_fields,
+                        fields=_LIST_FIELDS,
                         pageToken=page_token,
                     )
-                    .execute()
-                )
+                    results = await self._execute(request)
+                    await pages.put(results.get("files", []))
 
-                files = results.get("files", [])
-                all_files.extend(files)
+                    page_token = results.get("nextPageToken")
+                    if not page_token:
+                        break
+            except Exception as e:
+                await pages.put(e)
+                return
+            await pages.put(None)
 
-                page_token = results.get("nextPageToken")
-                if not page_token:
-                    break
+        producer = asyncio.create_task(_produce())
+        try:
+            while (page := await pages.get()) is not None:
+                if isinstance(page, BaseException):
+                    raise page
+                self._cache_listing(page)
+                yield page
+        finally:
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
+
+    @staticmethod
+    def _list_query(folder_id: str | None, mime_types: list[str] | None) -> str | None:
+        """Build the Drive ``q`` expression for a folder listing."""
+        query_parts = []
+        if folder_id:
+            query_parts.append(f"'{folder_id}' in parents")
+        if mime_types:
+            mime_query = " or ".join([f"mimeType='{mt}'" for mt in mime_types])
+            query_parts.append(f"({mime_query})")
+
+        return " and ".join(query_parts) if query_parts else None
+
+    def _cache_listing(self, files: list[dict[str, Any]]) -> None:
+        """Seed the metadata cache from a ``files().list`` page."""
+        for file in files:
+            if "id" in file:
+                self._meta_cache.put(file["id"], file)
+
+    async def refresh_changes(
+        self,
+        start_token: str | None = None,
+    ) -> str | AgentFailure:
+        """Apply Drive changes since ``start_token`` to the metadata cache.
 
-            return all_files
+        Without a token, the one persisted at ``changes_token_path`` is used.
+        When neither exists, the current start token is fetched so the next
+        call only sees new changes. The new start token is persisted and
+        returned.
 
-        except HttpError as e:
-            status = e.resp.status
-            if status == 404:
-                return AgentFailure(
-                    agent_id="gdrive_connector",
-                    error_code=ErrorCodes.CONNECTOR_NOT_FOUND,
-                    message=f"Folder not found: {folder_id}",
-                    recoverable=False,
-                )
-            if status == 403:
-                return AgentFailure(
-                    agent_id="gdrive_connector",
-                    error_code=ErrorCodes.CONNECTOR_AUTH,
-                    message=f"Permission denied for folder: {folder_id}",
-                    recoverable=False,
+        Args:
+            start_token: Drive changes page token to resume from.
+
+        Returns:
+            The new start page token or AgentFailure.
+        """
+        try:
+            service = self._get_service()
+            page_token = start_token or self._load_changes_token()
+            if page_token is None:
+                response = await self._execute(service.changes().getStartPageToken())
+                new_token = str(response["startPageToken"])
+                self._save_changes_token(new_token)
+                return new_token
+
+            while True:
+                response = await self._execute(
+                    service.changes().list(
+                        pageToken=page_token,
+                        fields=(
+                            "nextPageToken, newStartPageToken, changes(fileId, "
+                            "removed, file(mimeType, modifiedTime, size, trashed))"
+                        ),
+                    )
                 )
-            return AgentFailure(
-                agent_id="gdrive_connector",
-                error_code=ErrorCodes.CONNECTOR_NETWORK,
-                message=f"Error listing files: {e}",
-                recoverable=False,
-                details={"status": status},
+                for change in response.get("changes", []):
+                    file_id = change.get("fileId")
+                    if not file_id:
+                        continue
+                    file = change.get("file")
+                    if change.get("removed") or not file or file.get("trashed"):
+                        self._meta_cache.pop(file_id)
+                    else:
+                        self._meta_cache.put(file_id, file)
+
+                if "newStartPageToken" in response:
+                    new_token = str(response["newStartPageToken"])
+                    self._save_changes_token(new_token)
+                    return new_token
+                page_token = response["nextPageToken"]
+
+        except HttpError as e:
+            return _network_retryable(
+                message=f"Error listing changes: {e}",
+                details={"status": e.resp.status},
             )
 
         except GoogleAuthError as e:
-            return AgentFailure(
-                agent_id="gdrive_connector",
-                error_code=ErrorCodes.CONNECTOR_AUTH,
-                message=f"Authentication error: {e}",
-                recoverable=False,
-            )
+            return _auth_failure(message=f"Authentication error: {e}")
 
         except Exception as e:
-            return AgentFailure(
-                agent_id="gdrive_connector",
-                error_code=ErrorCodes.CONNECTOR_NETWORK,
-                message=f"Unexpected error: {e}",
-                recoverable=False,
-            )
+            return _network_failure(message=f"Unexpected error: {e}")
+
+    def _load_changes_token(self) -> str | None:
+        """Read the persisted changes page token, if any."""
+        if self._changes_token_path is None:
+            return None
+        try:
+            token = self._changes_token_path.read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        return token or None
+
+    def _save_changes_token(self, token: str) -> None:
+        """Persist the changes page token so restarts resume incrementally."""
+        if self._changes_token_path is None:
+            return
+        self._changes_token_path.parent.mkdir(parents=True, exist_ok=True)
+        self._changes_token_path.write_text(token, encoding="utf-8")
 
 
 __all__ = ["GDriveConnector"]
@@ -10,7 +10,9 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
-from typing import Any, ClassVar
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, ClassVar
 from urllib.parse import urlparse
 
 import httpx
@@ -18,6 +20,67 @@ import trafilatura
 from trafilatura.settings import use_config
 
 from app.schemas import AgentFailure, ErrorCodes
+from app.services.backoff import backoff_delay
+
+
+if TYPE_CHECKING:
+    from configparser import ConfigParser
+    from types import TracebackType
+
+
+class _TokenBucket:
+    """Per-host request budget refilled at ``rate`` tokens per second.
+
+    A 429 from the host halves the refill rate for a cool-down period
+    (additive-increase/multiplicative-decrease style back-pressure).
+
+    ``acquire`` reserves its token up front, letting the balance go negative,
+    and then sleeps off its share of the debt. Waiters for the same host
+    therefore sleep concurrently, each until its own slot, rather than
+    queueing behind one sleeper.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self._base_rate = rate
+        self._rate = rate
+        self._burst = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._penalty_until = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Current refill rate in tokens per second."""
+        return self._rate
+
+    def _refill(self, now: float) -> None:
+        if self._rate != self._base_rate and now >= self._penalty_until:
+            self._rate = self._base_rate
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        # No await between the refill and the reservation, so no lock needed
+        self._refill(time.monotonic())
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return
+        try:
+            await asyncio.sleep(-self._tokens / self._rate)
+        except asyncio.CancelledError:
+            # Hand the reserved token back to the waiters behind us
+            self._tokens += 1
+            raise
+
+    def throttle(self, cooldown_seconds: float) -> None:
+        """Halve the refill rate until ``cooldown_seconds`` have passed."""
+        now = time.monotonic()
+        self._refill(now)
+        self._rate = max(self._rate / 2, self._base_rate / 64)
+        self._penalty_until = now + cooldown_seconds
 
 
 class WebConnector:
@@ -30,6 +93,11 @@ class WebConnector:
         - User-Agent rotation
         - Content sanitization
         - Configurable timeouts
+        - Pooled HTTP/2 connections shared across requests
+        - Global concurrency cap and per-host token-bucket rate limiting
+
+    Use as an async context manager (or call ``aclose``) to release the
+    underlying connection pool.
     """
 
     DEFAULT_USER_AGENTS: ClassVar[list[str]] = [
@@ -46,6 +114,15 @@ class WebConnector:
         "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
     ]
 
+    INITIAL_BACKOFF_SECONDS: ClassVar[int] = 1
+    MAX_BACKOFF_SECONDS: ClassVar[int] = 30
+    # How long a host's rate stays halved after it answers 429
+    THROTTLE_COOLDOWN_SECONDS: ClassVar[float] = 60.0
+    # Least recently used hosts beyond this many lose their rate-limit state
+    MAX_TRACKED_HOSTS: ClassVar[int] = 1024
+
+    _TRAFILATURA_CONFIG: ClassVar[ConfigParser | None] = None
+
     def __init__(
         self: WebConnector,
         *,
@@ -53,6 +130,10 @@ class WebConnector:
         max_retries: int = 5,
         user_agents: list[str] | None = None,
         allowed_domains: list[str] | None = None,
+        include_links: bool = True,
+        max_concurrency: int = 10,
+        per_host_rate: float = 5.0,
+        per_host_burst: int = 10,
     ) -> None:
         """Initialize web connector.
 
@@ -61,16 +142,100 @@ class WebConnector:
             max_retries: Maximum retry attempts for transient failures.
             user_agents: List of User-Agent strings to rotate.
             allowed_domains: Whitelist of allowed domains (None = allow all).
+            include_links: Keep hyperlinks in the extracted Markdown. Disable
+                when links are not needed to skip link extraction work.
+            max_concurrency: Maximum requests in flight across all hosts.
+            per_host_rate: Sustained requests per second allowed per host.
+            per_host_burst: Requests a host may receive back-to-back.
         """
         self.timeout = timeout
         self.max_retries = max_retries
         self.user_agents = user_agents or self.DEFAULT_USER_AGENTS
         self.allowed_domains = allowed_domains
+        self._allowed_hosts = (
+            frozenset(domain.lower() for domain in allowed_domains)
+            if allowed_domains is not None
+            else None
+        )
+        self.include_links = include_links
         self._current_agent_idx = 0
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._per_host_rate = per_host_rate
+        self._per_host_burst = per_host_burst
+        self._buckets: OrderedDict[str, _TokenBucket] = OrderedDict()
+
+        self.trafilatura_config = self._get_config()
+
+    @classmethod
+    def _get_config(cls) -> ConfigParser:
+        """Return the shared trafilatura config, loading it on first use.
+
+        ``use_config`` reads and parses a settings file, so it is done once
+        per process rather than per connector instance.
+        """
+        if cls._TRAFILATURA_CONFIG is None:
+            # Configure trafilatura for aggressive boilerplate removal
+            config = use_config()
+            config.set("DEFAULT", "EXTENSIVE_CLEANING", "true")
+            cls._TRAFILATURA_CONFIG = config
+        return cls._TRAFILATURA_CONFIG
 
-        # Configure trafilatura for aggressive boilerplate removal
-        self.trafilatura_config = use_config()
-        self.trafilatura_config.set("DEFAULT", "EXTENSIVE_CLEANING", "true")
+    async def __aenter__(self: WebConnector) -> WebConnector:
+        return self
+
+    async def __aexit__(
+        self: WebConnector,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self: WebConnector) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self: WebConnector) -> httpx.AsyncClient:
+        """Get or create the pooled HTTP client."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+                follow_redirects=True,
+            )
+        return self._client
+
+    def _backoff(
+        self: WebConnector, attempt: int, retry_after: str | None = None
+    ) -> float:
+        """Return the jittered delay before the next attempt."""
+        return backoff_delay(
+            attempt,
+            initial_seconds=self.INITIAL_BACKOFF_SECONDS,
+            max_seconds=self.MAX_BACKOFF_SECONDS,
+            retry_after=retry_after,
+        )
+
+    def _bucket_for(self: WebConnector, url: str) -> _TokenBucket:
+        """Get or create the rate-limit bucket for the URL's host.
+
+        Buckets are kept in LRU order and capped at ``MAX_TRACKED_HOSTS``, so
+        a long crawl over many hosts does not grow the map without bound.
+        """
+        host = urlparse(url).netloc.lower()
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = _TokenBucket(self._per_host_rate, self._per_host_burst)
+            self._buckets[host] = bucket
+            if len(self._buckets) > self.MAX_TRACKED_HOSTS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(host)
+        return bucket
 
     def _get_user_agent(self: WebConnector) -> str:
         """Get next User-Agent in rotation."""
@@ -79,17 +244,21 @@ class WebConnector:
         return agent
 
     def _is_allowed_domain(self: WebConnector, url: str) -> bool:
-        """Check if URL domain is in whitelist."""
-        if self.allowed_domains is None:
+        """Check if URL domain (or a parent domain) is in whitelist."""
+        if self._allowed_hosts is None:
             return True
 
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
+        domain = urlparse(url).netloc.lower()
+        if domain in self._allowed_hosts:
+            return True
 
-        return any(
-            domain == allowed or domain.endswith(f".{allowed}")
-            for allowed in self.allowed_domains
-        )
+        # Walk parent domains so the cost is per label, not per allowed entry
+        dot = domain.find(".")
+        while dot != -1:
+            if domain[dot + 1 :] in self._allowed_hosts:
+                return True
+            dot = domain.find(".", dot + 1)
+        return False
 
     async def fetch(
         self: WebConnector,
@@ -130,13 +299,25 @@ class WebConnector:
 
         # Extract clean content
         try:
-            markdown = trafilatura.extract(
-                html_content,
-                output_format="markdown",
-                config=self.trafilatura_config,
-                include_comments=False,
-                include_tables=True,
-                include_links=True,
+            # Parse once and share the tree between metadata and content
+            # extraction; metadata is read first as extraction prunes the tree
+            tree = trafilatura.load_html(html_content)
+            meta = (
+                trafilatura.extract_metadata(tree)
+                if extract_metadata and tree is not None
+                else None
+            )
+            markdown = (
+                trafilatura.extract(
+                    tree,
+                    output_format="markdown",
+                    config=self.trafilatura_config,
+                    include_comments=False,
+                    include_tables=True,
+                    include_links=self.include_links,
+                )
+                if tree is not None
+                else None
             )
 
             if not markdown or len(markdown.strip()) < 50:
@@ -147,23 +328,23 @@ class WebConnector:
                     recoverable=False,
                 )
 
-            # Extract metadata
             metadata: dict[str, Any] = {"url": url}
-            if extract_metadata:
-                meta = trafilatura.extract_metadata(html_content)
-                if meta:
-                    metadata.update(
-                        {
-                            "title": meta.title,
-                            "author": meta.author,
-                            "date": meta.date,
-                            "description": meta.description,
-                            "sitename": meta.sitename,
-                        }
-                    )
+            if meta:
+                metadata.update(
+                    {
+                        "title": meta.title,
+                        "author": meta.author,
+                        "date": meta.date,
+                        "description": meta.description,
+                        "sitename": meta.sitename,
+                    }
+                )
 
-            # Add content hash for deduplication
-            content_hash = hashlib.sha256(markdown.encode()).hexdigest()[:16]
+            # Add content hash for deduplication; an 8-byte BLAKE2b digest
+            # keeps the 16 hex chars of the old truncated SHA-256 for less work
+            content_hash = hashlib.blake2b(
+                markdown.encode("utf-8"), digest_size=8
+            ).hexdigest()
             metadata["content_hash"] = content_hash
 
             return (markdown, metadata)
@@ -198,49 +379,49 @@ class WebConnector:
                     "Accept-Language": "en-US,en;q=0.9",
                 }
 
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.get(
-                        url, headers=headers, follow_redirects=True
+                bucket = self._bucket_for(url)
+                await bucket.acquire()
+                async with self._semaphore:
+                    response = await self._get_client().get(url, headers=headers)
+
+                # Handle HTTP errors
+                if response.status_code == 404:
+                    return AgentFailure(
+                        agent_id="web_connector",
+                        error_code=ErrorCodes.CONNECTOR_NOT_FOUND,
+                        message=f"Page not found: {url}",
+                        recoverable=False,
                     )
 
-                    # Handle HTTP errors
-                    if response.status_code == 404:
-                        return AgentFailure(
-                            agent_id="web_connector",
-                            error_code=ErrorCodes.CONNECTOR_NOT_FOUND,
-                            message=f"Page not found: {url}",
-                            recoverable=False,
-                        )
-
-                    if response.status_code in {401, 403}:
-                        return AgentFailure(
-                            agent_id="web_connector",
-                            error_code=ErrorCodes.CONNECTOR_AUTH,
-                            message=(
-                                f"Access denied (HTTP {response.status_code}): {url}"
-                            ),
-                            recoverable=False,
-                        )
+                if response.status_code in {401, 403}:
+                    return AgentFailure(
+                        agent_id="web_connector",
+                        error_code=ErrorCodes.CONNECTOR_AUTH,
+                        message=f"Access denied (HTTP {response.status_code}): {url}",
+                        recoverable=False,
+                    )
 
-                    # Retry on rate limit or service unavailable
-                    if response.status_code in {429, 503}:
-                        if attempt < self.max_retries - 1:
-                            backoff = 2**attempt  # 1s, 2s, 4s, 8s, 16s
-                            await asyncio.sleep(backoff)
-                            continue
-
-                        return AgentFailure(
-                            agent_id="web_connector",
-                            error_code=ErrorCodes.CONNECTOR_RATE_LIMIT,
-                            message=(
-                                "Rate limit exceeded after"
-                                f" {attempt + 1} attempts: {url}"
-                            ),
-                            recoverable=True,
+                # Retry on rate limit or service unavailable
+                if response.status_code in {429, 503}:
+                    if response.status_code == 429:
+                        bucket.throttle(self.THROTTLE_COOLDOWN_SECONDS)
+                    if attempt < self.max_retries - 1:
+                        await asyncio.sleep(
+                            self._backoff(attempt, response.headers.get("retry-after"))
                         )
+                        continue
+
+                    return AgentFailure(
+                        agent_id="web_connector",
+                        error_code=ErrorCodes.CONNECTOR_RATE_LIMIT,
+                        message=(
+                            f"Rate limit exceeded after {attempt + 1} attempts: {url}"
+                        ),
+                        recoverable=True,
+                    )
 
-                    response.raise_for_status()
-                    return response.text
+                response.raise_for_status()
+                return response.text
 
             except (
                 httpx.TimeoutException,
@@ -249,8 +430,7 @@ class WebConnector:
             ) as e:
                 last_error = e
                 if attempt < self.max_retries - 1:
-                    backoff = 2**attempt
-                    await asyncio.sleep(backoff)
+                    await asyncio.sleep(self._backoff(attempt))
                     continue
 
         # All retries exhausted
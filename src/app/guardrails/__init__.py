@@ -8,6 +8,7 @@ SafeResponse.
 
 from __future__ import annotations
 
+import asyncio
 import re
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
@@ -16,13 +17,25 @@ from app.schemas import AgentFailure, ErrorCodes, GuardrailsInput, GuardrailsOut
 
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
     from re import Pattern
 
     from app.schemas.base import CheckType, RiskCategory
 
 
 _PII_PLACEHOLDER = "[REDACTED:PII]"
+# Payloads above this size are scanned on a worker thread by ``evaluate``
+_OFFLOAD_THRESHOLD_CHARS = 32 * 1024
+
+# Lowercase substrings at least one of which must occur for a pattern group
+# to match. Substring checks are far cheaper than running the regexes, so
+# benign content (the common case) skips them entirely. They only hold for
+# ASCII content: under IGNORECASE the regexes also match non-ASCII case
+# variants (dotless i, long s, the Kelvin sign), so other content always
+# runs the regexes.
+_INJECTION_TRIGGERS = ("ignore", "anything", "dan", "unfiltered")
+_MALICIOUS_TRIGGERS = ("os.system", "subprocess.run", "-rf", "bash")
+_PII_TRIGGERS = ("@", "sk-")
+_DIGIT_RUN = re.compile(r"\d{3}")
 
 
 @dataclass(slots=True)
@@ -40,11 +53,13 @@ class GuardrailsAgent:
 
     def __init__(self, *, agent_id: str = "guardrails") -> None:
         self._agent_id = agent_id
-        self._injection_patterns: tuple[Pattern[str], ...] = (
-            re.compile(r"ignore\s+previous\s+instructions", re.IGNORECASE),
-            re.compile(r"\bdo\s+anything\s+now\b", re.IGNORECASE),
-            re.compile(r"\bDAN\b", re.IGNORECASE),
-            re.compile(r"act\s+as\s+an?\s+unfiltered", re.IGNORECASE),
+        # Each pattern group is compiled into one alternation so a scan is a
+        # single pass over the content instead of one search per pattern.
+        self._injection_pattern = _compile_alternation(
+            r"ignore\s+previous\s+instructions",
+            r"\bdo\s+anything\s+now\b",
+            r"\bDAN\b",
+            r"act\s+as\s+an?\s+unfiltered",
         )
         self._hate_keywords: tuple[str, ...] = (
             "exterminate",
@@ -53,21 +68,34 @@ class GuardrailsAgent:
             "ethnic cleansing",
             "genocide",
         )
-        self._malicious_patterns: tuple[Pattern[str], ...] = (
-            re.compile(r"os\.system", re.IGNORECASE),
-            re.compile(r"subprocess\.run", re.IGNORECASE),
-            re.compile(r"rm\s+-rf\s+/", re.IGNORECASE),
-            re.compile(r"bash\s+-c", re.IGNORECASE),
+        self._hate_pattern = _compile_alternation(*map(re.escape, self._hate_keywords))
+        self._malicious_pattern = _compile_alternation(
+            r"os\.system",
+            r"subprocess\.run",
+            r"rm\s+-rf\s+/",
+            r"bash\s+-c",
         )
-        self._pii_patterns: tuple[Pattern[str], ...] = (
-            re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),  # SSN
-            re.compile(r"\bsk-[a-z0-9]{8,}\b", re.IGNORECASE),  # API token
-            re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"),  # Email
-            re.compile(r"\b\d{16}\b"),  # Simplistic CC check
+        self._pii_pattern = _compile_alternation(
+            r"\b\d{3}-\d{2}-\d{4}\b",  # SSN
+            r"\bsk-[a-z0-9]{8,}\b",  # API token
+            r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}",  # Email
+            r"\b\d{16}\b",  # Simplistic CC check
         )
 
     async def evaluate(self, payload: GuardrailsInput) -> GuardrailsOutput:
-        """Return structured guardrail results for the provided payload."""
+        """Return structured guardrail results for the provided payload.
+
+        Scanning is pure CPU work: small payloads are scanned inline, large
+        ones on a worker thread so the event loop keeps serving other I/O.
+        """
+
+        if len(payload.content) > _OFFLOAD_THRESHOLD_CHARS:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.evaluate_sync, payload)
+        return self.evaluate_sync(payload)
+
+    def evaluate_sync(self, payload: GuardrailsInput) -> GuardrailsOutput:
+        """Synchronous variant of ``evaluate`` for callers outside the loop."""
 
         detection = self._scan(payload)
         is_safe = self._is_safe(detection.risk_category, payload.check_type)
@@ -114,9 +142,18 @@ class GuardrailsAgent:
         """Evaluate the input for policy violations and return scan details."""
 
         content = payload.content
-        sanitized_content, pii_matches = self._sanitize_pii(content)
+        lowered = content.lower() if content.isascii() else None
+
+        if _triggered(lowered, _PII_TRIGGERS) or _DIGIT_RUN.search(content):
+            sanitized_content, pii_matches = self._sanitize_pii(content)
+        else:
+            sanitized_content, pii_matches = content, []
 
-        injection = self._match_any(content, self._injection_patterns)
+        injection = (
+            self._match_first(content, self._injection_pattern)
+            if _triggered(lowered, _INJECTION_TRIGGERS)
+            else None
+        )
         if injection:
             reasoning = f"Detected prompt-injection phrase: '{injection}'."
             return _DetectionResult(
@@ -126,7 +163,11 @@ class GuardrailsAgent:
                 pii_matches=pii_matches,
             )
 
-        hate = self._contains_keyword(content, self._hate_keywords)
+        hate = (
+            self._contains_keyword(content, self._hate_pattern)
+            if _triggered(lowered, self._hate_keywords)
+            else None
+        )
         if hate:
             reasoning = f"Detected hate/toxicity keyword: '{hate}'."
             return _DetectionResult(
@@ -136,7 +177,11 @@ class GuardrailsAgent:
                 pii_matches=pii_matches,
             )
 
-        malicious = self._match_any(content, self._malicious_patterns)
+        malicious = (
+            self._match_first(content, self._malicious_pattern)
+            if _triggered(lowered, _MALICIOUS_TRIGGERS)
+            else None
+        )
         if malicious:
             reasoning = f"Detected malicious code intent via '{malicious}'."
             return _DetectionResult(
@@ -168,36 +213,24 @@ class GuardrailsAgent:
     def _sanitize_pii(self, text: str) -> tuple[str, list[str]]:
         """Redact known PII patterns."""
 
-        matches: list[str] = []
-        sanitized = text
-
-        for pattern in self._pii_patterns:
-
-            def _replacer(match: re.Match[str]) -> str:
-                matches.append(match.group(0))
-                return _PII_PLACEHOLDER
+        # The alternation has no capturing groups, so findall yields the
+        # matched strings; both passes stay in C with no Python callback.
+        matches: list[str] = self._pii_pattern.findall(text)
+        if not matches:
+            return text, matches
+        return self._pii_pattern.sub(_PII_PLACEHOLDER, text), matches
 
-            sanitized = pattern.sub(_replacer, sanitized)
+    def _match_first(self, content: str, pattern: Pattern[str]) -> str | None:
+        """Return the leftmost match of a compiled pattern group."""
 
-        return sanitized, matches
+        match = pattern.search(content)
+        return match.group(0) if match else None
 
-    def _match_any(self, content: str, patterns: Sequence[Pattern[str]]) -> str | None:
-        """Return the first regex match for the provided patterns."""
+    def _contains_keyword(self, content: str, keywords: Pattern[str]) -> str | None:
+        """Return the first keyword found, matched case-insensitively."""
 
-        for pattern in patterns:
-            match = pattern.search(content)
-            if match:
-                return match.group(0)
-        return None
-
-    def _contains_keyword(self, content: str, keywords: Sequence[str]) -> str | None:
-        """Return the first keyword found in the normalized content."""
-
-        normalized = content.lower()
-        for keyword in keywords:
-            if keyword in normalized:
-                return keyword
-        return None
+        match = keywords.search(content)
+        return match.group(0).lower() if match else None
 
     def _is_safe(self, risk: RiskCategory | None, check_type: CheckType) -> bool:
         """Determine whether the payload passes guardrails."""
@@ -209,4 +242,19 @@ class GuardrailsAgent:
         return False
 
 
+def _triggered(lowered: str | None, triggers: tuple[str, ...]) -> bool:
+    """Return True when any trigger substring occurs in the lowered content.
+
+    ``lowered`` is None for non-ASCII content, which is always scanned.
+    """
+
+    return lowered is None or any(trigger in lowered for trigger in triggers)
+
+
+def _compile_alternation(*patterns: str) -> Pattern[str]:
+    """Compile case-insensitive patterns into a single alternation regex."""
+
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+
+
 __all__ = ["GuardrailsAgent"]
@@ -1,6 +1,6 @@
 """Ingestion utilities bridging Dolphin parser output to the Memory agent."""
 
-from app.ingestion.service import IngestionService
+from app.ingestion.service import IngestionService, IngestItem
 
 
-__all__ = ["IngestionService"]
+__all__ = ["IngestItem", "IngestionService"]
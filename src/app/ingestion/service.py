@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import time
 import uuid
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from app.exceptions import AgentFailureError
@@ -13,11 +15,25 @@ from ingestion.dolphin import DolphinParser
 
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from app.connectors.gdrive import GDriveConnector
     from app.memory import MemoryAgent
     from app.schemas.base import SourceType
 
 
+@dataclass(frozen=True, slots=True)
+class IngestItem:
+    """One document for ``IngestionService.ingest_documents``."""
+
+    content: bytes | str
+    filename: str
+    source_id: str | None = None
+    source_type: SourceType = "local"
+    source_url: str | None = None
+    extra_metadata: dict[str, Any] | None = None
+
+
 class IngestionService:
     """Convert uploaded content into ParserOutput and index it via MemoryAgent."""
 
@@ -44,16 +60,97 @@ class IngestionService:
     ) -> ParserOutput:
         """Parse and index the provided content."""
 
+        item = IngestItem(
+            content=content,
+            filename=filename,
+            source_id=source_id,
+            source_type=source_type,
+            source_url=source_url,
+            extra_metadata=extra_metadata,
+        )
+        start = time.perf_counter()
+        parser_output = await self._parse(item)
+        await self._memory.add_documents(
+            chunks=parser_output.chunks,
+            source_metadata=_source_metadata(item, parser_output),
+        )
+
+        # ParserOutput is not frozen and does not validate on assignment, so
+        # setting the field in place avoids copying the model just for a float.
+        parser_output.processing_time_ms = round(
+            (time.perf_counter() - start) * 1000, 2
+        )
+        return parser_output
+
+    async def ingest_documents(
+        self, items: Sequence[IngestItem]
+    ) -> list[ParserOutput | AgentFailure]:
+        """Parse several documents and index them with one embedding pass.
+
+        A document that fails to parse yields its AgentFailure in place and
+        does not prevent the others from being indexed.
+
+        Args:
+            items: Documents to ingest.
+
+        Returns:
+            One ParserOutput or AgentFailure per item, in input order.
+        """
+        results: list[ParserOutput | AgentFailure] = []
+        parsed: list[tuple[IngestItem, ParserOutput, float]] = []
+        for item in items:
+            start = time.perf_counter()
+            try:
+                parser_output = await self._parse(item)
+            except AgentFailureError as exc:
+                results.append(exc.failure)
+                continue
+            except ValueError as exc:
+                results.append(
+                    AgentFailure(
+                        agent_id="parser.dolphin",
+                        error_code=ErrorCodes.PARSER_INVALID_INPUT,
+                        message=str(exc),
+                        details={"filename": item.filename},
+                    )
+                )
+                continue
+            parsed.append((item, parser_output, time.perf_counter() - start))
+            results.append(parser_output)
+
+        if not parsed:
+            return results
+
+        index_start = time.perf_counter()
+        await self._memory.add_document_batch(
+            [
+                (output.chunks, _source_metadata(item, output))
+                for item, output, _ in parsed
+            ]
+        )
+        index_seconds = time.perf_counter() - index_start
+        for _, output, parse_seconds in parsed:
+            output.processing_time_ms = round((parse_seconds + index_seconds) * 1000, 2)
+        return results
+
+    async def _parse(self, item: IngestItem) -> ParserOutput:
+        """Parse an item into ParserOutput, raising AgentFailureError on failure.
+
+        Parsing is synchronous and CPU-bound (PDF layout, OCR), so it runs in
+        the default executor to keep the event loop serving other requests.
+        """
+
         metadata: dict[str, Any] = {
-            "filename": filename,
-            "source_type": source_type,
-            "source_url": source_url,
+            "filename": item.filename,
+            "source_type": item.source_type,
+            "source_url": item.source_url,
         }
-        if extra_metadata:
-            metadata.update(extra_metadata)
+        if item.extra_metadata:
+            metadata.update(item.extra_metadata)
 
-        start = time.perf_counter()
-        chunks = self._parser.parse(content, metadata)
+        chunks = await asyncio.get_running_loop().run_in_executor(
+            None, self._parser.parse, item.content, metadata
+        )
         if isinstance(chunks, AgentFailure):
             raise AgentFailureError(
                 agent_id=chunks.agent_id,
@@ -72,26 +169,7 @@ class IngestionService:
                 ),
                 recoverable=True,
             )
-        parser_output = _build_parser_output(chunks, metadata)
-
-        # Store chunks in memory agent
-        await self._memory.add_documents(
-            chunks=parser_output.chunks,
-            source_metadata={
-                "source_id": source_id or parser_output.document_id,
-                "source_type": source_type,
-                "source_url": source_url,
-                "url": source_url,  # MemoryAgent expects "url" key
-                "filename": filename,
-                **(extra_metadata or {}),
-            },
-        )
-
-        return parser_output.model_copy(
-            update={
-                "processing_time_ms": round((time.perf_counter() - start) * 1000, 2)
-            }
-        )
+        return _build_parser_output(chunks, metadata)
 
     async def ingest_from_gdrive(
         self,
@@ -147,6 +225,17 @@ class IngestionService:
             return exc.failure
 
 
+def _source_metadata(item: IngestItem, parser_output: ParserOutput) -> dict[str, Any]:
+    return {
+        "source_id": item.source_id or parser_output.document_id,
+        "source_type": item.source_type,
+        "source_url": item.source_url,
+        "url": item.source_url,  # MemoryAgent expects "url" key
+        "filename": item.filename,
+        **(item.extra_metadata or {}),
+    }
+
+
 def _build_parser_output(
     chunks: list[ParsedChunk],
     metadata: dict[str, Any],
@@ -154,7 +243,8 @@ def _build_parser_output(
     document_id = metadata.get("document_id") or str(uuid.uuid4())
     page_numbers = [chunk.page_number for chunk in chunks if chunk.page_number]
     total_pages = max(page_numbers) if page_numbers else max(1, len(chunks))
-    return ParserOutput(
+    # Chunks come from the parser already validated; skip re-walking them.
+    return ParserOutput.model_construct(
         document_id=document_id,
         metadata=dict(metadata),
         chunks=chunks,
@@ -163,4 +253,4 @@ def _build_parser_output(
     )
 
 
-__all__ = ["IngestionService"]
+__all__ = ["IngestItem", "IngestionService"]
@@ -6,7 +6,8 @@ using LanceDB and sentence-transformers.
 Reference: docs/02_AGENT_SPECS.md Section 2.3
 """
 
-from typing import Any
+from collections.abc import Sequence
+from typing import Any, ClassVar
 
 from app.memory.embeddings import EmbeddingGenerator
 from app.memory.lancedb_store import LanceDBStore
@@ -22,23 +23,34 @@ class MemoryAgent:
         - Perform semantic search with relevance filtering
         - Support metadata-based filtering
         - Handle document deletion
+
+    Chunks are embedded and written ``WRITE_WINDOW_CHUNKS`` at a time, so the
+    embedding matrix and Arrow buffers for a very large document never exist
+    all at once.
     """
 
+    WRITE_WINDOW_CHUNKS: ClassVar[int] = 1024
+
     def __init__(
         self,
         db_path: str,
         embedding_model: str = "all-MiniLM-L6-v2",
+        *,
+        quantized_index: bool = False,
     ) -> None:
         """Initialize the Memory Agent.
 
         Args:
             db_path: Path to the LanceDB database directory.
             embedding_model: Name of the sentence-transformers model.
+            quantized_index: Index vectors as int8 (IVF_SQ) to cut index
+                size and scan bandwidth about 4x.
         """
         self.embedding_generator = EmbeddingGenerator(embedding_model)
         self.store = LanceDBStore(
             db_path=db_path,
             embedding_dim=self.embedding_generator.embedding_dim,
+            quantized_index=quantized_index,
         )
 
     async def add_documents(
@@ -58,38 +70,101 @@ class MemoryAgent:
         if not chunks:
             return []
 
-        # Extract data from chunks
-        chunk_ids = [chunk.chunk_id for chunk in chunks]
-        contents = [chunk.content for chunk in chunks]
+        chunk_ids, contents, metadata_list = _chunk_rows(chunks)
         source_id = source_metadata.get("source_id", "unknown")
         source_url = source_metadata.get("url")
 
-        # Generate embeddings for all chunks
-        embeddings = self.embedding_generator.embed_batch(contents)
-
-        # Prepare metadata for each chunk
-        metadata_list = []
-        for chunk in chunks:
-            chunk_metadata = {
-                "chunk_index": chunk.chunk_index,
-                "layout_type": chunk.layout_type,
-                "page_number": chunk.page_number,
-                **source_metadata,  # Include all source metadata
-            }
-            metadata_list.append(chunk_metadata)
-
-        # Store in LanceDB
-        await self.store.add_documents(
+        # The source metadata is identical for every chunk, so the store
+        # merges and encodes it once per document.
+        await self._embed_and_store(
             chunk_ids=chunk_ids,
             contents=contents,
-            embeddings=embeddings,
             source_ids=[source_id] * len(chunks),
             source_urls=[source_url] * len(chunks),
             metadata_list=metadata_list,
+            shared_metadata=source_metadata,
         )
 
         return chunk_ids
 
+    async def add_document_batch(
+        self,
+        documents: Sequence[tuple[list[ParsedChunk], dict[str, Any]]],
+    ) -> list[list[str]]:
+        """Store several documents through shared encode passes and writes.
+
+        Small documents each fill only a fraction of an embedding batch;
+        concatenating their chunks lets the model run full batches.
+
+        Args:
+            documents: ``(chunks, source_metadata)`` pairs, one per document.
+
+        Returns:
+            The stored chunk IDs for each document, in input order.
+        """
+        all_ids: list[str] = []
+        all_contents: list[str] = []
+        all_metadata: list[dict[str, Any]] = []
+        shared_metadata: list[dict[str, Any]] = []
+        source_ids: list[str] = []
+        source_urls: list[str | None] = []
+        per_document: list[list[str]] = []
+
+        for chunks, source_metadata in documents:
+            chunk_ids, contents, metadata_list = _chunk_rows(chunks)
+            per_document.append(chunk_ids)
+            all_ids.extend(chunk_ids)
+            all_contents.extend(contents)
+            all_metadata.extend(metadata_list)
+            # Rows reference their document's mapping rather than copying it.
+            shared_metadata.extend([source_metadata] * len(chunks))
+            source_ids.extend(
+                [source_metadata.get("source_id", "unknown")] * len(chunks)
+            )
+            source_urls.extend([source_metadata.get("url")] * len(chunks))
+
+        if not all_ids:
+            return per_document
+
+        await self._embed_and_store(
+            chunk_ids=all_ids,
+            contents=all_contents,
+            source_ids=source_ids,
+            source_urls=source_urls,
+            metadata_list=all_metadata,
+            shared_metadata=shared_metadata,
+        )
+        return per_document
+
+    async def _embed_and_store(
+        self,
+        *,
+        chunk_ids: list[str],
+        contents: list[str],
+        source_ids: list[str],
+        source_urls: list[str | None],
+        metadata_list: list[dict[str, Any]],
+        shared_metadata: dict[str, Any] | list[dict[str, Any]],
+    ) -> None:
+        """Embed and write rows one ``WRITE_WINDOW_CHUNKS`` window at a time."""
+        window = self.WRITE_WINDOW_CHUNKS
+        for start in range(0, len(chunk_ids), window):
+            rows = slice(start, start + window)
+            window_contents = contents[rows]
+            await self.store.add_documents(
+                chunk_ids=chunk_ids[rows],
+                contents=window_contents,
+                embeddings=self.embedding_generator.embed_batch(window_contents),
+                source_ids=source_ids[rows],
+                source_urls=source_urls[rows],
+                metadata_list=metadata_list[rows],
+                shared_metadata=(
+                    shared_metadata
+                    if isinstance(shared_metadata, dict)
+                    else shared_metadata[rows]
+                ),
+            )
+
     async def query(
         self,
         query: MemoryQuery,
@@ -113,6 +188,33 @@ class MemoryAgent:
             filters=query.filters,
         )
 
+    async def search_batch(
+        self,
+        query_texts: Sequence[str],
+        top_k: int = 5,
+        min_score: float = 0.7,
+        filters: dict[str, Any] | None = None,
+    ) -> list[MemoryOutput | AgentFailure]:
+        """Search for several queries with one encode pass and one scan.
+
+        Args:
+            query_texts: Queries sharing the same search parameters.
+            top_k: Maximum number of results per query.
+            min_score: Minimum relevance score threshold.
+            filters: Optional metadata filters applied to every query.
+
+        Returns:
+            One MemoryOutput or AgentFailure per query, in input order.
+        """
+        if not query_texts:
+            return []
+        return await self.store.search_batch(
+            self.embedding_generator.embed_batch(list(query_texts)),
+            top_k=top_k,
+            min_score=min_score,
+            filters=filters,
+        )
+
     async def delete_by_source(self, source_id: str) -> int:
         """Delete all chunks from a specific source document.
 
@@ -127,3 +229,31 @@ class MemoryAgent:
     async def count_documents(self) -> int:
         """Return the total number of stored chunks."""
         return await self.store.count_documents()
+
+
+def _chunk_rows(
+    chunks: list[ParsedChunk],
+) -> tuple[list[str], list[str], list[dict[str, Any]]]:
+    """Split chunks into ID, content and per-chunk metadata columns.
+
+    All three columns are filled in a single traversal of ``chunks``.
+    """
+    chunk_ids: list[str] = []
+    contents: list[str] = []
+    metadata_list: list[dict[str, Any]] = []
+    add_id, add_content, add_metadata = (
+        chunk_ids.append,
+        contents.append,
+        metadata_list.append,
+    )
+    for chunk in chunks:
+        add_id(chunk.chunk_id)
+        add_content(chunk.content)
+        add_metadata(
+            {
+                "chunk_index": chunk.chunk_index,
+                "layout_type": chunk.layout_type,
+                "page_number": chunk.page_number,
+            }
+        )
+    return chunk_ids, contents, metadata_list
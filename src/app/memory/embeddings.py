@@ -6,6 +6,8 @@ Reference: docs/02_AGENT_SPECS.md Section 2.3
 
 from typing import Any
 
+import numpy as np
+from numpy.typing import NDArray
 from sentence_transformers import SentenceTransformer
 
 
@@ -13,53 +15,90 @@ class EmbeddingGenerator:
     """Generate embeddings using sentence-transformers.
 
     The default model 'all-MiniLM-L6-v2' produces 384-dim vectors
-    and is optimized for semantic search tasks.
+    and is optimized for semantic search tasks. Vectors are L2-normalized,
+    so cosine distance in the store reduces to a dot product.
     """
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2") -> None:
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        *,
+        device: str | None = None,
+        batch_size: int = 128,
+        fp16: bool = True,
+    ) -> None:
         """Initialize the embedding model.
 
         Args:
             model_name: Name of the sentence-transformers model to use.
+            device: Torch device for inference. ``None`` lets
+                sentence-transformers pick CUDA when available.
+            batch_size: Number of texts per forward pass in ``embed_batch``.
+            fp16: Cast the model to half precision when it runs on CUDA.
         """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
         self.model_name = model_name
+        self.device = device
+        self.batch_size = batch_size
+        self.fp16 = fp16
         self._model: SentenceTransformer | None = None
 
     @property
     def model(self) -> SentenceTransformer:
         """Lazy-load the sentence transformer model."""
         if self._model is None:
-            self._model = SentenceTransformer(self.model_name)
+            model = SentenceTransformer(self.model_name, device=self.device)
+            # Half precision only pays off on tensor cores; CPU kernels for
+            # FP16 are slower than FP32, so leave CPU models untouched.
+            if self.fp16 and str(model.device).startswith("cuda"):
+                model.half()
+            self._model = model
         return self._model
 
-    def embed_text(self, text: str) -> list[float]:
+    def preload(self) -> None:
+        """Load the model now instead of on the first embedding call.
+
+        Loading is synchronous disk and CPU work; servers call this from a
+        worker thread at startup so no request stalls the event loop on it.
+        """
+        _ = self.model
+
+    def embed_text(self, text: str) -> NDArray[np.float32]:
         """Generate embedding for a single text string.
 
         Args:
             text: The text to embed.
 
         Returns:
-            A list of floats representing the embedding vector.
+            A 1-D float32 array holding the embedding vector.
         """
-        embedding: Any = self.model.encode(text, convert_to_numpy=True)
-        # Convert numpy array to list for LanceDB compatibility
-        result: list[float] = embedding.tolist()
-        return result
+        embedding: Any = self.model.encode(
+            text, convert_to_numpy=True, normalize_embeddings=True
+        )
+        return np.asarray(embedding, dtype=np.float32)
 
-    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+    def embed_batch(self, texts: list[str]) -> NDArray[np.float32]:
         """Generate embeddings for a batch of texts.
 
+        The vectors stay in the model's ``(len(texts), dim)`` buffer instead
+        of being expanded into nested Python lists; LanceDBStore writes the
+        array straight into Arrow.
+
         Args:
             texts: List of texts to embed.
 
         Returns:
-            List of embedding vectors.
+            A 2-D float32 array with one row per text.
         """
         embeddings: Any = self.model.encode(
-            texts, convert_to_numpy=True, show_progress_bar=False
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
         )
-        result: list[list[float]] = embeddings.tolist()
-        return result
+        return np.asarray(embeddings, dtype=np.float32)
 
     @property
     def embedding_dim(self) -> int:
@@ -6,14 +6,57 @@ document embeddings with metadata.
 Reference: docs/01_DESIGN_DOC.md (LanceDB as vector store)
 """
 
-from typing import Any
+import asyncio
+import json
+import math
+import threading
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, ClassVar
 
 import lancedb
+import numpy as np
+import orjson
 import pyarrow as pa  # type: ignore[import-untyped]
+from numpy.typing import ArrayLike, NDArray
 
 from app.schemas import AgentFailure, ErrorCodes, MemoryOutput, RetrievedContext
 
 
+_RESULT_COLUMNS = ("chunk_id", "content", "source_id", "source_url", "metadata")
+
+
+@dataclass(frozen=True, slots=True)
+class _VectorCache:
+    """In-process copy of a small table's unit vectors and result columns."""
+
+    vectors: NDArray[np.float32]
+    rows: pa.Table
+
+    def nearest(
+        self, queries: NDArray[np.float32], top_k: int, min_score: float
+    ) -> list[pa.Table]:
+        """Return each query's best rows with a LanceDB-style ``_distance``.
+
+        Rows under ``min_score`` are masked out first, then ``argpartition``
+        selects the ``top_k`` candidates in linear time and only those are
+        sorted, instead of sorting every row.
+        """
+        # relevance = (1 + similarity) / 2, so the threshold maps linearly.
+        min_similarity = 2.0 * min_score - 1.0
+        nearest: list[pa.Table] = []
+        for similarities in queries @ self.vectors.T:
+            candidates = np.flatnonzero(similarities >= min_similarity)
+            if 0 < top_k < len(candidates):
+                best = np.argpartition(-similarities[candidates], top_k - 1)
+                candidates = candidates[best[:top_k]]
+            order = candidates[np.argsort(-similarities[candidates], kind="stable")]
+            order = order[: max(top_k, 0)]
+            distances = pa.array(1.0 - similarities[order], type=pa.float32())
+            nearest.append(self.rows.take(order).append_column("_distance", distances))
+        return nearest
+
+
 class LanceDBStore:
     """LanceDB wrapper for vector storage operations.
 
@@ -24,19 +67,83 @@ class LanceDBStore:
         - source_id: str (document identifier)
         - source_url: str | None (optional URL)
         - metadata: dict (additional metadata)
+        - one string column per ``FILTER_COLUMNS`` key, copied out of the
+          metadata so filters on it run as column predicates
+
+    Small tables are searched by brute force. Once a table reaches
+    ``VECTOR_INDEX_MIN_ROWS`` an IVF_FLAT index is built on ``embedding`` so a
+    query probes only the ``NPROBES`` nearest of about sqrt(rows) partitions
+    instead of every row. IVF_FLAT keeps exact vectors, so relevance scores
+    match the brute-force path. Rows appended later are searched flat until
+    ``INDEX_REFRESH_ROWS`` of them accumulate; the table is then optimized,
+    which folds them into the index.
+
+    With ``quantized_index`` the index is IVF_SQ instead: vectors inside the
+    index are scalar-quantized to int8, a quarter of the float32 size. Each
+    search over-fetches ``REFINE_FACTOR`` times the candidates from it and
+    re-ranks them against the stored float32 vectors, so the reported
+    distances stay exact.
+
+    Stored and query vectors are L2-normalized, so searches rank by the
+    ``dot`` metric: on unit vectors it equals cosine similarity without the
+    per-candidate norm computation. A table whose index was built with
+    ``cosine`` keeps searching with that metric so the index is still used.
+
+    Unfiltered searches on tables of at most ``IN_MEMORY_MAX_ROWS`` rows are
+    answered from an in-process copy of the vectors, refreshed whenever the
+    table version changes.
+
+    The LanceDB client is synchronous, so each coroutine runs its blocking
+    twin (``_search`` for ``search`` and so on) via ``asyncio.to_thread``
+    and the event loop keeps serving other requests meanwhile. Lazily built
+    shared state (table handle, index, vector cache) is set up under a lock.
     """
 
-    def __init__(self, db_path: str, embedding_dim: int = 384) -> None:
+    VECTOR_INDEX_MIN_ROWS: ClassVar[int] = 10_000
+    INDEX_REFRESH_ROWS: ClassVar[int] = 10_000
+    NPROBES: ClassVar[int] = 20
+    FILTER_COLUMNS: ClassVar[tuple[str, ...]] = ("source_type",)
+    IN_MEMORY_MAX_ROWS: ClassVar[int] = 10_000
+    READ_CONSISTENCY_INTERVAL: ClassVar[timedelta] = timedelta(seconds=1)
+    REFINE_FACTOR: ClassVar[int] = 4
+    DISTANCE_METRIC: ClassVar[str] = "dot"
+
+    def __init__(
+        self,
+        db_path: str,
+        embedding_dim: int = 384,
+        *,
+        quantized_index: bool = False,
+    ) -> None:
         """Initialize LanceDB connection.
 
         Args:
             db_path: Path to the LanceDB database directory.
             embedding_dim: Dimension of the embedding vectors (default 384).
+            quantized_index: Build an int8 IVF_SQ index instead of IVF_FLAT.
         """
         self.db_path = db_path
         self.embedding_dim = embedding_dim
-        self.db = lancedb.connect(db_path)
+        self.quantized_index = quantized_index
+        # The table handle is opened once and reused. Writes through it are
+        # visible immediately; writes from other processes are picked up
+        # within READ_CONSISTENCY_INTERVAL.
+        self.db = lancedb.connect(
+            db_path, read_consistency_interval=self.READ_CONSISTENCY_INTERVAL
+        )
         self.table_name = "documents"
+        self._table: Any | None = None
+        # FILTER_COLUMNS keys the open table actually has as columns
+        self._filter_columns: tuple[str, ...] = ()
+        self._index_name: str | None = None
+        self._metric: str | None = None
+        # (table version, cache) swapped as one tuple so threads never pair
+        # a version with another version's cache.
+        self._vector_cache: tuple[int, _VectorCache | None] | None = None
+        self._table_lock = threading.RLock()
+        self._index_lock = threading.Lock()
+        # The schema depends only on embedding_dim; build it once, not per write.
+        self._schema = self._get_schema()
 
     def _get_schema(self) -> pa.Schema:
         """Define the PyArrow schema for the LanceDB table."""
@@ -51,65 +158,221 @@ class LanceDBStore:
                 pa.field("source_id", pa.string()),
                 pa.field("source_url", pa.string()),
                 pa.field("metadata", pa.string()),  # JSON-encoded
+                *(pa.field(key, pa.string()) for key in self.FILTER_COLUMNS),
             ]
         )
 
+    def _embedding_column(self, embeddings: ArrayLike, rows: int) -> pa.Array:
+        """Wrap an ``(rows, dim)`` embedding matrix as a fixed-size list array.
+
+        The matrix is coerced to contiguous float32 and unit-normalized once,
+        then its flat buffer becomes the Arrow child array without a per-row
+        Python loop.
+        """
+        matrix: NDArray[np.float32] = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if matrix.shape != (rows, self.embedding_dim):
+            raise ValueError(
+                f"Expected embeddings of shape ({rows}, {self.embedding_dim}), "
+                f"got {matrix.shape}"
+            )
+        matrix = _normalized(matrix)
+        return pa.FixedSizeListArray.from_arrays(
+            pa.array(matrix.reshape(-1)), self.embedding_dim
+        )
+
     async def add_documents(
         self,
         chunk_ids: list[str],
         contents: list[str],
-        embeddings: list[list[float]],
+        embeddings: NDArray[np.floating[Any]] | list[list[float]],
         source_ids: list[str],
         source_urls: list[str | None],
         metadata_list: list[dict[str, Any]],
+        shared_metadata: dict[str, Any] | list[dict[str, Any]] | None = None,
     ) -> None:
         """Add documents with embeddings to LanceDB.
 
         Args:
             chunk_ids: List of unique chunk identifiers.
             contents: List of text contents.
-            embeddings: List of embedding vectors.
+            embeddings: ``(len(chunk_ids), dim)`` array or list of vectors.
             source_ids: List of source document identifiers.
             source_urls: List of source URLs (can be None).
             metadata_list: List of metadata dictionaries.
+            shared_metadata: Metadata common to every chunk, or one mapping
+                per row when rows span several documents. It is merged over
+                each entry of ``metadata_list`` but each distinct mapping is
+                encoded only once.
         """
-        import json
-
-        # Prepare data for insertion
-        data = []
-        for chunk_id, content, emb, src_id, src_url, meta in zip(
+        await asyncio.to_thread(
+            self._add_documents,
             chunk_ids,
             contents,
             embeddings,
             source_ids,
             source_urls,
             metadata_list,
-            strict=True,
-        ):
-            data.append(
-                {
-                    "chunk_id": chunk_id,
-                    "content": content,
-                    "embedding": emb,
-                    "source_id": src_id,
-                    "source_url": src_url if src_url else "",
-                    "metadata": json.dumps(meta),
-                }
-            )
+            shared_metadata,
+        )
+
+    def _add_documents(
+        self,
+        chunk_ids: list[str],
+        contents: list[str],
+        embeddings: NDArray[np.floating[Any]] | list[list[float]],
+        source_ids: list[str],
+        source_urls: list[str | None],
+        metadata_list: list[dict[str, Any]],
+        shared_metadata: dict[str, Any] | list[dict[str, Any]] | None = None,
+    ) -> None:
+        rows = len(chunk_ids)
+        lengths = {len(contents), len(source_ids), len(source_urls), len(metadata_list)}
+        if lengths != {rows}:
+            raise ValueError("All document columns must have the same length")
+
+        data = pa.Table.from_arrays(
+            [
+                pa.array(chunk_ids, type=pa.string()),
+                pa.array(contents, type=pa.string()),
+                self._embedding_column(embeddings, rows),
+                pa.array(source_ids, type=pa.string()),
+                # Missing URLs are stored as "" (read back as None); Arrow
+                # fills the nulls without a Python pass over the column.
+                pa.array(source_urls, type=pa.string()).fill_null(""),
+                pa.array(
+                    _encode_metadata(metadata_list, shared_metadata),
+                    type=pa.string(),
+                ),
+                *(
+                    pa.array(
+                        _metadata_values(metadata_list, shared_metadata, key),
+                        type=pa.string(),
+                    )
+                    for key in self.FILTER_COLUMNS
+                ),
+            ],
+            schema=self._schema,
+        )
 
         # Create or append to table
-        try:
-            table = self.db.open_table(self.table_name)
+        table = self._open_table()
+        created = False
+        if table is None:
+            table, created = self._create_table(data)
+        if not created:
+            self._add_filter_columns(table)
+            version = table.version
             table.add(data)
-        except (FileNotFoundError, ValueError):
-            # Table doesn't exist, create it
-            self.db.create_table(self.table_name, data=data, mode="overwrite")
+            self._extend_vector_cache(version, table.version, data)
+
+        with self._index_lock:
+            self._ensure_vector_index(table)
+
+    def _create_table(self, data: pa.Table) -> tuple[Any, bool]:
+        """Create the table from ``data`` unless another write just did.
+
+        Creation is locked so two concurrent first writes cannot both create
+        (and so overwrite) the table. Returns the handle and whether ``data``
+        was written by the creation.
+        """
+        with self._table_lock:
+            table = self._open_table()
+            if table is not None:
+                return table, False
+            self._table = self.db.create_table(
+                self.table_name, data=data, mode="overwrite"
+            )
+            self._filter_columns = self.FILTER_COLUMNS
+            return self._table, True
+
+    def _add_filter_columns(self, table: Any) -> None:
+        """Add any ``FILTER_COLUMNS`` column the table predates, as all-null.
+
+        Only the write path migrates, so reads never change the table; until
+        then filters fall back to matching the rows' metadata JSON.
+        """
+        if len(self._filter_columns) == len(self.FILTER_COLUMNS):
+            return
+        with self._table_lock:
+            names = table.schema.names
+            missing = [key for key in self.FILTER_COLUMNS if key not in names]
+            if missing:
+                table.add_columns(dict.fromkeys(missing, "CAST(NULL AS STRING)"))
+            self._filter_columns = self.FILTER_COLUMNS
+
+    def _ensure_vector_index(self, table: Any) -> None:
+        """Build the ANN index once the table is large enough to benefit.
+
+        Once built, the index is kept current: when enough appended rows are
+        still unindexed (and so scanned flat on every query), ``optimize``
+        adds them to the existing partitions without retraining.
+        """
+        metric = self._distance_metric(table)
+        if self._index_name is not None:
+            stats = table.index_stats(self._index_name)
+            if stats is not None and (
+                stats.num_unindexed_rows >= self.INDEX_REFRESH_ROWS
+            ):
+                table.optimize()
+            return
+        rows = table.count_rows()
+        if rows < self.VECTOR_INDEX_MIN_ROWS:
+            return
+        table.create_index(
+            metric=metric,
+            vector_column_name="embedding",
+            index_type="IVF_SQ" if self.quantized_index else "IVF_FLAT",
+            num_partitions=max(1, math.isqrt(rows)),
+        )
+        self._set_index(table)
+
+    def _distance_metric(self, table: Any) -> str:
+        """Return the search metric, matching an existing embedding index.
+
+        LanceDB falls back to brute force when the query metric differs from
+        the index metric, so an index built with ``cosine`` keeps being
+        queried with ``cosine``. Both give the same distances on unit vectors.
+        """
+        if self._metric is None:
+            self._metric = self.DISTANCE_METRIC
+            self._set_index(table)
+        return self._metric
+
+    def _set_index(self, table: Any) -> None:
+        """Record the embedding index and its metric, if one exists."""
+        for index in table.list_indices():
+            if index.columns == ["embedding"]:
+                self._index_name = index.name
+                self._metric = table.index_stats(index.name).distance_type
+
+    def _open_table(self) -> Any | None:
+        """Return the cached table handle, or None if the table is missing.
+
+        Opening never writes. Tables created before a key joined
+        ``FILTER_COLUMNS`` are migrated by the next ``_add_documents``.
+        """
+        if self._table is not None:
+            return self._table
+        with self._table_lock:
+            if self._table is None:
+                try:
+                    table = self.db.open_table(self.table_name)
+                except (FileNotFoundError, ValueError):
+                    return None
+                names = table.schema.names
+                self._filter_columns = tuple(
+                    key for key in self.FILTER_COLUMNS if key in names
+                )
+                self._table = table
+            return self._table
 
     async def count_documents(self) -> int:
         """Return the total number of stored chunks."""
-        try:
-            table = self.db.open_table(self.table_name)
-        except (FileNotFoundError, ValueError):
+        return await asyncio.to_thread(self._count_documents)
+
+    def _count_documents(self) -> int:
+        table = self._open_table()
+        if table is None:
             return 0
 
         count_rows = getattr(table, "count_rows", None)
@@ -123,7 +386,7 @@ class LanceDBStore:
 
     async def search(
         self,
-        query_embedding: list[float],
+        query_embedding: NDArray[np.floating[Any]] | list[float],
         top_k: int = 5,
         min_score: float = 0.7,
         filters: dict[str, Any] | None = None,
@@ -139,74 +402,182 @@ class LanceDBStore:
         Returns:
             MemoryOutput with results or AgentFailure if no results.
         """
-        import json
+        return await asyncio.to_thread(
+            self._search, query_embedding, top_k, min_score, filters
+        )
 
-        try:
-            table = self.db.open_table(self.table_name)
-        except (FileNotFoundError, ValueError):
-            return AgentFailure(
-                agent_id="memory",
-                error_code=ErrorCodes.MEMORY_NO_RESULTS,
-                message="No documents in vector store",
-                recoverable=True,
-            )
+    def _search(
+        self,
+        query_embedding: NDArray[np.floating[Any]] | list[float],
+        top_k: int = 5,
+        min_score: float = 0.7,
+        filters: dict[str, Any] | None = None,
+    ) -> MemoryOutput | AgentFailure:
+        table = self._open_table()
+        if table is None:
+            return _empty_store_failure()
+
+        query_vector = _normalized(np.asarray(query_embedding, dtype=np.float32))
+        cache = None if filters else self._cached_vectors(table)
+        if cache is not None:
+            [results] = cache.nearest(query_vector.reshape(1, -1), top_k, min_score)
+        else:
+            results = self._vector_query(table, query_vector, top_k, filters).to_arrow()
+        return _to_output(results, top_k, min_score, filters)
+
+    async def search_batch(
+        self,
+        query_embeddings: NDArray[np.floating[Any]] | list[list[float]],
+        top_k: int = 5,
+        min_score: float = 0.7,
+        filters: dict[str, Any] | None = None,
+    ) -> list[MemoryOutput | AgentFailure]:
+        """Search for several query vectors in one LanceDB scan.
+
+        Brute-force search is bound by reading the stored vectors, so sharing
+        one pass across all queries is cheaper than one ``search`` per query.
+
+        Args:
+            query_embeddings: ``(queries, dim)`` array or list of vectors.
+            top_k: Maximum number of results to return per query.
+            min_score: Minimum relevance score threshold.
+            filters: Optional metadata filters applied to every query.
 
-        # Perform vector search
-        results = (
-            table.search(query_embedding)
-            .metric("cosine")
-            .limit(top_k * 2)  # Get more results to allow filtering
-            .to_list()
+        Returns:
+            One MemoryOutput or AgentFailure per query, in input order.
+        """
+        return await asyncio.to_thread(
+            self._search_batch, query_embeddings, top_k, min_score, filters
         )
 
-        # Filter and convert results
-        retrieved_contexts: list[RetrievedContext] = []
-        for result in results:
-            # LanceDB returns cosine similarity (0-2 range, higher is more similar)
-            # Convert to 0-1 scale where 1 is perfect match
-            cosine_similarity = result.get("_distance", 0.0)
-            relevance_score = 1.0 - (cosine_similarity / 2.0)
-
-            # Apply min_score filter
-            if relevance_score < min_score:
-                continue
-
-            # Parse metadata
-            metadata = json.loads(result["metadata"])
-
-            # Apply metadata filters if present
-            if filters and not all(metadata.get(k) == v for k, v in filters.items()):
-                continue
-
-            # Only add if we haven't reached top_k yet
-            if len(retrieved_contexts) >= top_k:
-                break
-
-            retrieved_contexts.append(
-                RetrievedContext(
-                    chunk_id=result["chunk_id"],
-                    content=result["content"],
-                    source_id=result["source_id"],
-                    source_url=result["source_url"] if result["source_url"] else None,
-                    relevance_score=float(relevance_score),
-                    metadata=metadata,
-                )
-            )
+    def _search_batch(
+        self,
+        query_embeddings: NDArray[np.floating[Any]] | list[list[float]],
+        top_k: int = 5,
+        min_score: float = 0.7,
+        filters: dict[str, Any] | None = None,
+    ) -> list[MemoryOutput | AgentFailure]:
+        matrix = np.asarray(query_embeddings, dtype=np.float32).reshape(
+            -1, self.embedding_dim
+        )
+        if not len(matrix):
+            return []
+        table = self._open_table()
+        if table is None:
+            return [_empty_store_failure() for _ in range(len(matrix))]
+
+        matrix = _normalized(matrix)
+        cache = None if filters else self._cached_vectors(table)
+        if cache is not None:
+            return [
+                _to_output(results, top_k, min_score, filters)
+                for results in cache.nearest(matrix, top_k, min_score)
+            ]
 
-        if not retrieved_contexts:
-            return AgentFailure(
-                agent_id="memory",
-                error_code=ErrorCodes.MEMORY_NO_RESULTS,
-                message=f"No results above threshold {min_score}",
-                recoverable=True,
-                details={"min_score": min_score, "filters": filters},
+        results = self._vector_query(table, matrix, top_k, filters).to_arrow()
+        if "query_index" not in results.column_names:
+            # LanceDB only adds query_index when the query matrix has >1 row
+            return [_to_output(results, top_k, min_score, filters)]
+        query_index = results.column("query_index").to_numpy(zero_copy_only=False)
+        return [
+            _to_output(
+                results.take(np.flatnonzero(query_index == index)),
+                top_k,
+                min_score,
+                filters,
+            )
+            for index in range(len(matrix))
+        ]
+
+    def _cached_vectors(self, table: Any) -> _VectorCache | None:
+        """Return an in-memory copy of a small table, reloading on writes.
+
+        Below ``IN_MEMORY_MAX_ROWS`` a NumPy matrix product over the cached
+        vectors is an order of magnitude faster than a LanceDB scan, which
+        pays fixed planning and I/O costs per query. The cache is keyed by
+        the table version. Appends through this store extend it in place
+        (``_extend_vector_cache``); any other change, such as a delete or a
+        write from another handle, reloads it.
+        """
+        version = table.version
+        current = self._vector_cache
+        if current is not None and current[0] == version:
+            return current[1]
+
+        cache = None
+        if table.count_rows() <= self.IN_MEMORY_MAX_ROWS:
+            data = table.to_arrow()
+            embeddings = data.column("embedding").combine_chunks().flatten()
+            vectors = embeddings.to_numpy().reshape(-1, self.embedding_dim)
+            cache = _VectorCache(
+                vectors=_aligned(_normalized(vectors)),
+                rows=data.select(list(_RESULT_COLUMNS)),
             )
+        self._vector_cache = (version, cache)
+        return cache
+
+    def _extend_vector_cache(self, before: int, after: int, data: pa.Table) -> None:
+        """Append rows this store just wrote to the in-memory vector cache.
 
-        return MemoryOutput(
-            results=retrieved_contexts,
-            total_found=len(retrieved_contexts),
+        Only applies when the cache reflects the table as of ``before`` and
+        the append was the sole change since (``after == before + 1``). In
+        any other case the cache is left as is and reloads lazily.
+        """
+        current = self._vector_cache
+        if current is None or current[0] != before or after != before + 1:
+            return
+        cache = current[1]
+        if cache is None:
+            return
+        if len(cache.rows) + data.num_rows > self.IN_MEMORY_MAX_ROWS:
+            self._vector_cache = (after, None)
+            return
+        # Stored vectors are already unit length (see _embedding_column)
+        added = data.column("embedding").combine_chunks().flatten().to_numpy()
+        vectors = np.concatenate([cache.vectors, added.reshape(-1, self.embedding_dim)])
+        self._vector_cache = (
+            after,
+            _VectorCache(
+                vectors=_aligned(vectors),
+                rows=pa.concat_tables(
+                    [cache.rows, data.select(list(_RESULT_COLUMNS))],
+                    promote_options="permissive",
+                ),
+            ),
         )
 
+    def _vector_query(
+        self,
+        table: Any,
+        vectors: NDArray[np.float32],
+        top_k: int,
+        filters: dict[str, Any] | None,
+    ) -> Any:
+        """Build the LanceDB query for one vector or a ``(queries, dim)`` batch.
+
+        The embedding column is left out of the projection so result vectors
+        are never materialized in Python.
+        """
+        query = (
+            table.search(vectors)
+            .metric(self._distance_metric(table))
+            .select(list(_RESULT_COLUMNS))
+            # The prefilter can pass a few rows the exact check drops.
+            .limit(top_k * 2 if filters else top_k)
+        )
+        predicate = (
+            _metadata_predicate(filters, self._filter_columns) if filters else None
+        )
+        if predicate:
+            # Drop non-matching rows inside LanceDB before the limit applies.
+            query = query.where(predicate, prefilter=True)
+        if self._index_name is not None:
+            query = query.nprobes(self.NPROBES)
+        if self.quantized_index:
+            # Re-rank the int8 candidates with the exact float32 vectors.
+            query = query.refine_factor(self.REFINE_FACTOR)
+        return query
+
     async def delete_by_source(self, source_id: str) -> int:
         """Delete all chunks from a specific source.
 
@@ -216,14 +587,223 @@ class LanceDBStore:
         Returns:
             Number of chunks deleted.
         """
-        try:
-            table = self.db.open_table(self.table_name)
-            # Count matching records before deletion
-            all_records = table.to_pandas()
-            count = len(all_records[all_records["source_id"] == source_id])
-
-            # Delete matching records
-            table.delete(f'source_id = "{source_id}"')
-            return count
-        except (FileNotFoundError, ValueError):
+        return await asyncio.to_thread(self._delete_by_source, source_id)
+
+    def _delete_by_source(self, source_id: str) -> int:
+        table = self._open_table()
+        if table is None:
             return 0
+
+        # Count with the same predicate the delete uses, so the match runs in
+        # LanceDB instead of materializing the whole table in pandas.
+        predicate = _source_predicate(source_id)
+        count = int(table.count_rows(predicate))
+        if count:
+            table.delete(predicate)
+        return count
+
+
+def _empty_store_failure() -> AgentFailure:
+    """Return the failure reported when the table does not exist yet."""
+    return AgentFailure(
+        agent_id="memory",
+        error_code=ErrorCodes.MEMORY_NO_RESULTS,
+        message="No documents in vector store",
+        recoverable=True,
+    )
+
+
+def _to_output(
+    results: pa.Table,
+    top_k: int,
+    min_score: float,
+    filters: dict[str, Any] | None,
+) -> MemoryOutput | AgentFailure:
+    """Turn one query's LanceDB rows into retrieved contexts."""
+    # On unit vectors both metrics return 1 - cosine (0-2 range, lower is
+    # more similar); convert to a 0-1 relevance scale for the whole batch
+    # at once and keep only rows above the threshold.
+    distances = results.column("_distance").to_numpy(zero_copy_only=False)
+    scores = 1.0 - (distances / 2.0)
+    keep = np.flatnonzero(scores >= min_score)
+    if not filters:
+        # Rows arrive nearest first, so without filters nothing past top_k
+        # can be returned; skip converting it to Python objects.
+        keep = keep[:top_k]
+    rows = zip(
+        *(results.column(name).take(keep).to_pylist() for name in _RESULT_COLUMNS),
+        scores[keep].tolist(),
+        strict=True,
+    )
+
+    # Resolve the filter pairs once rather than per candidate row.
+    filter_items = tuple(filters.items()) if filters else ()
+
+    retrieved_contexts: list[RetrievedContext] = []
+    for chunk_id, content, source_id, source_url, raw_metadata, score in rows:
+        metadata = orjson.loads(raw_metadata)
+
+        # Apply metadata filters if present
+        if filter_items and not all(
+            metadata.get(key) == expected for key, expected in filter_items
+        ):
+            continue
+
+        # Values come straight from our own typed columns, so pydantic
+        # validation would only re-check what the schema already guarantees.
+        retrieved_contexts.append(
+            RetrievedContext.model_construct(
+                chunk_id=chunk_id,
+                content=content,
+                source_id=source_id,
+                source_url=source_url or None,
+                relevance_score=score,
+                metadata=metadata,
+            )
+        )
+        if len(retrieved_contexts) >= top_k:
+            break
+
+    if not retrieved_contexts:
+        return AgentFailure(
+            agent_id="memory",
+            error_code=ErrorCodes.MEMORY_NO_RESULTS,
+            message=f"No results above threshold {min_score}",
+            recoverable=True,
+            details={"min_score": min_score, "filters": filters},
+        )
+
+    return MemoryOutput.model_construct(
+        results=retrieved_contexts,
+        total_found=len(retrieved_contexts),
+    )
+
+
+def _normalized(vectors: NDArray[np.float32]) -> NDArray[np.float32]:
+    """Return ``vectors`` scaled to unit length along the last axis.
+
+    Model output is normally unit-length already; it is returned as-is
+    rather than copied.
+    """
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    if np.allclose(norms, 1.0, atol=1e-4):
+        return vectors
+    scaled: NDArray[np.float32] = vectors / np.maximum(norms, np.float32(1e-12))
+    return scaled
+
+
+def _aligned(vectors: NDArray[np.float32], alignment: int = 64) -> NDArray[np.float32]:
+    """Return ``vectors`` as a C-contiguous array on an ``alignment`` boundary.
+
+    BLAS kernels issue aligned SIMD loads when rows start on a cache line;
+    Arrow buffers usually do already, so the copy is only made when needed.
+    """
+    if vectors.flags.c_contiguous and vectors.ctypes.data % alignment == 0:
+        return vectors
+    itemsize = vectors.dtype.itemsize
+    buffer = np.empty(vectors.size + alignment // itemsize, dtype=vectors.dtype)
+    offset = (-buffer.ctypes.data % alignment) // itemsize
+    aligned = buffer[offset : offset + vectors.size].reshape(vectors.shape)
+    aligned[...] = vectors
+    return aligned
+
+
+def _metadata_predicate(
+    filters: dict[str, Any], filter_columns: tuple[str, ...]
+) -> str | None:
+    """Build a prefilter for the string-valued metadata filters.
+
+    Keys in ``filter_columns`` compare against their own column. Other keys,
+    and rows written before their column existed (null there), use ``LIKE``
+    on the metadata JSON: a row where ``key == value`` always contains the
+    ``"key":"value"`` fragment, or ``"key": "value"`` with ASCII escapes in
+    rows written by the stdlib encoder. The match is a superset (the
+    fragment may also sit inside a longer string), so callers still check
+    the decoded metadata. Non-string values are left to that check, since
+    e.g. ``1 == 1.0`` holds in Python but not textually.
+    """
+    clauses = []
+    for key, value in filters.items():
+        if not isinstance(key, str) or not isinstance(value, str):
+            continue
+        fragments = {
+            f"{orjson.dumps(key).decode()}:{orjson.dumps(value).decode()}",
+            f"{json.dumps(key)}: {json.dumps(value)}",
+        }
+        matches = " OR ".join(
+            f"metadata LIKE '%{_like_escape(fragment)}%'"
+            for fragment in sorted(fragments)
+        )
+        if key in filter_columns:
+            matches = f"{key} = {_sql_str(value)} OR ({key} IS NULL AND ({matches}))"
+        clauses.append(f"({matches})")
+    return " AND ".join(clauses) or None
+
+
+def _sql_str(value: str) -> str:
+    """Quote ``value`` as a SQL string literal, doubling embedded quotes."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _like_escape(fragment: str) -> str:
+    """Escape ``fragment`` for use inside a quoted SQL ``LIKE`` pattern."""
+    for char in ("\\", "%", "_"):
+        fragment = fragment.replace(char, f"\\{char}")
+    return fragment.replace("'", "''")
+
+
+def _source_predicate(source_id: str) -> str:
+    """Build a SQL filter matching ``source_id`` as a string literal."""
+    return f"source_id = {_sql_str(source_id)}"
+
+
+def _metadata_values(
+    metadata_list: list[dict[str, Any]],
+    shared: dict[str, Any] | list[dict[str, Any]] | None,
+    key: str,
+) -> list[str | None]:
+    """Return each row's string value for ``key``, shared metadata winning."""
+    per_row = shared if isinstance(shared, list) else [shared] * len(metadata_list)
+    values: list[str | None] = []
+    for meta, row_shared in zip(metadata_list, per_row, strict=True):
+        value = row_shared[key] if row_shared and key in row_shared else meta.get(key)
+        values.append(value if isinstance(value, str) else None)
+    return values
+
+
+def _dumps(value: dict[str, Any]) -> bytes:
+    """Serialize metadata to UTF-8 JSON with orjson."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _encode_metadata(
+    metadata_list: list[dict[str, Any]],
+    shared: dict[str, Any] | list[dict[str, Any]] | None,
+) -> list[bytes]:
+    """JSON-encode per-chunk metadata with the shared fields appended.
+
+    Each shared object is serialized once and spliced into every row that
+    references it. Per-chunk keys the shared object also sets are dropped
+    before encoding, so the result equals ``{**meta, **shared}`` with no
+    duplicate keys for readers to disagree on. Rows stay UTF-8 bytes; Arrow
+    takes them for the string column without a decode step.
+    """
+    if not shared:
+        return [_dumps(meta) for meta in metadata_list]
+
+    per_row = [shared] * len(metadata_list) if isinstance(shared, dict) else shared
+    shared_bodies: dict[int, bytes] = {}
+    encoded: list[bytes] = []
+    for meta, row_shared in zip(metadata_list, per_row, strict=True):
+        shared_body = shared_bodies.get(id(row_shared))
+        if shared_body is None:
+            shared_body = _dumps(row_shared)[1:-1]
+            shared_bodies[id(row_shared)] = shared_body
+        if not meta.keys().isdisjoint(row_shared):
+            meta = {key: value for key, value in meta.items() if key not in row_shared}
+        body = _dumps(meta)[1:-1]
+        if body and shared_body:
+            encoded.append(b"{" + body + b"," + shared_body + b"}")
+        else:
+            encoded.append(b"{" + (body or shared_body) + b"}")
+    return encoded
@@ -3,7 +3,8 @@
 Reference: docs/02_AGENT_SPECS.md Section 2 & 4
 """
 
-from datetime import datetime
+from datetime import UTC, datetime
+from functools import partial
 from typing import Any, Literal
 
 from pydantic import BaseModel, Field
@@ -13,7 +14,7 @@ class AgentMetadata(BaseModel):
     """Metadata attached to agent operations."""
 
     agent_id: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=partial(datetime.now, UTC))
     model_version: str
 
 
@@ -28,7 +29,7 @@ class AgentFailure(BaseModel):
     message: str
     recoverable: bool = False
     details: dict[str, Any] | None = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=partial(datetime.now, UTC))
 
 
 # Standard Error Codes (from AGENT_SPECS.md)
@@ -3,9 +3,11 @@
 Reference: docs/02_AGENT_SPECS.md Section 2.5 & 3
 """
 
-from datetime import datetime
+from datetime import UTC, datetime
+from functools import partial
+from typing import ClassVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.schemas.base import MessageRole, PlanStatus
 from app.schemas.memory import RetrievedContext
@@ -43,17 +45,24 @@ class OrchestratorOutput(BaseModel):
 class ConversationMessage(BaseModel):
     """A single message in the conversation history."""
 
+    model_config = ConfigDict(frozen=True)
+
     role: MessageRole
     content: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=partial(datetime.now, UTC))
 
 
 class ConversationState(BaseModel):
     """State object maintained by the Orchestrator.
 
     Reference: docs/02_AGENT_SPECS.md Section 3
+
+    ``history`` keeps only the latest ``MAX_HISTORY`` messages, so the cost of
+    serializing and re-validating a long session's state stays bounded.
     """
 
+    MAX_HISTORY: ClassVar[int] = 100
+
     session_id: str
     history: list[ConversationMessage] = Field(default_factory=list)
 
@@ -67,8 +76,11 @@ class ConversationState(BaseModel):
     def add_message(self, role: MessageRole, content: str) -> None:
         """Add a message to the conversation history."""
         self.history.append(
-            ConversationMessage(role=role, content=content, timestamp=datetime.utcnow())
+            ConversationMessage(role=role, content=content, timestamp=datetime.now(UTC))
         )
+        overflow = len(self.history) - self.MAX_HISTORY
+        if overflow > 0:
+            del self.history[:overflow]
 
     def clear_context(self) -> None:
         """Clear working context while preserving history."""
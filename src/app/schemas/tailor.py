@@ -3,7 +3,7 @@
 Reference: docs/02_AGENT_SPECS.md Section 2.4
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.schemas.base import Persona
 from app.schemas.memory import RetrievedContext
@@ -12,6 +12,8 @@ from app.schemas.memory import RetrievedContext
 class SourceCitation(BaseModel):
     """Citation for a source used in the response."""
 
+    model_config = ConfigDict(frozen=True)
+
     source_id: str
     chunk_id: str
     text_snippet: str
@@ -0,0 +1,54 @@
+"""Retry delay calculation shared by the connectors and the LLM service."""
+
+from __future__ import annotations
+
+import random
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+
+def backoff_delay(
+    attempt: int,
+    *,
+    initial_seconds: float,
+    max_seconds: float,
+    retry_after: str | None = None,
+) -> float:
+    """Return how long to sleep before retry ``attempt`` (zero-based).
+
+    A server-provided ``Retry-After`` value wins when it parses. Otherwise
+    the capped exponential delay is drawn with full jitter so throttled
+    workers do not all retry on the same tick.
+
+    Args:
+        attempt: Zero-based index of the attempt that just failed.
+        initial_seconds: Delay ceiling for the first retry.
+        max_seconds: Upper bound for any delay.
+        retry_after: Raw ``Retry-After`` header value, if any.
+    """
+    if retry_after is not None:
+        delay = _parse_retry_after(retry_after)
+        if delay is not None:
+            return min(delay, max_seconds)
+
+    ceiling = min(max_seconds, initial_seconds * (2**attempt))
+    return random.uniform(0, ceiling)
+
+
+def _parse_retry_after(value: str) -> float | None:
+    """Parse a Retry-After header given as seconds or an HTTP date."""
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
+
+
+__all__ = ["backoff_delay"]
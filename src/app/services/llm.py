@@ -2,9 +2,10 @@
 
 This module provides a unified async interface for LLM interactions with:
 - Provider abstraction (OpenAI/Anthropic)
-- Retry logic with exponential backoff
+- Retry logic with jittered exponential backoff honoring Retry-After
 - Error handling with AgentFailure conversion
 - Token tracking for cost analysis
+- Response caching for deterministic (temperature 0) requests
 - Streaming support
 
 Reference: docs/02_AGENT_SPECS.md Section 4 (Error Codes)
@@ -15,14 +16,27 @@ from __future__ import annotations
 import asyncio
 import inspect
 import logging
-from typing import TYPE_CHECKING, Any, Literal, TypeVar, cast
+from functools import cache, lru_cache
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, ClassVar, Literal, TypeVar, cast
 
 import httpx
 from anthropic import AsyncAnthropic
+from anthropic import DefaultAsyncHttpxClient as AnthropicHttpClient
 from openai import AsyncOpenAI
+from openai import DefaultAsyncHttpxClient as OpenAIHttpClient
 
 from app.config import get_settings
 from app.schemas import AgentFailure, ErrorCodes
+from app.services.backoff import backoff_delay
+from app.services.llm_cache import LLMCache
+
+
+try:  # Optional exact tokenizer
+    import tiktoken
+except ImportError:  # pragma: no cover - count_tokens falls back to a heuristic
+    # Only an error where tiktoken's own type hints are installed
+    tiktoken = None  # type: ignore[assignment, unused-ignore]
 
 
 if TYPE_CHECKING:
@@ -33,6 +47,9 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 T = TypeVar("T")
 
+_CACHE_READ_POLICIES = frozenset({"enabled", "read-only", "replay"})
+_CACHE_WRITE_POLICIES = frozenset({"enabled", "write-only"})
+
 
 class LLMService:
     """Unified LLM service supporting OpenAI and Anthropic providers.
@@ -40,8 +57,18 @@ class LLMService:
     Provides async methods for text generation with automatic retry logic,
     error handling, and token tracking. All network errors are converted
     to AgentFailure objects with appropriate error codes.
+
+    Construct it once via ``get_llm_service`` so every caller shares the
+    same HTTP connection pool instead of paying a TLS handshake per instance.
     """
 
+    # Connection pool sizing for the provider's HTTP client
+    MAX_CONNECTIONS: ClassVar[int] = 100
+    MAX_KEEPALIVE_CONNECTIONS: ClassVar[int] = 20
+    KEEPALIVE_EXPIRY_SECONDS: ClassVar[float] = 60.0
+    # Multiplex requests over one connection when httpx[http2] is installed
+    HTTP2: ClassVar[bool] = find_spec("h2") is not None
+
     def __init__(self) -> None:
         """Initialize LLM service with configured provider."""
         self._settings = get_settings()
@@ -49,7 +76,28 @@ class LLMService:
         self._model = self._settings.llm_model
         self._max_retries = self._settings.llm_max_retries
         self._timeout = self._settings.llm_timeout_seconds
+        self._default_temperature = self._settings.llm_temperature
+        self._default_max_tokens = self._settings.llm_max_tokens
         self._client: AsyncOpenAI | AsyncAnthropic | None = None
+        self._cache_policy = self._settings.llm_cache_policy
+        self._cache = LLMCache()
+        self._in_flight: dict[str, asyncio.Task[str | AgentFailure]] = {}
+        # The provider is fixed for the instance, so bind its call paths once.
+        self._generate_impl: Callable[[str, str | None, float, int], Awaitable[str]] = (
+            self._generate_openai
+            if self._provider == "openai"
+            else self._generate_anthropic
+        )
+        self._stream_impl: Callable[
+            [str, str | None, float, int], AsyncGenerator[str, None]
+        ] = (
+            self._stream_openai
+            if self._provider == "openai"
+            else self._stream_anthropic
+        )
+        # Provider prompt-cache accounting across this service's requests
+        self._input_tokens = 0
+        self._cached_input_tokens = 0
 
         # Validate API keys
         if self._provider == "openai" and not self._settings.openai_api_key:
@@ -81,17 +129,29 @@ class LLMService:
         if self._client is not None:
             return self._client
 
+        timeout = httpx.Timeout(self._timeout, connect=10.0)
+        limits = httpx.Limits(
+            max_connections=self.MAX_CONNECTIONS,
+            max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=self.KEEPALIVE_EXPIRY_SECONDS,
+        )
         if self._provider == "openai":
             self._client = AsyncOpenAI(
                 api_key=self._settings.openai_api_key,
-                timeout=httpx.Timeout(self._timeout, connect=10.0),
+                timeout=timeout,
                 max_retries=0,  # We handle retries ourselves
+                http_client=OpenAIHttpClient(
+                    timeout=timeout, limits=limits, http2=self.HTTP2
+                ),
             )
         else:  # anthropic
             self._client = AsyncAnthropic(
                 api_key=self._settings.anthropic_api_key,
-                timeout=httpx.Timeout(self._timeout, connect=10.0),
+                timeout=timeout,
                 max_retries=0,  # We handle retries ourselves
+                http_client=AnthropicHttpClient(
+                    timeout=timeout, limits=limits, http2=self.HTTP2
+                ),
             )
 
         assert self._client is not None
@@ -114,6 +174,18 @@ class LLMService:
                     await result
         self._client = None
 
+    @property
+    def prompt_cache_hit_rate(self) -> float:
+        """Fraction of input tokens the provider served from its prompt cache."""
+        if not self._input_tokens:
+            return 0.0
+        return self._cached_input_tokens / self._input_tokens
+
+    def _record_usage(self, input_tokens: int, cached_tokens: int) -> None:
+        """Accumulate input and prompt-cache token counts for the hit rate."""
+        self._input_tokens += input_tokens
+        self._cached_input_tokens += cached_tokens
+
     def _get_openai_client(self) -> AsyncOpenAI:
         """Return the OpenAI client with an explicit type cast."""
         return cast(AsyncOpenAI, self._get_client())
@@ -140,6 +212,11 @@ class LLMService:
         Returns:
             Generated text string, or AgentFailure on error
 
+        Temperature-0 responses are served from and stored in the response
+        cache according to ``llm_cache_policy``; in ``replay`` mode a cache
+        miss fails instead of calling the provider. Concurrent identical
+        temperature-0 requests are coalesced into a single provider call.
+
         Example:
             response = await llm_service.generate(
                 prompt="What is 2+2?",
@@ -147,18 +224,43 @@ class LLMService:
                 temperature=0.0
             )
         """
-        temp = (
-            temperature if temperature is not None else self._settings.llm_temperature
-        )
-        tokens = max_tokens if max_tokens is not None else self._settings.llm_max_tokens
+        temp = temperature if temperature is not None else self._default_temperature
+        tokens = max_tokens if max_tokens is not None else self._default_max_tokens
+
+        cache_key = self._cache_key(prompt, system, temp, tokens)
+        cached = await self._read_cache(cache_key)
+        if cached is not None:
+            return cached
+
+        if cache_key is None:
+            return await self._request(prompt, system, temp, tokens, None)
+
+        # Identical deterministic requests already in flight share one
+        # provider call; shield() keeps a cancelled caller from aborting it.
+        pending = self._in_flight.get(cache_key)
+        if pending is None:
+            pending = asyncio.create_task(
+                self._request(prompt, system, temp, tokens, cache_key)
+            )
+            self._in_flight[cache_key] = pending
+            pending.add_done_callback(lambda _: self._in_flight.pop(cache_key, None))
+        return await asyncio.shield(pending)
+
+    async def _request(
+        self,
+        prompt: str,
+        system: str | None,
+        temp: float,
+        tokens: int,
+        cache_key: str | None,
+    ) -> str | AgentFailure:
+        """Call the provider with retries, caching a successful response."""
 
         async def _call() -> str:
-            if self._provider == "openai":
-                return await self._generate_openai(prompt, system, temp, tokens)
-            return await self._generate_anthropic(prompt, system, temp, tokens)
+            return await self._generate_impl(prompt, system, temp, tokens)
 
         try:
-            return await self._retry_with_backoff(_call)
+            response = await self._retry_with_backoff(_call)
         except httpx.TimeoutException as exc:
             logger.error(
                 "LLM request timeout",
@@ -190,6 +292,41 @@ class LLMService:
                 details={"error": str(exc)},
             )
 
+        if cache_key is not None and self._cache_policy in _CACHE_WRITE_POLICIES:
+            await self._cache.set(cache_key, response)
+        return response
+
+    def _cache_key(
+        self, prompt: str, system: str | None, temperature: float, max_tokens: int
+    ) -> str | None:
+        """Return the response-cache key, or None for sampled requests."""
+        if temperature != 0:
+            return None
+        return LLMCache.key(
+            provider=self._provider,
+            model=self._model,
+            prompt=prompt,
+            system=system,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
+    async def _read_cache(self, cache_key: str | None) -> str | AgentFailure | None:
+        """Return a cached response, a replay miss failure, or None to call."""
+        if cache_key is not None and self._cache_policy in _CACHE_READ_POLICIES:
+            cached = await self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+        if self._cache_policy == "replay":
+            return AgentFailure(
+                agent_id="llm_service",
+                error_code=ErrorCodes.TIMEOUT,
+                message="No cached LLM response to replay",
+                recoverable=False,
+                details={"provider": self._provider, "cache_policy": "replay"},
+            )
+        return None
+
     async def stream_generate(
         self,
         prompt: str,
@@ -212,33 +349,27 @@ class LLMService:
             async for chunk in llm_service.stream_generate(prompt="Hi"):
                 print(chunk, end="", flush=True)
         """
-        temp = (
-            temperature if temperature is not None else self._settings.llm_temperature
-        )
-        tokens = max_tokens if max_tokens is not None else self._settings.llm_max_tokens
+        temp = temperature if temperature is not None else self._default_temperature
+        tokens = max_tokens if max_tokens is not None else self._default_max_tokens
 
-        if self._provider == "openai":
-            async for chunk in self._stream_openai(prompt, system, temp, tokens):
-                yield chunk
-        else:
-            async for chunk in self._stream_anthropic(prompt, system, temp, tokens):
-                yield chunk
+        async for chunk in self._stream_impl(prompt, system, temp, tokens):
+            yield chunk
 
     async def count_tokens(self, text: str) -> int:
-        """Estimate token count for text (approximate).
+        """Count tokens in text with the model's tokenizer.
 
-        Uses simple heuristic: ~4 characters per token.
-        For production, consider using tiktoken (OpenAI) or similar.
+        Uses tiktoken when it is installed; the BPE tables load once per
+        process. Falls back to ~4 characters per token otherwise, or when
+        the tokenizer cannot be loaded. Loading the tables may download them
+        and encoding is CPU-bound, so both run in a worker thread.
 
         Args:
             text: Text to count tokens for
 
         Returns:
-            Estimated token count
+            Token count (at least 1)
         """
-        # Simple approximation: 1 token ≈ 4 characters
-        # More accurate would be tiktoken for OpenAI or specific tokenizer
-        return max(1, len(text) // 4)
+        return await asyncio.to_thread(_count_tokens, self._model, text)
 
     async def _generate_openai(
         self,
@@ -262,7 +393,7 @@ class LLMService:
                 "model": self._model,
                 "temperature": temperature,
                 "max_tokens": max_tokens,
-                "input_tokens_est": await self.count_tokens(prompt),
+                "input_tokens_est": _estimate_tokens(prompt),
             },
         )
 
@@ -277,11 +408,15 @@ class LLMService:
 
         # Log token usage
         if response.usage:
+            details = response.usage.prompt_tokens_details
+            cached_tokens = (details.cached_tokens or 0) if details else 0
+            self._record_usage(response.usage.prompt_tokens, cached_tokens)
             logger.info(
                 "OpenAI token usage",
                 extra={
                     "agent_id": "llm_service",
                     "input_tokens": response.usage.prompt_tokens,
+                    "cached_tokens": cached_tokens,
                     "output_tokens": response.usage.completion_tokens,
                     "total_tokens": response.usage.total_tokens,
                 },
@@ -306,7 +441,7 @@ class LLMService:
                 "model": self._model,
                 "temperature": temperature,
                 "max_tokens": max_tokens,
-                "input_tokens_est": await self.count_tokens(prompt),
+                "input_tokens_est": _estimate_tokens(prompt),
             },
         )
 
@@ -322,18 +457,27 @@ class LLMService:
         response = await client.messages.create(**kwargs)
 
         # Extract text from response
-        content = ""
-        for block in response.content:
-            if block.type == "text":
-                content += block.text
+        content = "".join(
+            block.text for block in response.content if block.type == "text"
+        )
 
-        # Log token usage
+        # Log token usage; Anthropic reports cache reads and writes apart
+        # from the uncached input tokens.
+        usage = response.usage
+        cached_tokens = usage.cache_read_input_tokens or 0
+        self._record_usage(
+            usage.input_tokens
+            + cached_tokens
+            + (usage.cache_creation_input_tokens or 0),
+            cached_tokens,
+        )
         logger.info(
             "Anthropic token usage",
             extra={
                 "agent_id": "llm_service",
-                "input_tokens": response.usage.input_tokens,
-                "output_tokens": response.usage.output_tokens,
+                "input_tokens": usage.input_tokens,
+                "cached_tokens": cached_tokens,
+                "output_tokens": usage.output_tokens,
             },
         )
 
@@ -395,15 +539,17 @@ class LLMService:
         func: Callable[[], Awaitable[T]],
         initial_delay: float = 1.0,
         max_delay: float = 16.0,
-        backoff_factor: float = 2.0,
     ) -> T:
-        """Retry function with exponential backoff on rate limits.
+        """Retry function with jittered exponential backoff on rate limits.
+
+        Delays are drawn with full jitter so concurrent requests throttled
+        together do not retry in lockstep, and a ``Retry-After`` header from
+        the provider takes precedence when present.
 
         Args:
             func: Async function to retry
-            initial_delay: Initial delay in seconds (default: 1.0)
+            initial_delay: Delay ceiling for the first retry (default: 1.0)
             max_delay: Maximum delay in seconds (default: 16.0)
-            backoff_factor: Multiplier for delay after each retry (default: 2.0)
 
         Returns:
             Result of successful function call
@@ -412,8 +558,6 @@ class LLMService:
             httpx.HTTPStatusError: If max retries exceeded or non-retryable error
             httpx.TimeoutException: If request times out
         """
-        delay = initial_delay
-
         for attempt in range(self._max_retries):
             try:
                 return await func()
@@ -425,6 +569,12 @@ class LLMService:
                 is_last_attempt = attempt >= self._max_retries - 1
 
                 if (is_rate_limit or is_server_error) and not is_last_attempt:
+                    delay = backoff_delay(
+                        attempt,
+                        initial_seconds=initial_delay,
+                        max_seconds=max_delay,
+                        retry_after=exc.response.headers.get("retry-after"),
+                    )
                     logger.warning(
                         "LLM request failed, retrying",
                         extra={
@@ -432,11 +582,10 @@ class LLMService:
                             "provider": self._provider,
                             "status_code": status,
                             "retry_count": attempt + 1,
-                            "delay_seconds": min(delay, max_delay),
+                            "delay_seconds": delay,
                         },
                     )
-                    await asyncio.sleep(min(delay, max_delay))
-                    delay *= backoff_factor
+                    await asyncio.sleep(delay)
                 else:
                     # Non-retryable error or last attempt
                     raise
@@ -500,4 +649,51 @@ class LLMService:
         )
 
 
-__all__ = ["LLMService"]
+def _estimate_tokens(text: str) -> int:
+    """Return a cheap ~4 characters per token estimate for log fields."""
+    return max(1, len(text) // 4)
+
+
+def _count_tokens(model: str, text: str) -> int:
+    """Count ``text`` tokens with ``model``'s tokenizer, or estimate them."""
+    encoder = _get_encoder(model)
+    if encoder is None:
+        return _estimate_tokens(text)
+    return max(1, len(encoder.encode(text, disallowed_special=())))
+
+
+@cache
+def _get_encoder(model: str) -> Any:
+    """Return the tiktoken encoding for ``model``, or None when unavailable.
+
+    Models tiktoken does not know (e.g. Anthropic's) use ``cl100k_base`` as
+    the closest public vocabulary.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # The vocabulary is downloaded on first use; offline hosts estimate.
+        logger.warning("Tokenizer unavailable, estimating token counts")
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_llm_service() -> LLMService:
+    """Return the process-wide LLM service and its pooled HTTP client."""
+
+    return LLMService()
+
+
+async def close_llm_service() -> None:
+    """Release the shared service's connections if it was ever created."""
+
+    if get_llm_service.cache_info().currsize:
+        await get_llm_service().aclose()
+
+
+__all__ = ["LLMService", "close_llm_service", "get_llm_service"]
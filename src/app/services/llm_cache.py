@@ -0,0 +1,55 @@
+"""In-process response cache for deterministic LLM calls."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import ClassVar
+
+
+class LLMCache:
+    """Bounded LRU cache of generated text keyed by the full request.
+
+    The methods are async so a shared backend (e.g. Redis) can replace the
+    in-memory store without changing callers.
+    """
+
+    MAX_ENTRIES: ClassVar[int] = 1024
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    @staticmethod
+    def key(
+        *,
+        provider: str,
+        model: str,
+        prompt: str,
+        system: str | None,
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        """Return the SHA-256 key identifying one generation request."""
+        payload = json.dumps(
+            [provider, model, system, prompt, temperature, max_tokens],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> str | None:
+        """Return the cached response for ``key``, marking it recently used."""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """Store ``value``, evicting the least recently used entry when full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.MAX_ENTRIES:
+            self._entries.popitem(last=False)
+
+
+__all__ = ["LLMCache"]
@@ -4,6 +4,10 @@ Handles retrieval from vector store and answer generation via LLM.
 Reference: Phase 2-2 RAG Engine Implementation
 """
 
+import asyncio
+import heapq
+import inspect
+from collections.abc import AsyncGenerator, Callable
 from typing import Any, Protocol
 
 from brain.schemas import (
@@ -23,15 +27,30 @@ class VectorStoreProtocol(Protocol):
 
     async def search(
         self, query: str, top_k: int = 5, filters: dict[str, Any] | None = None
-    ) -> list[dict[str, Any]]:
-        ...
+    ) -> list[dict[str, Any]]: ...
+
+
+class BatchVectorStoreProtocol(VectorStoreProtocol, Protocol):
+    """Vector store that can also answer several queries in one call.
+
+    search_batch() takes the query texts and returns one list of result
+    dicts per query, in query order, each shaped like search() results.
+    """
+
+    async def search_batch(
+        self,
+        queries: list[str],
+        top_k: int = 5,
+        filters: dict[str, Any] | None = None,
+    ) -> list[list[dict[str, Any]]]: ...
 
 
 class LLMClientProtocol(Protocol):
     """Protocol for LLM client implementations."""
 
-    async def complete(self, prompt: str) -> str:
-        ...
+    async def complete(self, prompt: str) -> str: ...
+
+    def stream_complete(self, prompt: str) -> AsyncGenerator[str, None]: ...
 
 
 # Approximate tokens per character (conservative estimate)
@@ -43,8 +62,10 @@ class RAGEngine:
 
     Provides:
     - retrieve(): Get relevant context from vector store
+    - retrieve_batch(): Get context for several queries in one store round
     - generate_answer(): Generate answer from context using LLM
     - query(): Unified retrieve + generate pipeline
+    - query_stream(): Unified pipeline yielding answer text as it arrives
     """
 
     def __init__(
@@ -52,17 +73,33 @@ class RAGEngine:
         vector_store: Any,
         llm_client: Any,
         default_config: QueryConfig | None = None,
+        token_counter: Callable[[str], int] | None = None,
     ) -> None:
         """Initialize the RAG Engine.
 
         Args:
             vector_store: Vector store with async search(query, top_k, filters)
-            llm_client: LLM client with async complete(prompt)
+                (VectorStoreProtocol), and optionally search_batch(queries,
+                top_k, filters) (BatchVectorStoreProtocol)
+            llm_client: LLM client with async complete(prompt), and optionally
+                stream_complete(prompt) yielding text chunks
             default_config: Default configuration for queries
+            token_counter: Exact token count for a text (e.g. the length
+                of a tiktoken encoding). Without it the context budget uses
+                the CHARS_PER_TOKEN estimate.
         """
         self.vector_store = vector_store
         self.llm_client = llm_client
         self.default_config = default_config or QueryConfig()
+        self._token_counter = token_counter
+        # Stores may implement the simple search(query) signature; find out
+        # once which optional keywords search() takes.
+        self._search_keywords = _search_keywords(vector_store, "search")
+        self._search_batch_keywords = (
+            _search_keywords(vector_store, "search_batch")
+            if hasattr(vector_store, "search_batch")
+            else None
+        )
 
     async def retrieve(
         self,
@@ -83,63 +120,116 @@ class RAGEngine:
             List of ContextNode objects or RAGFailure on error
         """
         if not query or not query.strip():
-            return RAGFailure(
-                error_code=RAGErrorCodes.INVALID_QUERY,
-                message="Query cannot be empty",
-                recoverable=False,
-            )
+            return _invalid_query_failure()
 
-        # Use provided values or fall back to config defaults
-        config_top_k = self.default_config.retrieve.top_k
-        effective_top_k = top_k if top_k is not None else config_top_k
-        config_min_score = self.default_config.retrieve.min_score
-        effective_min_score = min_score if min_score is not None else config_min_score
-        effective_filters = filters or self.default_config.retrieve.filters
+        effective_min_score, search_kwargs = self._search_arguments(
+            top_k, min_score, filters, self._search_keywords
+        )
 
         try:
-            # Call vector store - handle both simple and complex signatures
-            if effective_filters is not None:
-                try:
-                    results = await self.vector_store.search(
-                        query, top_k=effective_top_k, filters=effective_filters
-                    )
-                except TypeError:
-                    # Fallback for simple search(query) signature
-                    results = await self.vector_store.search(query)
-            else:
-                try:
-                    results = await self.vector_store.search(
-                        query, top_k=effective_top_k
-                    )
-                except TypeError:
-                    # Fallback for simple search(query) signature
-                    results = await self.vector_store.search(query)
-
+            results = await self.vector_store.search(query, **search_kwargs)
         except Exception as e:
-            return RAGFailure(
-                error_code=RAGErrorCodes.RETRIEVAL_FAILED,
-                message=f"Vector store search failed: {e!s}",
-                recoverable=True,
-                details={"query": query, "error": str(e)},
-            )
+            return _retrieval_failure(query, e)
 
-        # Convert results to ContextNode objects
-        nodes = []
-        for res in results:
-            metadata = res.get("metadata", {})
-            node = ContextNode(
-                id=res.get("id", ""),
-                text=res.get("content", ""),
-                score=res.get("score", 0.0),
-                source_id=metadata.get("source", res.get("id", "")),
-                source_url=metadata.get("url"),
-                metadata=metadata,
+        return _nodes_or_failure(query, results, effective_min_score)
+
+    async def retrieve_batch(
+        self,
+        queries: list[str],
+        top_k: int | None = None,
+        min_score: float | None = None,
+        filters: dict[str, Any] | None = None,
+    ) -> list[list[ContextNode] | RAGFailure]:
+        """Retrieve context for several queries at once.
+
+        Stores with search_batch() (see BatchVectorStoreProtocol) answer
+        every query in one call; other stores are searched concurrently.
+        Store results not shaped as the protocol describes become
+        RETRIEVAL_FAILED failures.
+
+        Args:
+            queries: The search queries
+            top_k: Maximum number of results per query (default: from config)
+            min_score: Minimum relevance score threshold (default: from config)
+            filters: Optional metadata filters applied to every query
+
+        Returns:
+            One list of ContextNode objects or RAGFailure per query, in order
+        """
+        outcomes: list[list[ContextNode] | RAGFailure | None] = [
+            None if query and query.strip() else _invalid_query_failure()
+            for query in queries
+        ]
+        valid = [
+            query
+            for query, outcome in zip(queries, outcomes, strict=True)
+            if outcome is None
+        ]
+        if not valid:
+            return [outcome for outcome in outcomes if outcome is not None]
+
+        results: list[Any]
+        if self._search_batch_keywords is not None:
+            effective_min_score, search_kwargs = self._search_arguments(
+                top_k, min_score, filters, self._search_batch_keywords
+            )
+            try:
+                results = list(
+                    await self.vector_store.search_batch(valid, **search_kwargs)
+                )
+            except Exception as e:
+                results = [e] * len(valid)
+            if len(results) != len(valid):
+                mismatch = TypeError(
+                    f"search_batch returned {len(results)} result lists "
+                    f"for {len(valid)} queries"
+                )
+                results = [mismatch] * len(valid)
+        else:
+            effective_min_score, search_kwargs = self._search_arguments(
+                top_k, min_score, filters, self._search_keywords
+            )
+            results = await asyncio.gather(
+                *(self.vector_store.search(query, **search_kwargs) for query in valid),
+                return_exceptions=True,
             )
-            # Apply minimum score filter
-            if node.score >= effective_min_score:
-                nodes.append(node)
 
-        return nodes
+        answered = iter(zip(valid, results, strict=True))
+        retrieved: list[list[ContextNode] | RAGFailure] = []
+        for outcome in outcomes:
+            if outcome is not None:
+                retrieved.append(outcome)
+                continue
+            query, result = next(answered)
+            if isinstance(result, BaseException):
+                retrieved.append(_retrieval_failure(query, result))
+            else:
+                retrieved.append(_nodes_or_failure(query, result, effective_min_score))
+        return retrieved
+
+    def _search_arguments(
+        self,
+        top_k: int | None,
+        min_score: float | None,
+        filters: dict[str, Any] | None,
+        accepted: frozenset[str],
+    ) -> tuple[float, dict[str, Any]]:
+        """Resolve config defaults into a min_score and search keywords.
+
+        Only the keywords in ``accepted`` are passed to the store.
+        """
+        # Use provided values or fall back to config defaults
+        config = self.default_config.retrieve
+        effective_top_k = top_k if top_k is not None else config.top_k
+        effective_min_score = min_score if min_score is not None else config.min_score
+        effective_filters = filters or config.filters
+
+        search_kwargs: dict[str, Any] = {}
+        if "top_k" in accepted:
+            search_kwargs["top_k"] = effective_top_k
+        if effective_filters is not None and "filters" in accepted:
+            search_kwargs["filters"] = effective_filters
+        return effective_min_score, search_kwargs
 
     async def generate_answer(
         self,
@@ -219,12 +309,7 @@ class RAGEngine:
         effective_config = config or self.default_config
 
         # Step 1: Retrieve relevant context
-        retrieve_result = await self.retrieve(
-            query,
-            top_k=effective_config.retrieve.top_k,
-            min_score=effective_config.retrieve.min_score,
-            filters=effective_config.retrieve.filters,
-        )
+        retrieve_result = await self._retrieve_for_query(query, effective_config)
 
         if isinstance(retrieve_result, RAGFailure):
             return retrieve_result
@@ -232,19 +317,6 @@ class RAGEngine:
         context_nodes = retrieve_result
         retrieval_count = len(context_nodes)
 
-        # Check if we have any relevant context
-        if not context_nodes:
-            min_score = effective_config.retrieve.min_score
-            return RAGFailure(
-                error_code=RAGErrorCodes.NO_RELEVANT_CONTEXT,
-                message=f"No context found above min_score={min_score}",
-                recoverable=True,
-                details={
-                    "query": query,
-                    "top_k": effective_config.retrieve.top_k,
-                },
-            )
-
         # Step 2: Generate answer
         answer_result = await self.generate_answer(
             query, context_nodes, effective_config.generate
@@ -263,26 +335,118 @@ class RAGEngine:
             },
         )
 
+    async def query_stream(
+        self,
+        query: str,
+        config: QueryConfig | None = None,
+    ) -> AsyncGenerator[str | RAGFailure, None]:
+        """Execute a full RAG query, yielding answer text as the LLM produces it.
+
+        Uses the client's stream_complete() when available so the first
+        tokens reach the caller without waiting for the whole completion;
+        clients without it yield their complete() result as one chunk.
+
+        Args:
+            query: The user's question
+            config: Optional query configuration
+
+        Yields:
+            Answer text chunks, or a single RAGFailure on error
+        """
+        effective_config = config or self.default_config
+
+        retrieve_result = await self._retrieve_for_query(query, effective_config)
+        if isinstance(retrieve_result, RAGFailure):
+            yield retrieve_result
+            return
+
+        generate_config = effective_config.generate
+        truncated_context = self._truncate_context(
+            retrieve_result, generate_config.max_context_tokens
+        )
+        prompt = self._build_prompt(
+            query, truncated_context, generate_config.system_prompt
+        )
+
+        stream_complete = getattr(self.llm_client, "stream_complete", None)
+        try:
+            if stream_complete is None:
+                yield await self.llm_client.complete(prompt)
+                return
+            async for chunk in stream_complete(prompt):
+                yield chunk
+        except Exception as e:
+            yield RAGFailure(
+                error_code=RAGErrorCodes.LLM_FAILED,
+                message=f"LLM completion failed: {e!s}",
+                recoverable=True,
+                details={"query": query, "error": str(e)},
+            )
+
+    async def _retrieve_for_query(
+        self, query: str, config: QueryConfig
+    ) -> list[ContextNode] | RAGFailure:
+        """Retrieve context for a query, failing when nothing is relevant."""
+        retrieve_result = await self.retrieve(
+            query,
+            top_k=config.retrieve.top_k,
+            min_score=config.retrieve.min_score,
+            filters=config.retrieve.filters,
+        )
+
+        if isinstance(retrieve_result, RAGFailure):
+            return retrieve_result
+
+        # Check if we have any relevant context
+        if not retrieve_result:
+            min_score = config.retrieve.min_score
+            return RAGFailure(
+                error_code=RAGErrorCodes.NO_RELEVANT_CONTEXT,
+                message=f"No context found above min_score={min_score}",
+                recoverable=True,
+                details={
+                    "query": query,
+                    "top_k": config.retrieve.top_k,
+                },
+            )
+
+        return retrieve_result
+
     def _truncate_context(
         self, context: list[ContextNode], max_tokens: int
     ) -> list[ContextNode]:
         """Truncate context to fit within token limit.
 
-        Uses a conservative character-to-token estimate.
-        Prioritizes higher-scored context nodes.
+        Counts tokens with the configured token_counter, or a conservative
+        character-to-token estimate without one. Prioritizes higher-scored
+        context nodes, and skips nodes whose text repeats a higher-scored one
+        so duplicates do not spend the budget.
         """
-        # Sort by score descending to keep best context
-        sorted_context = sorted(context, key=lambda x: x.score, reverse=True)
-
-        max_chars = max_tokens * CHARS_PER_TOKEN
-        current_chars = 0
+        # Pop nodes best-first from a heap instead of sorting everything: the
+        # budget usually runs out after a few nodes, so this is O(n + k log n).
+        # The index breaks score ties in input order, as a stable sort would.
+        heap = [(-node.score, index) for index, node in enumerate(context)]
+        heapq.heapify(heap)
+
+        if self._token_counter is None:
+            measure: Callable[[str], int] = len
+            budget = max_tokens * CHARS_PER_TOKEN
+        else:
+            measure = self._token_counter
+            budget = max_tokens
+        used = 0
         truncated: list[ContextNode] = []
-
-        for node in sorted_context:
-            node_chars = len(node.text)
-            if current_chars + node_chars <= max_chars:
+        seen_texts: set[str] = set()
+
+        while heap:
+            node = context[heapq.heappop(heap)[1]]
+            if node.text in seen_texts:
+                continue
+            seen_texts.add(node.text)
+            cost = measure(node.text)
+            if used + cost <= budget:
                 truncated.append(node)
-                current_chars += node_chars
+                used += cost
             else:
                 # Stop adding more context
                 break
@@ -295,38 +459,49 @@ class RAGEngine:
         context: list[ContextNode],
         system_prompt: str | None = None,
     ) -> str:
-        """Build the prompt for the LLM."""
-        parts = []
+        """Build the prompt for the LLM.
 
-        if system_prompt:
-            parts.append(system_prompt)
-            parts.append("")
+        The request-independent prefix comes first and everything that varies
+        per query follows it, so providers with automatic prefix caching
+        (e.g. OpenAI) can reuse the cached prefix across requests.
+        """
+        return self._stable_prefix(system_prompt) + self._variable_suffix(
+            query, context
+        )
 
-        if context:
-            context_str = "\n".join([f"- {node.text}" for node in context])
-            parts.append(f"Context:\n{context_str}")
-            parts.append("")
+    def _stable_prefix(self, system_prompt: str | None) -> str:
+        """Return the prompt prefix shared by every request with this config."""
+        if not system_prompt:
+            return ""
+        return f"{system_prompt}\n\n"
 
-        parts.append(f"Query: {query}")
+    def _variable_suffix(self, query: str, context: list[ContextNode]) -> str:
+        """Return the per-request part of the prompt: context, then query."""
+        if not context:
+            return f"Query: {query}"
 
-        return "\n".join(parts)
+        # One join for the bullets and one f-string for the frame; join()
+        # materializes its input anyway, so the list comprehension is cheapest.
+        context_str = "\n".join([f"- {node.text}" for node in context])
+        return f"Context:\n{context_str}\n\nQuery: {query}"
 
     def _build_citations(self, context: list[ContextNode]) -> list[Citation]:
-        """Build citations from context nodes."""
-        citations = []
-        for node in context:
-            # Prefer url > source_id > node.id for source_id
-            source_id = node.source_url or node.source_id or node.id
-            # Build text snippet (truncated for readability)
-            snippet = node.text[:100] + "..." if len(node.text) > 100 else node.text
-            citation = Citation(
-                source_id=source_id,
+        """Build citations from context nodes.
+
+        source_id prefers url > source_id > node.id, and snippets are
+        truncated to 100 characters for readability.
+        """
+        return [
+            Citation(
+                source_id=node.source_url or node.source_id or node.id,
                 chunk_id=node.id,
-                text_snippet=snippet,
+                text_snippet=(
+                    node.text[:100] + "..." if len(node.text) > 100 else node.text
+                ),
                 url=node.source_url,
             )
-            citations.append(citation)
-        return citations
+            for node in context
+        ]
 
     def _calculate_confidence(self, context: list[ContextNode]) -> float:
         """Calculate confidence score based on context quality.
@@ -338,3 +513,81 @@ class RAGEngine:
             return 0.5
         avg_score = sum(node.score for node in context) / len(context)
         return min(1.0, max(0.0, avg_score))
+
+
+def _invalid_query_failure() -> RAGFailure:
+    """Return the failure reported for an empty or blank query."""
+    return RAGFailure(
+        error_code=RAGErrorCodes.INVALID_QUERY,
+        message="Query cannot be empty",
+        recoverable=False,
+    )
+
+
+def _retrieval_failure(query: str, error: BaseException) -> RAGFailure:
+    """Return the failure reported when the vector store search raises."""
+    return RAGFailure(
+        error_code=RAGErrorCodes.RETRIEVAL_FAILED,
+        message=f"Vector store search failed: {error!s}",
+        recoverable=True,
+        details={"query": query, "error": str(error)},
+    )
+
+
+def _nodes_or_failure(
+    query: str, results: Any, min_score: float
+) -> list[ContextNode] | RAGFailure:
+    """Convert one query's store results, or report them as malformed."""
+    try:
+        return _to_context_nodes(results, min_score)
+    except (TypeError, ValueError) as e:
+        return _retrieval_failure(query, e)
+
+
+def _to_context_nodes(
+    results: list[dict[str, Any]], min_score: float
+) -> list[ContextNode]:
+    """Convert store hits scoring at least ``min_score`` into ContextNodes.
+
+    The score check runs first so rejected hits never pay for validation.
+    Raises TypeError when ``results`` is not a list of dicts.
+    """
+    if not isinstance(results, list):
+        raise TypeError(
+            f"expected a list of result dicts, got {type(results).__name__}"
+        )
+    nodes = []
+    for res in results:
+        if not isinstance(res, dict):
+            raise TypeError(f"expected a result dict, got {type(res).__name__}")
+        score = res.get("score", 0.0)
+        if score < min_score:
+            continue
+        metadata = res.get("metadata", {})
+        nodes.append(
+            ContextNode(
+                id=res.get("id", ""),
+                text=res.get("content", ""),
+                score=score,
+                source_id=metadata.get("source", res.get("id", "")),
+                source_url=metadata.get("url"),
+                metadata=metadata,
+            )
+        )
+    return nodes
+
+
+def _search_keywords(vector_store: Any, method: str) -> frozenset[str]:
+    """Return which of top_k/filters the store's ``method`` accepts.
+
+    Callables that cannot be introspected, or take ``**kwargs``, are assumed
+    to accept both.
+    """
+    optional = frozenset({"top_k", "filters"})
+    try:
+        parameters = inspect.signature(getattr(vector_store, method)).parameters
+    except (AttributeError, TypeError, ValueError):
+        return optional
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values()):
+        return optional
+    return optional & parameters.keys()
@@ -4,7 +4,8 @@ Reference: Phase 2-2 RAG Engine Implementation
 Aligned with: docs/02_AGENT_SPECS.md (Memory Agent, Tailor Agent schemas)
 """
 
-from datetime import datetime
+from datetime import UTC, datetime
+from functools import partial
 from typing import Any, Literal
 
 from pydantic import BaseModel, Field
@@ -32,7 +33,7 @@ class RAGFailure(BaseModel):
     message: str
     recoverable: bool = False
     details: dict[str, Any] | None = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=partial(datetime.now, UTC))
 
 
 class ContextNode(BaseModel):
@@ -44,6 +44,13 @@ try:  # Optional PDF fallback
 except Exception:  # pragma: no cover - fallback paths handle missing deps
     pdfplumber = None
 
+docx: Any | None
+
+try:  # Optional DOCX fallback
+    import docx
+except Exception:  # pragma: no cover - fallback paths handle missing deps
+    docx = None
+
 
 ChunkType = Literal["text", "table"]
 LayoutType = Literal["text", "table", "image", "header", "list"]
@@ -57,17 +64,19 @@ class ChunkData(TypedDict):
 class DolphinParser(BaseParser):
     """Multi-format document parser with layout preservation."""
 
-    SUPPORTED_EXTENSIONS: ClassVar[set[str]] = {
-        ".txt",
-        ".md",
-        ".markdown",
-        ".pdf",
-        ".docx",
-        ".pptx",
-        ".xlsx",
-        ".xls",
-        ".csv",
-    }
+    SUPPORTED_EXTENSIONS: ClassVar[frozenset[str]] = frozenset(
+        {
+            ".txt",
+            ".md",
+            ".markdown",
+            ".pdf",
+            ".docx",
+            ".pptx",
+            ".xlsx",
+            ".xls",
+            ".csv",
+        }
+    )
 
     def __init__(
         self,
@@ -365,15 +374,14 @@ class DolphinParser(BaseParser):
                     ErrorCodes.PARSER_INVALID_INPUT, f"Failed to parse DOCX: {exc}"
                 )
 
-        try:
-            from docx import Document
-        except Exception as exc:  # pragma: no cover - dependency missing
+        if docx is None:  # pragma: no cover - dependency missing
             return self._failure(
-                ErrorCodes.PARSER_INVALID_INPUT, f"DOCX parsing unavailable: {exc}"
+                ErrorCodes.PARSER_INVALID_INPUT,
+                "DOCX parsing unavailable: python-docx is not installed",
             )
 
         try:
-            doc = Document(io.BytesIO(content))
+            doc = docx.Document(io.BytesIO(content))
         except Exception as exc:
             return self._failure(
                 ErrorCodes.PARSER_CORRUPTED_FILE, f"Failed to parse DOCX: {exc}"
@@ -6,16 +6,32 @@ Test Tool: TestClient (FastAPI)
 
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import logging
+from types import SimpleNamespace
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
+import lancedb
+import pyarrow as pa
 import pytest
 from httpx import ASGITransport, AsyncClient
 
-from app.api import _get_ingestion_service, app
+from app.api import (
+    _arrow_sample_response,
+    _get_ingestion_service,
+    _get_memory_agent,
+    _IngestJob,
+    _IngestQueue,
+    app,
+    settings,
+)
 
 
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator
+    from pathlib import Path
 
 
 @pytest.fixture
@@ -140,6 +156,28 @@ class TestBackendAPI:
         assert body["filename"] == "example.txt"
         assert body["task_id"]
 
+    @pytest.mark.integration
+    @pytest.mark.anyio
+    async def test_inline_ingest_invalid_input_error_code(
+        self, async_client: AsyncClient
+    ) -> None:
+        """Inline ingestion reports ValueError with the queued path's code."""
+
+        boundary, body = _build_multipart_body(
+            filename="bad.txt",
+            data=b"Unparseable",
+            content_type="text/plain",
+        )
+        headers = {
+            "Authorization": "Bearer local-dev-token",
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+        }
+        with patch("app.api._run_ingest_job", side_effect=ValueError("bad input")):
+            response = await async_client.post("/ingest", content=body, headers=headers)
+
+        assert response.status_code == 400
+        assert response.json()["detail"]["error_code"] == "ERR_PARSER_INVALID_INPUT"
+
     @pytest.mark.integration
     @pytest.mark.anyio
     async def test_ingest_auth_middleware(self, async_client: AsyncClient) -> None:
@@ -156,3 +194,208 @@ class TestBackendAPI:
         assert response.status_code == 401
         detail = response.json()["detail"]
         assert detail["error_code"] == "ERR_CONNECTOR_AUTH"
+
+    @pytest.mark.integration
+    @pytest.mark.anyio
+    async def test_inspect_database_arrow_stream(
+        self, async_client: AsyncClient, tmp_path: Path
+    ) -> None:
+        """GET /inspect-database?format=arrow streams an Arrow IPC sample."""
+
+        db = lancedb.connect(str(tmp_path))
+        db.create_table(
+            "documents",
+            data=[
+                {"chunk_id": "c1", "content": "alpha", "embedding": [0.1, 0.2]},
+                {"chunk_id": "c2", "content": "beta", "embedding": [0.3, 0.4]},
+            ],
+        )
+        memory_agent = SimpleNamespace(store=SimpleNamespace(db=db))
+        app.dependency_overrides[_get_memory_agent] = lambda: memory_agent
+        try:
+            response = await async_client.get(
+                "/inspect-database", params={"format": "arrow"}
+            )
+        finally:
+            app.dependency_overrides.pop(_get_memory_agent, None)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == (
+            "application/vnd.apache.arrow.stream"
+        )
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.num_rows == 2
+        assert "embedding" not in table.column_names
+
+    @pytest.mark.integration
+    def test_arrow_sample_temp_file_removed_on_write_error(
+        self, tmp_path: Path
+    ) -> None:
+        """A failed IPC write removes its temp file instead of leaking it."""
+
+        sample = pa.table({"chunk_id": ["c1"], "content": ["alpha"]})
+        table = SimpleNamespace(
+            search=lambda: SimpleNamespace(
+                limit=lambda _n: SimpleNamespace(to_arrow=lambda: sample)
+            )
+        )
+
+        with (
+            patch("app.api.tempfile.tempdir", str(tmp_path)),
+            patch("app.api.pa.ipc.new_stream", side_effect=OSError("disk full")),
+            pytest.raises(OSError, match="disk full"),
+        ):
+            _arrow_sample_response(table)
+
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.integration
+    @pytest.mark.anyio
+    async def test_ingest_queued_to_worker_pool(
+        self, async_client: AsyncClient
+    ) -> None:
+        """With the lifespan running, uploads are queued and indexed by workers."""
+
+        memory = _get_memory_agent()
+        before = await memory.count_documents()
+        boundary, body = _build_multipart_body(
+            filename="queued.txt",
+            data=b"Queued ingestion text",
+            content_type="text/plain",
+        )
+        headers = {
+            "Authorization": "Bearer local-dev-token",
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+        }
+
+        async with app.router.lifespan_context(app):
+            response = await async_client.post("/ingest", content=body, headers=headers)
+            await app.state.ingest_queue.join()
+
+        assert response.status_code == 202
+        assert response.json()["status"] == "queued"
+        assert await memory.count_documents() == before + 1
+
+    @pytest.mark.integration
+    @pytest.mark.anyio
+    async def test_ingest_queue_bounded_by_bytes(self) -> None:
+        """The queue refuses uploads once held bytes would exceed the budget."""
+
+        def job(task_id: str, size: int) -> _IngestJob:
+            return _IngestJob(task_id, "f.txt", b"x" * size, "text/plain")
+
+        queue = _IngestQueue(maxsize=10, max_bytes=100)
+        oversized = job("big", 150)
+        queue.put_nowait(oversized)
+        with pytest.raises(asyncio.QueueFull):
+            queue.put_nowait(job("small", 1))
+
+        queue.job_done(await queue.get())
+        queue.put_nowait(job("a", 60))
+        with pytest.raises(asyncio.QueueFull):
+            queue.put_nowait(job("b", 60))
+        queue.put_nowait(job("c", 40))
+        assert queue.pending_task_ids() == ["a", "c"]
+
+    @pytest.mark.integration
+    @pytest.mark.anyio
+    async def test_shutdown_logs_undrained_ingest_tasks(
+        self, async_client: AsyncClient, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Accepted uploads still pending after the drain timeout are logged."""
+
+        async def stuck_batch(*_args: object) -> None:
+            await asyncio.Event().wait()
+
+        boundary, body = _build_multipart_body(
+            filename="stuck.txt",
+            data=b"Never finishes",
+            content_type="text/plain",
+        )
+        headers = {
+            "Authorization": "Bearer local-dev-token",
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+        }
+        quick_drain = dataclasses.replace(settings, ingest_drain_timeout_seconds=0.05)
+
+        with (
+            patch("app.api.settings", new=quick_drain),
+            patch("app.api._run_ingest_batch", new=stuck_batch),
+            caplog.at_level(logging.WARNING, logger="app.api"),
+        ):
+            async with app.router.lifespan_context(app):
+                response = await async_client.post(
+                    "/ingest", content=body, headers=headers
+                )
+
+        task_id = response.json()["task_id"]
+        assert response.status_code == 202
+        assert any(
+            "not drained" in record.getMessage() and task_id in record.getMessage()
+            for record in caplog.records
+        )
+
+    @pytest.mark.integration
+    @pytest.mark.anyio
+    async def test_ingest_worker_survives_service_factory_failure(
+        self, async_client: AsyncClient, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """A failing service factory is logged per batch; workers keep running."""
+
+        boundary, body = _build_multipart_body(
+            filename="doomed.txt",
+            data=b"Never indexed",
+            content_type="text/plain",
+        )
+        headers = {
+            "Authorization": "Bearer local-dev-token",
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+        }
+        single_worker = dataclasses.replace(settings, ingest_concurrency=1)
+
+        with (
+            patch("app.api.settings", new=single_worker),
+            patch(
+                "app.api._get_ingestion_service",
+                side_effect=RuntimeError("vector store unavailable"),
+            ),
+            caplog.at_level(logging.ERROR, logger="app.api"),
+        ):
+            async with app.router.lifespan_context(app):
+                task_ids = []
+                for _ in range(2):
+                    response = await async_client.post(
+                        "/ingest", content=body, headers=headers
+                    )
+                    assert response.status_code == 202
+                    task_ids.append(response.json()["task_id"])
+                    await asyncio.wait_for(app.state.ingest_queue.join(), 5)
+
+        crashed = " ".join(
+            record.getMessage()
+            for record in caplog.records
+            if "crashed" in record.getMessage()
+        )
+        assert all(task_id in crashed for task_id in task_ids)
+
+    @pytest.mark.integration
+    @pytest.mark.anyio
+    async def test_ingest_rejects_oversized_content_length(
+        self, async_client: AsyncClient
+    ) -> None:
+        """Uploads declaring a body above the limit get 413 before parsing."""
+
+        boundary, body = _build_multipart_body(
+            filename="huge.txt",
+            data=b"small body",
+            content_type="text/plain",
+        )
+        headers = {
+            "Authorization": "Bearer local-dev-token",
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+            "Content-Length": str(settings.max_upload_bytes + 1),
+        }
+        response = await async_client.post("/ingest", content=body, headers=headers)
+
+        assert response.status_code == 413
+        assert response.json()["detail"]["error_code"] == "ERR_PARSER_INVALID_INPUT"
@@ -38,12 +38,20 @@ def _mock_embeddings_for_tests(request, monkeypatch) -> None:  # noqa: C901
     """Stub embedding generation for tests to avoid model downloads."""
     from app.memory.embeddings import EmbeddingGenerator
     from app.schemas import AgentFailure, ErrorCodes, MemoryOutput, RetrievedContext
+    from app.services.llm import get_llm_service
 
     class _StubLanceDBStore:
-        def __init__(self, db_path: str, embedding_dim: int = 384) -> None:
+        def __init__(
+            self,
+            db_path: str,
+            embedding_dim: int = 384,
+            *,
+            quantized_index: bool = False,
+        ) -> None:
             self._docs: list[dict[str, Any]] = []
             self._db_path = db_path
             self._embedding_dim = embedding_dim
+            self._quantized_index = quantized_index
 
         async def add_documents(
             self,
@@ -53,14 +61,18 @@ def _mock_embeddings_for_tests(request, monkeypatch) -> None:  # noqa: C901
             source_ids: list[str],
             source_urls: list[str | None],
             metadata_list: list[dict[str, Any]],
+            shared_metadata: dict[str, Any] | list[dict[str, Any]] | None = None,
         ) -> None:
-            for chunk_id, content, embedding, src_id, src_url, meta in zip(
+            if not isinstance(shared_metadata, list):
+                shared_metadata = [shared_metadata or {}] * len(chunk_ids)
+            for chunk_id, content, embedding, src_id, src_url, meta, shared in zip(
                 chunk_ids,
                 contents,
                 embeddings,
                 source_ids,
                 source_urls,
                 metadata_list,
+                shared_metadata,
                 strict=True,
             ):
                 self._docs.append(
@@ -70,7 +82,7 @@ def _mock_embeddings_for_tests(request, monkeypatch) -> None:  # noqa: C901
                         "embedding": embedding,
                         "source_id": src_id,
                         "source_url": src_url,
-                        "metadata": meta,
+                        "metadata": {**meta, **shared},
                     }
                 )
 
@@ -119,6 +131,18 @@ def _mock_embeddings_for_tests(request, monkeypatch) -> None:  # noqa: C901
 
             return MemoryOutput(results=results, total_found=len(results))
 
+        async def search_batch(
+            self,
+            query_embeddings: list[list[float]],
+            top_k: int = 5,
+            min_score: float = 0.7,
+            filters: dict[str, Any] | None = None,
+        ) -> list[MemoryOutput | AgentFailure]:
+            return [
+                await self.search(embedding, top_k, min_score, filters)
+                for embedding in query_embeddings
+            ]
+
         async def delete_by_source(self, source_id: str) -> int:
             before = len(self._docs)
             self._docs = [doc for doc in self._docs if doc["source_id"] != source_id]
@@ -127,8 +151,8 @@ def _mock_embeddings_for_tests(request, monkeypatch) -> None:  # noqa: C901
         async def count_documents(self) -> int:
             return len(self._docs)
 
-        def _cosine_similarity(self, left: list[float], right: list[float]) -> float:
-            if not left or not right:
+        def _cosine_similarity(self, left: Any, right: Any) -> float:
+            if len(left) == 0 or len(right) == 0:
                 return 0.0
             dot = sum(a * b for a, b in zip(left, right, strict=False))
             left_norm = sum(a * a for a in left) ** 0.5
@@ -170,6 +194,7 @@ def _mock_embeddings_for_tests(request, monkeypatch) -> None:  # noqa: C901
             property(lambda _: dim),
             raising=False,
         )
+        monkeypatch.setattr(EmbeddingGenerator, "preload", lambda _: None, raising=True)
     monkeypatch.setattr(
         "app.memory.agent.LanceDBStore",
         _StubLanceDBStore,
@@ -222,6 +247,11 @@ def _mock_embeddings_for_tests(request, monkeypatch) -> None:  # noqa: C901
                 )
                 yield response
 
+            async def aclose(self) -> None:
+                return None
+
+        # Drop any shared service cached by an earlier test before stubbing.
+        get_llm_service.cache_clear()
         monkeypatch.setattr(
             "app.services.llm.LLMService",
             _StubLLMService,
@@ -6,11 +6,25 @@ pipeline by testing the complete flow from document upload to retrieval.
 Reference: P4-1.5 - Fix Document Ingestion Integration
 """
 
+import threading
+
 import pytest
 
-from app.ingestion.service import IngestionService
+from app.ingestion.service import IngestionService, IngestItem
 from app.memory.agent import MemoryAgent
 from app.schemas import AgentFailure, MemoryQuery
+from ingestion.base import BaseParser
+
+
+class _ThreadRecordingParser(BaseParser):
+    """BaseParser that remembers which thread ran ``parse``."""
+
+    def __init__(self) -> None:
+        self.threads: list[threading.Thread] = []
+
+    def parse(self, content, metadata):
+        self.threads.append(threading.current_thread())
+        return super().parse(content, metadata)
 
 
 class TestIngestionFlow:
@@ -123,3 +137,53 @@ class TestIngestionFlow:
         assert result.total_found >= 1  # Should find at least one document
         source_ids = {ctx.source_id for ctx in result.results}
         assert "doc_fastapi" in source_ids or "doc_pydantic" in source_ids
+
+    @pytest.mark.integration
+    @pytest.mark.asyncio
+    async def test_ingest_documents_batches_and_isolates_failures(
+        self, tmp_path
+    ) -> None:
+        """Bulk ingestion indexes good documents and reports bad ones in place."""
+        memory = MemoryAgent(db_path=str(tmp_path / "test.lance"))
+        service = IngestionService(memory_agent=memory)
+
+        results = await service.ingest_documents(
+            [
+                IngestItem(
+                    content="Neural networks learn representations.",
+                    filename="neural.txt",
+                    source_id="doc_neural",
+                ),
+                IngestItem(content="", filename="empty.txt", source_id="doc_empty"),
+                IngestItem(
+                    content="Artificial intelligence and machine learning.",
+                    filename="ai.txt",
+                    source_id="doc_ai",
+                ),
+            ]
+        )
+
+        assert not isinstance(results[0], AgentFailure)
+        assert isinstance(results[1], AgentFailure)
+        assert not isinstance(results[2], AgentFailure)
+        assert results[0].processing_time_ms > 0
+        expected = len(results[0].chunks) + len(results[2].chunks)
+        assert await memory.count_documents() == expected
+
+        result = await memory.query(MemoryQuery(query_text="neural networks", top_k=5))
+        assert not isinstance(result, AgentFailure)
+        assert {ctx.source_id for ctx in result.results} <= {"doc_neural", "doc_ai"}
+        assert result.results[0].metadata["filename"] in {"neural.txt", "ai.txt"}
+
+    @pytest.mark.integration
+    @pytest.mark.asyncio
+    async def test_parsing_runs_off_the_event_loop(self, tmp_path) -> None:
+        """The synchronous parser runs in an executor thread."""
+        memory = MemoryAgent(db_path=str(tmp_path / "test.lance"))
+        parser = _ThreadRecordingParser()
+        service = IngestionService(memory_agent=memory, parser=parser)
+
+        await service.ingest_document(content="Some text.", filename="a.txt")
+
+        assert parser.threads
+        assert parser.threads[0] is not threading.current_thread()
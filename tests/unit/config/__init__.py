@@ -0,0 +1 @@
+"""Configuration tests."""
@@ -0,0 +1,94 @@
+"""Settings loading tests."""
+
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+
+import pytest
+
+from app.config import APISettings
+
+
+class TestAPISettings:
+    """Tests for environment-driven APISettings."""
+
+    @pytest.mark.unit
+    def test_defaults_when_env_empty(self) -> None:
+        """No environment variables yields the documented defaults."""
+        settings = APISettings.from_env({})
+
+        assert settings.app_name == "ROMA RAG API"
+        assert settings.ingest_auth_enabled is True
+        assert settings.llm_provider == "openai"
+        assert settings.llm_temperature == 0.7
+        assert settings.gdrive_scopes == [
+            "https://www.googleapis.com/auth/drive.readonly"
+        ]
+
+    @pytest.mark.unit
+    def test_env_values_are_coerced(self) -> None:
+        """String env values are parsed into typed fields."""
+        settings = APISettings.from_env(
+            {
+                "INGEST_AUTH_ENABLED": "false",
+                "STREAM_CHUNK_PAUSE_MS": "25",
+                "LLM_PROVIDER": "anthropic",
+                "LLM_TEMPERATURE": "1.5",
+                "GDRIVE_SCOPES": "scope.a, scope.b",
+                "VECTOR_INDEX_QUANTIZED": "yes",
+                "LLM_CACHE_POLICY": "Replay",
+                "INGEST_QUEUE_MAX_BYTES": "1048576",
+                "INGEST_DRAIN_TIMEOUT_SECONDS": "2.5",
+            }
+        )
+
+        assert settings.ingest_auth_enabled is False
+        assert settings.stream_chunk_pause_ms == 25
+        assert settings.llm_provider == "anthropic"
+        assert settings.llm_temperature == 1.5
+        assert settings.gdrive_scopes == ["scope.a", "scope.b"]
+        assert settings.vector_index_quantized is True
+        assert settings.llm_cache_policy == "replay"
+        assert settings.ingest_queue_max_bytes == 1048576
+        assert settings.ingest_drain_timeout_seconds == 2.5
+
+    @pytest.mark.unit
+    def test_env_names_are_case_insensitive(self) -> None:
+        """Lower- and mixed-case names are read like their upper-case form."""
+        settings = APISettings.from_env(
+            {"openai_api_key": "sk-lower", "Llm_Provider": "anthropic"}
+        )
+
+        assert settings.openai_api_key == "sk-lower"
+        assert settings.llm_provider == "anthropic"
+
+    @pytest.mark.unit
+    def test_process_env_overrides_env_file_in_any_case(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A process variable beats a ``.env`` entry differing only in case."""
+        (tmp_path / ".env").write_text("llm_model=from-file\nAPP_NAME=File App\n")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("LLM_MODEL", "from-env")
+        monkeypatch.delenv("APP_NAME", raising=False)
+
+        settings = APISettings.from_env()
+
+        assert settings.llm_model == "from-env"
+        assert settings.app_name == "File App"
+
+    @pytest.mark.unit
+    def test_invalid_values_rejected(self) -> None:
+        """Provider, temperature and cache policy keep their validation rules."""
+        with pytest.raises(ValueError, match="Unsupported LLM provider"):
+            APISettings.from_env({"LLM_PROVIDER": "cohere"})
+        with pytest.raises(ValueError, match="Temperature"):
+            APISettings.from_env({"LLM_TEMPERATURE": "3.0"})
+        with pytest.raises(ValueError, match="Unsupported LLM cache policy"):
+            APISettings.from_env({"LLM_CACHE_POLICY": "sometimes"})
+
+    @pytest.mark.unit
+    def test_settings_are_immutable(self) -> None:
+        """Settings instances are frozen."""
+        settings = APISettings.from_env({})
+        with pytest.raises(FrozenInstanceError):
+            settings.app_name = "changed"  # type: ignore[misc]
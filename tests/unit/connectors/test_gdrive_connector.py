@@ -2,18 +2,42 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
+from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 from googleapiclient.errors import HttpError
 
-from app.connectors.gdrive import GDriveConnector
+from app.connectors.gdrive import (
+    GDriveConnector,
+    _load_drive_service,
+    _load_service_account_info,
+    _MetadataCache,
+)
 from app.schemas import AgentFailure, ErrorCodes
 
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
 class TestGDriveConnector:
     """Test suite for GDriveConnector class."""
 
+    @pytest.fixture(autouse=True)
+    def _clear_service_cache(self) -> Iterator[None]:
+        """Keep cached Drive services from leaking mocks between tests."""
+        _load_drive_service.cache_clear()
+        with patch(
+            "app.connectors.gdrive._load_service_account_info",
+            return_value={"type": "service_account"},
+        ):
+            yield
+        _load_drive_service.cache_clear()
+
     @pytest.fixture
     def mock_credentials(self) -> Mock:
         """Mock service account credentials."""
@@ -371,3 +395,443 @@ class TestGDriveConnector:
         assert result.recoverable is True
         # Should have retried MAX_RETRIES - 1 times
         assert mock_sleep.call_count == connector.MAX_RETRIES - 1
+
+    @pytest.mark.unit
+    @patch("app.connectors.gdrive.service_account.Credentials")
+    @patch("app.connectors.gdrive.build")
+    async def test_fetch_file_skips_metadata_when_mime_known(
+        self,
+        mock_build: MagicMock,
+        _mock_creds: MagicMock,
+    ) -> None:
+        """Test that a known MIME type avoids the metadata round-trip."""
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        mock_service.files().get.reset_mock()
+
+        mock_downloader = MagicMock()
+        mock_downloader.next_chunk.return_value = (None, True)
+
+        with patch(
+            "app.connectors.gdrive.MediaIoBaseDownload",
+            return_value=mock_downloader,
+        ):
+            connector = GDriveConnector(credentials_path="fake.json")
+            doc = await connector.fetch_file(
+                "doc_123", mime_type="application/vnd.google-apps.document"
+            )
+            pdf = await connector.fetch_file("pdf_123", mime_type="application/pdf")
+
+        assert isinstance(doc, bytes)
+        assert isinstance(pdf, bytes)
+        mock_service.files().get.assert_not_called()
+        mock_service.files().export_media.assert_called_once_with(
+            fileId="doc_123",
+            mimeType="text/markdown",
+        )
+        mock_service.files().get_media.assert_called_once_with(fileId="pdf_123")
+
+    @pytest.mark.unit
+    @patch("app.connectors.gdrive.AuthorizedHttp")
+    @patch("app.connectors.gdrive.service_account.Credentials")
+    @patch("app.connectors.gdrive.build")
+    async def test_fetch_files_batches_metadata(
+        self,
+        mock_build: MagicMock,
+        _mock_creds: MagicMock,
+        _mock_http: MagicMock,
+    ) -> None:
+        """Test that metadata lookups share one batch request."""
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+
+        responses = {
+            "file_1": ({"mimeType": "application/pdf"}, None),
+            "doc_2": ({"mimeType": "application/vnd.google-apps.document"}, None),
+            "missing": (
+                None,
+                HttpError(resp=MagicMock(status=404), content=b"Not found"),
+            ),
+        }
+        batches: list[MagicMock] = []
+
+        def new_batch(callback):  # type: ignore[no-untyped-def]
+            batch = MagicMock()
+            added: list[str] = []
+            batch.add.side_effect = lambda _req, request_id: added.append(request_id)
+            batch.execute.side_effect = lambda **_kwargs: [
+                callback(request_id, *responses[request_id]) for request_id in added
+            ]
+            batches.append(batch)
+            return batch
+
+        mock_service.new_batch_http_request.side_effect = new_batch
+
+        mock_downloader = MagicMock()
+        mock_downloader.next_chunk.return_value = (None, True)
+
+        with patch(
+            "app.connectors.gdrive.MediaIoBaseDownload",
+            return_value=mock_downloader,
+        ):
+            connector = GDriveConnector(credentials_path="fake.json")
+            results = await connector.fetch_files(["file_1", "doc_2", "missing"])
+
+        assert len(batches) == 1
+        assert batches[0].add.call_count == 3
+        assert isinstance(results["file_1"], bytes)
+        assert isinstance(results["doc_2"], bytes)
+        missing = results["missing"]
+        assert isinstance(missing, AgentFailure)
+        assert missing.error_code == ErrorCodes.CONNECTOR_NOT_FOUND
+        mock_service.files().export_media.assert_called_once_with(
+            fileId="doc_2",
+            mimeType="text/markdown",
+        )
+
+    @pytest.mark.unit
+    @patch("app.connectors.gdrive.AuthorizedHttp")
+    @patch("app.connectors.gdrive.service_account.Credentials")
+    @patch("app.connectors.gdrive.build")
+    @patch("app.connectors.gdrive.asyncio.sleep", new_callable=AsyncMock)
+    async def test_fetch_files_retries_download_errors(
+        self,
+        mock_sleep: AsyncMock,
+        mock_build: MagicMock,
+        _mock_creds: MagicMock,
+        _mock_http: MagicMock,
+    ) -> None:
+        """Test that a 503 during a batched download is retried."""
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+
+        def new_batch(callback):  # type: ignore[no-untyped-def]
+            batch = MagicMock()
+            batch.execute.side_effect = lambda **_kwargs: callback(
+                "file_1", {"mimeType": "application/pdf"}, None
+            )
+            return batch
+
+        mock_service.new_batch_http_request.side_effect = new_batch
+
+        mock_downloader = MagicMock()
+        mock_downloader.next_chunk.side_effect = [
+            HttpError(resp=MagicMock(status=503), content=b"Unavailable"),
+            (None, True),
+        ]
+
+        with patch(
+            "app.connectors.gdrive.MediaIoBaseDownload",
+            return_value=mock_downloader,
+        ):
+            connector = GDriveConnector(credentials_path="fake.json")
+            results = await connector.fetch_files(["file_1"])
+
+        assert isinstance(results["file_1"], bytes)
+        assert mock_downloader.next_chunk.call_count == 2
+        mock_sleep.assert_awaited_once()
+        mock_service.files().get().execute.assert_not_called()
+
+    @pytest.mark.unit
+    @patch("app.connectors.gdrive.service_account.Credentials")
+    @patch("app.connectors.gdrive.build")
+    async def test_fetch_file_caches_metadata(
+        self,
+        mock_build: MagicMock,
+        _mock_creds: MagicMock,
+    ) -> None:
+        """Test that repeat fetches reuse cached metadata."""
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        mock_service.files().get().execute.return_value = {
+            "mimeType": "application/pdf",
+            "modifiedTime": "2025-01-01T00:00:00Z",
+            "size": "1024",
+        }
+
+        mock_downloader = MagicMock()
+        mock_downloader.next_chunk.return_value = (None, True)
+
+        with patch(
+            "app.connectors.gdrive.MediaIoBaseDownload",
+            return_value=mock_downloader,
+        ):
+            connector = GDriveConnector(credentials_path="fake.json")
+            first = await connector.fetch_file("file_123")
+            second = await connector.fetch_file("file_123")
+
+        assert isinstance(first, bytes)
+        assert isinstance(second, bytes)
+        assert mock_service.files().get().execute.call_count == 1
+
+    @pytest.mark.unit
+    @patch("app.connectors.gdrive.service_account.Credentials")
+    @patch("app.connectors.gdrive.build")
+    async def test_refresh_changes_invalidates_cache(
+        self,
+        mock_build: MagicMock,
+        _mock_creds: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test that Drive changes update the cache and persist the token."""
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        mock_service.files().list().execute.return_value = {
+            "files": [
+                {"id": "file_1", "mimeType": "application/pdf", "size": "10"},
+                {"id": "file_2", "mimeType": "text/plain", "size": "20"},
+            ],
+        }
+        mock_service.changes().list().execute.return_value = {
+            "changes": [
+                {"fileId": "file_1", "removed": True},
+                {
+                    "fileId": "file_2",
+                    "file": {"mimeType": "text/markdown", "size": "30"},
+                },
+            ],
+            "newStartPageToken": "token_2",
+        }
+
+        token_path = tmp_path / "changes.token"
+        connector = GDriveConnector(
+            credentials_path="fake.json",
+            changes_token_path=str(token_path),
+        )
+        await connector.list_files()
+        result = await connector.refresh_changes("token_1")
+
+        assert result == "token_2"
+        assert token_path.read_text() == "token_2"
+        assert connector._meta_cache.get("file_1") is None
+        assert connector._meta_cache.get("file_2") == ("text/markdown", "", 30)
+
+    @pytest.mark.unit
+    @patch("app.connectors.gdrive.service_account.Credentials")
+    @patch("app.connectors.gdrive.build")
+    @patch("app.connectors.gdrive.asyncio.sleep", new_callable=AsyncMock)
+    async def test_stream_file_writes_into_sink(
+        self,
+        _mock_sleep: AsyncMock,
+        mock_build: MagicMock,
+        _mock_creds: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Test streaming into a file, rewinding after a failed attempt."""
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        attempts = 0
+
+        def fake_downloader(sink, _request, chunksize):  # type: ignore[no-untyped-def]
+            nonlocal attempts
+            attempts += 1
+            assert chunksize == GDriveConnector.DOWNLOAD_CHUNK_SIZE
+            downloader = MagicMock()
+            if attempts == 1:
+
+                def fail() -> None:
+                    sink.write(b"partial")
+                    raise HttpError(resp=MagicMock(status=503), content=b"")
+
+                downloader.next_chunk.side_effect = fail
+            else:
+                chunks = iter([b"chunk-1|", b"chunk-2"])
+
+                def next_chunk() -> tuple[None, bool]:
+                    sink.write(next(chunks))
+                    return None, sink.tell() == len(b"chunk-1|chunk-2")
+
+                downloader.next_chunk.side_effect = next_chunk
+            return downloader
+
+        target = tmp_path / "report.pdf"
+        with (
+            patch(
+                "app.connectors.gdrive.MediaIoBaseDownload",
+                side_effect=fake_downloader,
+            ),
+            target.open("wb+") as sink,
+        ):
+            connector = GDriveConnector(credentials_path="fake.json")
+            written = await connector.stream_file(
+                "file_123", sink, mime_type="application/pdf"
+            )
+
+        assert written == len(b"chunk-1|chunk-2")
+        assert target.read_bytes() == b"chunk-1|chunk-2"
+        mock_service.files().get.assert_not_called()
+
+    @pytest.mark.unit
+    @patch("app.connectors.gdrive.service_account.Credentials")
+    @patch("app.connectors.gdrive.build")
+    async def test_iter_file_pages_yields_each_page(
+        self,
+        mock_build: MagicMock,
+        _mock_creds: MagicMock,
+    ) -> None:
+        """Test that listing pages are yielded in order as they arrive."""
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        mock_service.files().list().execute.side_effect = [
+            {"files": [{"id": "file_1"}], "nextPageToken": "token_page2"},
+            {"files": [{"id": "file_2"}, {"id": "file_3"}]},
+        ]
+
+        connector = GDriveConnector(credentials_path="fake.json")
+        pages = [
+            [file["id"] for file in page]
+            async for page in connector.iter_file_pages(folder_id="folder_123")
+        ]
+
+        assert pages == [["file_1"], ["file_2", "file_3"]]
+        list_kwargs = mock_service.files().list.call_args.kwargs
+        assert list_kwargs["pageToken"] == "token_page2"
+        assert list_kwargs["q"] == "'folder_123' in parents"
+
+    @pytest.mark.unit
+    @patch("app.connectors.gdrive.service_account.Credentials")
+    @patch("app.connectors.gdrive.build")
+    async def test_concurrent_fetches_overlap(
+        self,
+        mock_build: MagicMock,
+        _mock_creds: MagicMock,
+    ) -> None:
+        """Test that downloads run off the event loop and overlap."""
+        mock_build.return_value = MagicMock()
+        # Both downloads must be in flight at once to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fake_downloader(sink, _request, chunksize):  # type: ignore[no-untyped-def]
+            downloader = MagicMock()
+
+            def next_chunk() -> tuple[None, bool]:
+                barrier.wait()
+                sink.write(b"data")
+                return None, True
+
+            downloader.next_chunk.side_effect = next_chunk
+            return downloader
+
+        with patch(
+            "app.connectors.gdrive.MediaIoBaseDownload",
+            side_effect=fake_downloader,
+        ):
+            connector = GDriveConnector(credentials_path="fake.json")
+            results = await asyncio.gather(
+                connector.fetch_file("file_1", mime_type="application/pdf"),
+                connector.fetch_file("file_2", mime_type="application/pdf"),
+            )
+            connector.close()
+
+        assert results == [b"data", b"data"]
+
+    @pytest.mark.unit
+    def test_metadata_cache_is_thread_safe(self) -> None:
+        """Test that concurrent puts and gets keep the LRU consistent."""
+        cache = _MetadataCache(maxsize=8, ttl_seconds=0.0001)
+        errors: list[BaseException] = []
+
+        def hammer(offset: int) -> None:
+            try:
+                for i in range(2000):
+                    file_id = f"file_{(i + offset) % 16}"
+                    cache.put(file_id, {"mimeType": "text/plain", "size": "1"})
+                    cache.get(file_id)
+                    cache.pop(f"file_{i % 16}")
+            except BaseException as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=hammer, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(cache) <= 8
+
+    @pytest.mark.unit
+    @patch("app.connectors.gdrive.service_account.Credentials")
+    @patch("app.connectors.gdrive.build")
+    def test_service_shared_across_instances(
+        self,
+        mock_build: MagicMock,
+        mock_creds: MagicMock,
+    ) -> None:
+        """Test that connectors with the same key file share one service."""
+        first = GDriveConnector(credentials_path="fake.json")
+        second = GDriveConnector(credentials_path="fake.json")
+        other = GDriveConnector(credentials_path="other.json")
+
+        assert first._get_service() is second._get_service()
+        other._get_service()
+
+        assert mock_creds.from_service_account_info.call_count == 2
+        assert mock_build.call_count == 2
+        assert mock_build.call_args.kwargs["static_discovery"] is True
+        assert mock_build.call_args.kwargs["cache_discovery"] is False
+
+    @pytest.mark.unit
+    def test_error_details_can_be_disabled(self) -> None:
+        """Test that rendered error text is dropped when capture is off."""
+        connector = GDriveConnector(credentials_path="fake.json")
+        http_error = HttpError(resp=MagicMock(status=403), content=b"Denied")
+
+        captured = connector._handle_http_error(http_error, "file_1", attempt=0)
+        with patch.object(GDriveConnector, "CAPTURE_ERROR_DETAILS", new=False):
+            bare = connector._handle_http_error(http_error, "file_1", attempt=0)
+            unexpected = connector._unexpected_failure("file_1", RuntimeError("x"))
+
+        assert captured is not None
+        assert captured.details == {"file_id": "file_1", "error": http_error.reason}
+        assert bare is not None
+        assert bare.details == {"file_id": "file_1"}
+        assert unexpected.details == {"file_id": "file_1"}
+        assert unexpected.message == "Unexpected error: x"
+
+    @pytest.mark.unit
+    def test_service_account_info_parsed_once(self, tmp_path: Path) -> None:
+        """Test that a key file is read once and shared across lookups."""
+        key_path = tmp_path / "key.json"
+        key_path.write_text('{"type": "service_account", "project_id": "demo"}')
+        _load_service_account_info.cache_clear()
+
+        first = _load_service_account_info(str(key_path))
+        key_path.unlink()
+        second = _load_service_account_info(str(key_path))
+
+        assert first is second
+        assert first["project_id"] == "demo"
+        _load_service_account_info.cache_clear()
+
+    @pytest.mark.unit
+    def test_missing_credentials_file(self, tmp_path: Path) -> None:
+        """Test that a missing key file surfaces as a ValueError."""
+        connector = GDriveConnector(credentials_path=str(tmp_path / "none.json"))
+
+        with (
+            patch(
+                "app.connectors.gdrive._load_service_account_info",
+                new=_load_service_account_info,
+            ),
+            pytest.raises(ValueError, match="credentials not found"),
+        ):
+            connector._get_service()
+
+    @pytest.mark.unit
+    def test_chunk_size_fits_memory_budget(self) -> None:
+        """Test that a memory budget caps the per-download chunk size."""
+        mib = 1024 * 1024
+        workers = GDriveConnector.MAX_WORKERS
+
+        default = GDriveConnector(credentials_path="fake.json")
+        explicit = GDriveConnector(credentials_path="fake.json", chunk_size=mib)
+        budgeted = GDriveConnector(
+            credentials_path="fake.json", download_memory_budget=workers * 3 * mib
+        )
+        tiny = GDriveConnector(credentials_path="fake.json", download_memory_budget=1)
+
+        assert default._chunk_size == GDriveConnector.DOWNLOAD_CHUNK_SIZE
+        assert explicit._chunk_size == mib
+        assert budgeted._chunk_size == 3 * mib
+        assert tiny._chunk_size == GDriveConnector.MIN_DOWNLOAD_CHUNK_SIZE
@@ -1,5 +1,6 @@
 """Unit tests for web connector."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -24,7 +25,7 @@ class TestWebConnector:
 
         mock_client_instance = AsyncMock()
         mock_client_instance.get.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client.return_value = mock_client_instance
 
         # Mock trafilatura extraction
         mock_extract.return_value = (
@@ -50,7 +51,7 @@ class TestWebConnector:
 
         mock_client_instance = AsyncMock()
         mock_client_instance.get.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client.return_value = mock_client_instance
 
         connector = WebConnector()
         result = await connector.fetch("https://example.com/missing")
@@ -68,7 +69,7 @@ class TestWebConnector:
 
         mock_client_instance = AsyncMock()
         mock_client_instance.get.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client.return_value = mock_client_instance
 
         connector = WebConnector()
         result = await connector.fetch("https://example.com/forbidden")
@@ -95,7 +96,7 @@ class TestWebConnector:
             mock_response_429,
             mock_response_200,
         ]
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client.return_value = mock_client_instance
 
         with patch("app.connectors.web.trafilatura.extract") as mock_extract:
             mock_extract.return_value = (
@@ -115,7 +116,7 @@ class TestWebConnector:
         """Test network timeout handling."""
         mock_client_instance = AsyncMock()
         mock_client_instance.get.side_effect = httpx.TimeoutException("Timeout")
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client.return_value = mock_client_instance
 
         connector = WebConnector(max_retries=3, timeout=5)
         result = await connector.fetch("https://slow-site.com")
@@ -157,7 +158,7 @@ class TestWebConnector:
 
         mock_client_instance = AsyncMock()
         mock_client_instance.get.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client.return_value = mock_client_instance
 
         # trafilatura returns None or very short content
         mock_extract.return_value = "X"  # Too short (<50 chars)
@@ -190,7 +191,7 @@ class TestWebConnector:
 
         mock_client_instance = AsyncMock()
         mock_client_instance.get.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+        mock_client.return_value = mock_client_instance
 
         mock_extract.return_value = (
             "Article content here with enough text to pass the validation."
@@ -215,3 +216,180 @@ class TestWebConnector:
         assert metadata["title"] == "Test Article"
         assert metadata["author"] == "John Doe"
         assert metadata["date"] == "2025-01-01"
+
+    @pytest.mark.unit
+    @patch("app.connectors.web.WebConnector._fetch_with_retry", new_callable=AsyncMock)
+    @patch("app.connectors.web.trafilatura.extract")
+    async def test_content_hash_is_stable(self, mock_extract, mock_fetch):
+        """Test that identical content yields the same 16-char content hash."""
+        mock_fetch.return_value = "<html></html>"
+        mock_extract.return_value = (
+            "Stable content that is long enough to pass the validation check."
+        )
+
+        connector = WebConnector()
+        first = await connector.fetch("https://example.com/a", extract_metadata=False)
+        second = await connector.fetch("https://example.com/b", extract_metadata=False)
+
+        assert not isinstance(first, AgentFailure)
+        assert not isinstance(second, AgentFailure)
+        content_hash = first[1]["content_hash"]
+        assert len(content_hash) == 16
+        assert content_hash == second[1]["content_hash"]
+
+    @pytest.mark.unit
+    @patch("app.connectors.web.httpx.AsyncClient")
+    @patch("app.connectors.web.trafilatura.extract")
+    async def test_client_reused_across_requests(self, mock_extract, mock_client):
+        """Test that one pooled client serves every request until closed."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = "<html><body><p>Reused</p></body></html>"
+
+        mock_client_instance = AsyncMock()
+        mock_client_instance.get.return_value = mock_response
+        mock_client.return_value = mock_client_instance
+
+        mock_extract.return_value = (
+            "Reused content that is long enough to pass the validation check."
+        )
+
+        async with WebConnector() as connector:
+            await connector.fetch("https://example.com/one", extract_metadata=False)
+            await connector.fetch("https://example.com/two", extract_metadata=False)
+
+        assert mock_client.call_count == 1
+        assert mock_client.call_args.kwargs["http2"] is True
+        assert mock_client_instance.get.call_count == 2
+        mock_client_instance.aclose.assert_awaited_once()
+
+    @pytest.mark.unit
+    @patch("app.connectors.web.WebConnector._fetch_with_retry", new_callable=AsyncMock)
+    @patch("app.connectors.web.trafilatura.extract_metadata")
+    @patch("app.connectors.web.trafilatura.extract")
+    @patch("app.connectors.web.trafilatura.load_html")
+    async def test_html_parsed_once(
+        self, mock_load, mock_extract, mock_meta, mock_fetch
+    ):
+        """Test that content and metadata extraction share one parsed tree."""
+        mock_fetch.return_value = "<html><body>Article</body></html>"
+        mock_extract.return_value = (
+            "Parsed once content that is long enough to pass the validation."
+        )
+        mock_meta.return_value = None
+
+        connector = WebConnector(include_links=False)
+        result = await connector.fetch("https://example.com/article")
+
+        assert not isinstance(result, AgentFailure)
+        mock_load.assert_called_once_with("<html><body>Article</body></html>")
+        tree = mock_load.return_value
+        mock_meta.assert_called_once_with(tree)
+        assert mock_extract.call_args.args == (tree,)
+        assert mock_extract.call_args.kwargs["include_links"] is False
+
+    @pytest.mark.unit
+    @patch("app.connectors.web.httpx.AsyncClient")
+    @patch("app.connectors.web.trafilatura.extract")
+    async def test_concurrency_capped(self, mock_extract, mock_client):
+        """Test that in-flight requests never exceed max_concurrency."""
+        in_flight = 0
+        peak = 0
+
+        async def slow_get(*_args, **_kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            response = MagicMock()
+            response.status_code = 200
+            response.text = "<html><body>Page</body></html>"
+            return response
+
+        mock_client_instance = AsyncMock()
+        mock_client_instance.get.side_effect = slow_get
+        mock_client.return_value = mock_client_instance
+        mock_extract.return_value = (
+            "Concurrent content that is long enough to pass the validation."
+        )
+
+        connector = WebConnector(max_concurrency=2, per_host_burst=100)
+        results = await asyncio.gather(
+            *[
+                connector.fetch(f"https://example.com/{i}", extract_metadata=False)
+                for i in range(6)
+            ]
+        )
+
+        assert all(not isinstance(result, AgentFailure) for result in results)
+        assert peak == 2
+
+    @pytest.mark.unit
+    @patch("app.connectors.web.httpx.AsyncClient")
+    @patch("app.connectors.web.asyncio.sleep", new_callable=AsyncMock)
+    async def test_rate_limit_halves_host_rate(self, _mock_sleep, mock_client):
+        """Test that a 429 halves the host's refill rate."""
+        mock_response_429 = MagicMock()
+        mock_response_429.status_code = 429
+        mock_response_429.headers = {}
+
+        mock_client_instance = AsyncMock()
+        mock_client_instance.get.return_value = mock_response_429
+        mock_client.return_value = mock_client_instance
+
+        connector = WebConnector(max_retries=2, per_host_rate=8.0)
+        result = await connector.fetch("https://example.com/busy")
+
+        assert isinstance(result, AgentFailure)
+        assert result.error_code == ErrorCodes.CONNECTOR_RATE_LIMIT
+        assert connector._bucket_for("https://example.com/x").rate == 2.0
+        assert connector._bucket_for("https://other.com/").rate == 8.0
+
+    @pytest.mark.unit
+    async def test_host_waiters_sleep_concurrently(self):
+        """Test that waiters for one host do not queue behind each other."""
+        connector = WebConnector(per_host_rate=100.0, per_host_burst=1)
+        bucket = connector._bucket_for("https://example.com/")
+
+        waiters = [asyncio.create_task(bucket.acquire()) for _ in range(4)]
+        await asyncio.sleep(0)
+
+        # Every waiter has reserved its slot and is sleeping, none holds a lock
+        assert bucket._tokens == pytest.approx(-3, abs=0.5)
+        assert sum(not waiter.done() for waiter in waiters) == 3
+        await asyncio.gather(*waiters)
+
+    @pytest.mark.unit
+    def test_host_buckets_are_bounded(self):
+        """Test that least recently used host buckets are evicted."""
+        connector = WebConnector()
+
+        with patch.object(WebConnector, "MAX_TRACKED_HOSTS", new=2):
+            first = connector._bucket_for("https://a.com/")
+            connector._bucket_for("https://b.com/")
+            assert connector._bucket_for("https://a.com/x") is first
+            connector._bucket_for("https://c.com/")
+
+        assert list(connector._buckets) == ["a.com", "c.com"]
+
+    @pytest.mark.unit
+    def test_trafilatura_config_shared(self):
+        """Test that the trafilatura config is loaded once per process."""
+        first = WebConnector()
+        second = WebConnector()
+
+        assert first.trafilatura_config is second.trafilatura_config
+        assert first.trafilatura_config.get("DEFAULT", "EXTENSIVE_CLEANING") == "true"
+
+    @pytest.mark.unit
+    def test_allowed_domain_matching(self):
+        """Test exact, subdomain and case-insensitive whitelist matching."""
+        connector = WebConnector(allowed_domains=["Example.com", "docs.python.org"])
+
+        assert connector._is_allowed_domain("https://example.com/a")
+        assert connector._is_allowed_domain("https://WWW.Example.com/a")
+        assert connector._is_allowed_domain("https://api.v2.docs.python.org/")
+        assert not connector._is_allowed_domain("https://python.org/")
+        assert not connector._is_allowed_domain("https://badexample.com/")
+        assert not connector._is_allowed_domain("https://example.com.evil.io/")
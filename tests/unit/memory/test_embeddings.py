@@ -4,32 +4,31 @@ from __future__ import annotations
 
 from typing import ClassVar
 
+import numpy as np
 import pytest
 
 from app.memory.embeddings import EmbeddingGenerator
 
 
-class _ArrayLike:
-    def __init__(self, values):
-        self._values = values
-
-    def tolist(self):
-        return self._values
-
-
 class _StubTransformer:
     init_calls: ClassVar[list[str]] = []
+    encode_kwargs: ClassVar[list[dict]] = []
 
-    def __init__(self, model_name: str):
+    def __init__(self, model_name: str, device: str | None = None):
         self.model_name = model_name
+        self.device = device or "cpu"
+        self.halved = False
         _StubTransformer.init_calls.append(model_name)
 
-    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
-        _ = convert_to_numpy
-        _ = show_progress_bar
+    def half(self):
+        self.halved = True
+        return self
+
+    def encode(self, texts, **kwargs):
+        _StubTransformer.encode_kwargs.append(kwargs)
         if isinstance(texts, list):
-            return _ArrayLike([[1.0, 2.0] for _ in texts])
-        return _ArrayLike([0.1, 0.2, 0.3])
+            return np.array([[1.0, 2.0] for _ in texts], dtype=np.float32)
+        return np.array([0.1, 0.2, 0.3], dtype=np.float32)
 
     def get_sentence_embedding_dimension(self):
         return 3
@@ -52,12 +51,13 @@ def test_embed_text_uses_stubbed_model(monkeypatch) -> None:
     generator = EmbeddingGenerator(model_name="stub-model")
     result = generator.embed_text("hello")
 
-    assert result == [0.1, 0.2, 0.3]
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, [0.1, 0.2, 0.3])
     assert _StubTransformer.init_calls == ["stub-model"]
 
 
 @pytest.mark.real_embeddings
-def test_embed_batch_returns_list(monkeypatch) -> None:
+def test_embed_batch_returns_float32_matrix(monkeypatch) -> None:
     monkeypatch.setattr(
         "app.memory.embeddings.SentenceTransformer",
         _StubTransformer,
@@ -67,7 +67,52 @@ def test_embed_batch_returns_list(monkeypatch) -> None:
     generator = EmbeddingGenerator()
     result = generator.embed_batch(["alpha", "beta"])
 
-    assert result == [[1.0, 2.0], [1.0, 2.0]]
+    assert result.dtype == np.float32
+    assert result.shape == (2, 2)
+    np.testing.assert_array_equal(result, [[1.0, 2.0], [1.0, 2.0]])
+
+
+@pytest.mark.real_embeddings
+def test_embed_batch_uses_configured_batch_size_and_normalizes(monkeypatch) -> None:
+    _StubTransformer.encode_kwargs.clear()
+    monkeypatch.setattr(
+        "app.memory.embeddings.SentenceTransformer",
+        _StubTransformer,
+        raising=True,
+    )
+
+    generator = EmbeddingGenerator(batch_size=64)
+    generator.embed_batch(["alpha"])
+    generator.embed_text("beta")
+
+    batch_kwargs, text_kwargs = _StubTransformer.encode_kwargs
+    assert batch_kwargs["batch_size"] == 64
+    assert batch_kwargs["normalize_embeddings"] is True
+    assert text_kwargs["normalize_embeddings"] is True
+
+
+@pytest.mark.real_embeddings
+@pytest.mark.parametrize(
+    ("device", "fp16", "halved"),
+    [("cuda:0", True, True), ("cuda:0", False, False), ("cpu", True, False)],
+)
+def test_model_casts_to_half_only_on_cuda(
+    monkeypatch, device: str, fp16: bool, halved: bool
+) -> None:
+    monkeypatch.setattr(
+        "app.memory.embeddings.SentenceTransformer",
+        _StubTransformer,
+        raising=True,
+    )
+
+    generator = EmbeddingGenerator(device=device, fp16=fp16)
+
+    assert generator.model.halved is halved
+
+
+def test_rejects_non_positive_batch_size() -> None:
+    with pytest.raises(ValueError, match="batch_size"):
+        EmbeddingGenerator(batch_size=0)
 
 
 @pytest.mark.real_embeddings
@@ -80,3 +125,19 @@ def test_embedding_dim_falls_back_when_missing(monkeypatch) -> None:
 
     generator = EmbeddingGenerator()
     assert generator.embedding_dim == 384
+
+
+@pytest.mark.real_embeddings
+def test_preload_loads_model_once(monkeypatch) -> None:
+    _StubTransformer.init_calls.clear()
+    monkeypatch.setattr(
+        "app.memory.embeddings.SentenceTransformer",
+        _StubTransformer,
+        raising=True,
+    )
+
+    generator = EmbeddingGenerator(model_name="warm-model")
+    generator.preload()
+    generator.embed_text("hello")
+
+    assert _StubTransformer.init_calls == ["warm-model"]
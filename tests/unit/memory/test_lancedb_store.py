@@ -0,0 +1,635 @@
+"""Unit tests for LanceDBStore against an on-disk LanceDB instance."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pyarrow as pa  # type: ignore[import-untyped]
+import pytest
+
+from app.memory.lancedb_store import LanceDBStore, _encode_metadata
+from app.schemas import AgentFailure, MemoryOutput
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _unit_rows(rows: int, dim: int) -> np.ndarray:
+    matrix = np.eye(rows, dim, dtype=np.float32)
+    matrix[:, -1] += 0.01
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+@pytest.mark.unit
+async def test_add_documents_accepts_ndarray(tmp_path: Path) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+    embeddings = _unit_rows(3, 4)
+
+    await store.add_documents(
+        chunk_ids=["a", "b", "c"],
+        contents=["alpha", "beta", "gamma"],
+        embeddings=embeddings,
+        source_ids=["doc"] * 3,
+        source_urls=[None] * 3,
+        metadata_list=[{"i": i} for i in range(3)],
+    )
+
+    assert await store.count_documents() == 3
+    result = await store.search(embeddings[1], top_k=1, min_score=0.9)
+    assert isinstance(result, MemoryOutput)
+    assert result.results[0].chunk_id == "b"
+    assert result.results[0].source_url is None
+    assert MemoryOutput.model_validate(result.model_dump()) == result
+
+
+@pytest.mark.unit
+async def test_add_documents_accepts_nested_lists(tmp_path: Path) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+
+    await store.add_documents(
+        chunk_ids=["a", "b"],
+        contents=["alpha", "beta"],
+        embeddings=_unit_rows(2, 4).tolist(),
+        source_ids=["doc", "doc"],
+        source_urls=["https://example.com", None],
+        metadata_list=[{}, {}],
+    )
+    await store.add_documents(
+        chunk_ids=["c"],
+        contents=["gamma"],
+        embeddings=_unit_rows(1, 4),
+        source_ids=["doc"],
+        source_urls=[None],
+        metadata_list=[{}],
+    )
+
+    assert await store.count_documents() == 3
+
+
+@pytest.mark.unit
+async def test_add_documents_rejects_wrong_dimension(tmp_path: Path) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+
+    with pytest.raises(ValueError, match="shape"):
+        await store.add_documents(
+            chunk_ids=["a"],
+            contents=["alpha"],
+            embeddings=np.zeros((1, 3), dtype=np.float32),
+            source_ids=["doc"],
+            source_urls=[None],
+            metadata_list=[{}],
+        )
+
+
+@pytest.mark.unit
+async def test_shared_metadata_is_merged_over_chunk_metadata(tmp_path: Path) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+    embeddings = _unit_rows(2, 4)
+
+    await store.add_documents(
+        chunk_ids=["a", "b"],
+        contents=["alpha", "beta"],
+        embeddings=embeddings,
+        source_ids=["doc", "doc"],
+        source_urls=[None, None],
+        metadata_list=[{"chunk_index": 0, "tag": "chunk"}, {}],
+        shared_metadata={"filename": "doc.txt", "tag": "shared"},
+    )
+
+    first = await store.search(embeddings[0], top_k=1, min_score=0.9)
+    second = await store.search(embeddings[1], top_k=1, min_score=0.9)
+    assert isinstance(first, MemoryOutput)
+    assert isinstance(second, MemoryOutput)
+    assert first.results[0].metadata == {
+        "chunk_index": 0,
+        "tag": "shared",
+        "filename": "doc.txt",
+    }
+    assert second.results[0].metadata == {"filename": "doc.txt", "tag": "shared"}
+
+
+@pytest.mark.unit
+def test_encoded_metadata_has_no_duplicate_keys() -> None:
+    rows = _encode_metadata(
+        [{"chunk_index": 0, "tag": "chunk"}, {"tag": "other"}, {}],
+        {"filename": "doc.txt", "tag": "shared"},
+    )
+
+    assert rows == [
+        b'{"chunk_index":0,"filename":"doc.txt","tag":"shared"}',
+        b'{"filename":"doc.txt","tag":"shared"}',
+        b'{"filename":"doc.txt","tag":"shared"}',
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("quantized_index", "index_type"), [(False, "IvfFlat"), (True, "IvfSq")]
+)
+async def test_vector_index_built_once_threshold_reached(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    quantized_index: bool,
+    index_type: str,
+) -> None:
+    monkeypatch.setattr(LanceDBStore, "VECTOR_INDEX_MIN_ROWS", 300)
+    monkeypatch.setattr(LanceDBStore, "IN_MEMORY_MAX_ROWS", 0)
+    store = LanceDBStore(
+        str(tmp_path), embedding_dim=8, quantized_index=quantized_index
+    )
+    rng = np.random.default_rng(0)
+
+    async def _add(start: int, rows: int) -> np.ndarray:
+        embeddings = rng.random((rows, 8), dtype=np.float32)
+        ids = [f"c{i}" for i in range(start, start + rows)]
+        await store.add_documents(
+            chunk_ids=ids,
+            contents=ids,
+            embeddings=embeddings,
+            source_ids=["doc"] * rows,
+            source_urls=[None] * rows,
+            metadata_list=[{}] * rows,
+        )
+        return embeddings
+
+    await _add(0, 200)
+    assert store.db.open_table(store.table_name).list_indices() == []
+
+    embeddings = await _add(200, 200)
+    indices = store.db.open_table(store.table_name).list_indices()
+    assert [index.columns for index in indices] == [["embedding"]]
+    assert str(indices[0].index_type) == index_type
+
+    result = await store.search(embeddings[0], top_k=2, min_score=0.0)
+    assert isinstance(result, MemoryOutput)
+    assert result.results[0].chunk_id == "c200"
+    assert result.results[0].relevance_score == pytest.approx(1.0, abs=1e-5)
+
+    monkeypatch.setattr(LanceDBStore, "INDEX_REFRESH_ROWS", 150)
+    await _add(400, 100)
+    table = store.db.open_table(store.table_name)
+    assert table.index_stats(indices[0].name).num_unindexed_rows == 100
+    await _add(500, 100)
+    table = store.db.open_table(store.table_name)
+    assert table.index_stats(indices[0].name).num_unindexed_rows == 0
+
+
+@pytest.mark.unit
+async def test_unnormalized_vectors_score_as_cosine(tmp_path: Path) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+    embeddings = _unit_rows(2, 4) * np.float32(3.0)
+
+    await store.add_documents(
+        chunk_ids=["a", "b"],
+        contents=["alpha", "beta"],
+        embeddings=embeddings,
+        source_ids=["doc", "doc"],
+        source_urls=[None, None],
+        metadata_list=[{}, {}],
+    )
+
+    result = await store.search(embeddings[0] * 5.0, top_k=1, min_score=0.9)
+    assert isinstance(result, MemoryOutput)
+    assert result.results[0].chunk_id == "a"
+    assert result.results[0].relevance_score == pytest.approx(1.0, abs=1e-5)
+
+
+@pytest.mark.unit
+async def test_existing_cosine_index_keeps_its_metric(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(LanceDBStore, "IN_MEMORY_MAX_ROWS", 0)
+    rows = 300
+    embeddings = np.random.default_rng(0).random((rows, 8), dtype=np.float32)
+    ids = [f"c{i}" for i in range(rows)]
+    writer = LanceDBStore(str(tmp_path), embedding_dim=8)
+    await writer.add_documents(
+        chunk_ids=ids,
+        contents=ids,
+        embeddings=embeddings,
+        source_ids=["doc"] * rows,
+        source_urls=[None] * rows,
+        metadata_list=[{}] * rows,
+    )
+    writer.db.open_table(writer.table_name).create_index(
+        metric="cosine",
+        vector_column_name="embedding",
+        num_partitions=1,
+        index_type="IVF_FLAT",
+    )
+
+    store = LanceDBStore(str(tmp_path), embedding_dim=8)
+    result = await store.search(embeddings[7], top_k=1, min_score=0.0)
+
+    assert store._distance_metric(store.db.open_table(store.table_name)) == "cosine"
+    assert isinstance(result, MemoryOutput)
+    assert result.results[0].chunk_id == "c7"
+    assert result.results[0].relevance_score == pytest.approx(1.0, abs=1e-5)
+
+
+@pytest.mark.unit
+async def test_search_applies_threshold_and_filters(tmp_path: Path) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+    embeddings = _unit_rows(3, 4)
+
+    await store.add_documents(
+        chunk_ids=["a", "b", "c"],
+        contents=["alpha", "beta", "gamma"],
+        embeddings=embeddings,
+        source_ids=["doc"] * 3,
+        source_urls=[None] * 3,
+        metadata_list=[{"lang": "en"}, {"lang": "fr"}, {"lang": "en"}],
+    )
+
+    result = await store.search(
+        embeddings[1], top_k=3, min_score=0.0, filters={"lang": "en"}
+    )
+    assert isinstance(result, MemoryOutput)
+    assert {ctx.chunk_id for ctx in result.results} == {"a", "c"}
+    assert all(ctx.relevance_score < 1.0 for ctx in result.results)
+
+    strict = await store.search(
+        embeddings[1], top_k=3, min_score=0.99, filters={"lang": "en"}
+    )
+    assert isinstance(strict, AgentFailure)
+
+
+@pytest.mark.unit
+async def test_filters_apply_before_the_result_limit(tmp_path: Path) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+    query = np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32)
+    near = np.tile(query, (5, 1)) + np.float32(0.01)
+    far = np.array([[0.6, 0.8, 0.0, 0.0]], dtype=np.float32)
+    source_type = "it's_a \\ 100%"
+
+    await store.add_documents(
+        chunk_ids=["n0", "n1", "n2", "n3", "n4", "far"],
+        contents=["near"] * 5 + ["far"],
+        embeddings=np.vstack([near, far]),
+        source_ids=["doc"] * 6,
+        source_urls=[None] * 6,
+        metadata_list=[{"source_type": "web"}] * 5 + [{"source_type": source_type}],
+    )
+
+    result = await store.search(
+        query, top_k=1, min_score=0.0, filters={"source_type": source_type}
+    )
+    assert isinstance(result, MemoryOutput)
+    assert [ctx.chunk_id for ctx in result.results] == ["far"]
+
+    decoy = await store.search(
+        query, top_k=1, min_score=0.0, filters={"source_type": "its_a"}
+    )
+    assert isinstance(decoy, AgentFailure)
+
+
+@pytest.mark.unit
+async def test_filter_columns_cover_new_and_legacy_rows(tmp_path: Path) -> None:
+    legacy = LanceDBStore(str(tmp_path), embedding_dim=4)
+    legacy_columns = [
+        name for name in legacy._schema.names if name not in legacy.FILTER_COLUMNS
+    ]
+    legacy.db.create_table(
+        legacy.table_name,
+        data=pa.table(
+            {
+                "chunk_id": ["old"],
+                "content": ["old"],
+                "embedding": pa.FixedSizeListArray.from_arrays(
+                    pa.array(_unit_rows(1, 4).reshape(-1)), 4
+                ),
+                "source_id": ["doc"],
+                "source_url": [""],
+                "metadata": ['{"source_type": "gdrive"}'],
+            }
+        ).select(legacy_columns),
+    )
+
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+    embeddings = _unit_rows(3, 4)
+    await store.add_documents(
+        chunk_ids=["web", "drive"],
+        contents=["web", "drive"],
+        embeddings=embeddings[1:],
+        source_ids=["doc", "doc"],
+        source_urls=[None, None],
+        metadata_list=[{"source_type": "local"}, {}],
+        shared_metadata=[{"source_type": "web"}, {"source_type": "gdrive"}],
+    )
+
+    table = store.db.open_table(store.table_name)
+    assert table.to_arrow().column("source_type").to_pylist() == [
+        None,
+        "web",
+        "gdrive",
+    ]
+    result = await store.search(
+        embeddings[0], top_k=3, min_score=0.0, filters={"source_type": "gdrive"}
+    )
+    assert isinstance(result, MemoryOutput)
+    assert {ctx.chunk_id for ctx in result.results} == {"old", "drive"}
+
+
+@pytest.mark.unit
+async def test_reads_do_not_migrate_legacy_tables(tmp_path: Path) -> None:
+    legacy = LanceDBStore(str(tmp_path), embedding_dim=4)
+    legacy_columns = [
+        name for name in legacy._schema.names if name not in legacy.FILTER_COLUMNS
+    ]
+    embeddings = _unit_rows(2, 4)
+    table = legacy.db.create_table(
+        legacy.table_name,
+        data=pa.table(
+            {
+                "chunk_id": ["drive", "web"],
+                "content": ["drive", "web"],
+                "embedding": pa.FixedSizeListArray.from_arrays(
+                    pa.array(embeddings.reshape(-1)), 4
+                ),
+                "source_id": ["doc", "doc"],
+                "source_url": ["", ""],
+                "metadata": ['{"source_type": "gdrive"}', '{"source_type": "web"}'],
+            }
+        ).select(legacy_columns),
+    )
+    version = table.version
+
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+    assert await store.count_documents() == 2
+    result = await store.search(
+        embeddings[0], top_k=2, min_score=0.0, filters={"source_type": "gdrive"}
+    )
+
+    assert isinstance(result, MemoryOutput)
+    assert [ctx.chunk_id for ctx in result.results] == ["drive"]
+    reopened = store.db.open_table(store.table_name)
+    assert reopened.version == version
+    assert "source_type" not in reopened.schema.names
+
+
+@pytest.mark.unit
+async def test_non_ascii_metadata_round_trips_and_filters(tmp_path: Path) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+    embeddings = _unit_rows(2, 4)
+
+    await store.add_documents(
+        chunk_ids=["a", "b"],
+        contents=["alpha", "beta"],
+        embeddings=embeddings,
+        source_ids=["doc", "doc"],
+        source_urls=[None, None],
+        metadata_list=[{"title": "Café"}, {"title": "Cafe"}],
+        shared_metadata={"lang": "fr"},
+    )
+
+    result = await store.search(
+        embeddings[1], top_k=1, min_score=0.0, filters={"title": "Café"}
+    )
+    assert isinstance(result, MemoryOutput)
+    assert result.results[0].chunk_id == "a"
+    assert result.results[0].metadata == {"title": "Café", "lang": "fr"}
+
+
+@pytest.mark.unit
+async def test_search_batch_matches_single_searches(tmp_path: Path) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+    embeddings = _unit_rows(3, 4)
+
+    assert len(await store.search_batch(embeddings)) == 3
+    assert all(
+        isinstance(result, AgentFailure)
+        for result in await store.search_batch(embeddings)
+    )
+
+    await store.add_documents(
+        chunk_ids=["a", "b", "c"],
+        contents=["alpha", "beta", "gamma"],
+        embeddings=embeddings,
+        source_ids=["doc"] * 3,
+        source_urls=[None] * 3,
+        metadata_list=[{"lang": "en"}, {"lang": "fr"}, {"lang": "en"}],
+    )
+
+    queries = embeddings[[2, 0, 1]]
+    batch = await store.search_batch(
+        queries, top_k=2, min_score=0.0, filters={"lang": "en"}
+    )
+    single = [
+        await store.search(query, top_k=2, min_score=0.0, filters={"lang": "en"})
+        for query in queries
+    ]
+    assert batch == single
+    assert [
+        result.results[0].chunk_id
+        for result in batch
+        if isinstance(result, MemoryOutput)
+    ] == ["c", "a", "a"]
+
+
+@pytest.mark.unit
+async def test_search_batch_with_one_query(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+    embeddings = _unit_rows(3, 4)
+    await store.add_documents(
+        chunk_ids=["a", "b", "c"],
+        contents=["alpha", "beta", "gamma"],
+        embeddings=embeddings,
+        source_ids=["doc"] * 3,
+        source_urls=[None] * 3,
+        metadata_list=[{"lang": "en"}, {"lang": "fr"}, {"lang": "en"}],
+    )
+
+    filtered = await store.search_batch(
+        embeddings[:1], top_k=2, min_score=0.0, filters={"lang": "en"}
+    )
+    monkeypatch.setattr(LanceDBStore, "IN_MEMORY_MAX_ROWS", 0)
+    store._vector_cache = None
+    unfiltered = await store.search_batch(embeddings[:1], top_k=2, min_score=0.0)
+
+    assert filtered == [
+        await store.search(
+            embeddings[0], top_k=2, min_score=0.0, filters={"lang": "en"}
+        )
+    ]
+    assert unfiltered == [await store.search(embeddings[0], top_k=2, min_score=0.0)]
+
+
+@pytest.mark.unit
+async def test_in_memory_search_matches_lancedb_and_tracks_writes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=8)
+    embeddings = np.random.default_rng(1).random((50, 8), dtype=np.float32)
+    ids = [f"c{i}" for i in range(50)]
+    await store.add_documents(
+        chunk_ids=ids,
+        contents=ids,
+        embeddings=embeddings,
+        source_ids=["doc"] * 50,
+        source_urls=[None] * 50,
+        metadata_list=[{"i": i} for i in range(50)],
+    )
+
+    cached = await store.search_batch(embeddings[:3], top_k=4, min_score=0.0)
+    assert store._vector_cache is not None and store._vector_cache[1] is not None
+    vectors = store._vector_cache[1].vectors
+    assert vectors.flags.c_contiguous
+    assert vectors.ctypes.data % 64 == 0
+    monkeypatch.setattr(LanceDBStore, "IN_MEMORY_MAX_ROWS", 0)
+    store._vector_cache = None
+    scanned = await store.search_batch(embeddings[:3], top_k=4, min_score=0.0)
+    assert store._vector_cache is not None and store._vector_cache[1] is None
+
+    for cached_result, scanned_result in zip(cached, scanned, strict=True):
+        assert isinstance(cached_result, MemoryOutput)
+        assert isinstance(scanned_result, MemoryOutput)
+        assert [ctx.chunk_id for ctx in cached_result.results] == [
+            ctx.chunk_id for ctx in scanned_result.results
+        ]
+        assert [ctx.relevance_score for ctx in cached_result.results] == (
+            pytest.approx([ctx.relevance_score for ctx in scanned_result.results])
+        )
+
+    monkeypatch.undo()
+    store._vector_cache = None
+    await store.search_batch(embeddings[:1], top_k=1, min_score=0.0)
+    await store.add_documents(
+        chunk_ids=["new"],
+        contents=["new"],
+        embeddings=np.eye(1, 8, 7, dtype=np.float32),
+        source_ids=["doc"],
+        source_urls=[None],
+        metadata_list=[{}],
+    )
+    # The write extended the cache in place instead of forcing a reload
+    table = store._open_table()
+    assert table is not None
+    assert store._vector_cache is not None
+    assert store._vector_cache[0] == table.version
+    assert store._vector_cache[1] is not None
+    extended = store._vector_cache[1]
+    assert extended.vectors.shape == (51, 8)
+    result = await store.search(np.eye(1, 8, 7)[0], top_k=1, min_score=0.0)
+    assert isinstance(result, MemoryOutput)
+    assert result.results[0].chunk_id == "new"
+    assert store._vector_cache[1] is extended
+
+
+@pytest.mark.unit
+async def test_in_memory_search_thresholds_before_ranking(tmp_path: Path) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+    angles = np.linspace(0.0, np.pi, 20, dtype=np.float32)
+    embeddings = np.stack(
+        [np.cos(angles), np.sin(angles), np.zeros(20), np.zeros(20)], axis=1
+    )
+    ids = [f"c{i:02d}" for i in range(20)]
+    await store.add_documents(
+        chunk_ids=ids,
+        contents=ids,
+        embeddings=embeddings,
+        source_ids=["doc"] * 20,
+        source_urls=[None] * 20,
+        metadata_list=[{}] * 20,
+    )
+
+    result = await store.search(embeddings[0], top_k=3, min_score=0.0)
+    assert isinstance(result, MemoryOutput)
+    assert [ctx.chunk_id for ctx in result.results] == ["c00", "c01", "c02"]
+
+    expected = [
+        chunk_id
+        for chunk_id, angle in zip(ids, angles, strict=True)
+        if (1 + np.cos(angle)) / 2 >= 0.9
+    ]
+    result = await store.search(embeddings[0], top_k=20, min_score=0.9)
+    assert isinstance(result, MemoryOutput)
+    assert [ctx.chunk_id for ctx in result.results] == expected
+    assert all(ctx.relevance_score >= 0.9 for ctx in result.results)
+
+
+@pytest.mark.unit
+async def test_per_row_shared_metadata(tmp_path: Path) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+    embeddings = _unit_rows(3, 4)
+    first_doc = {"filename": "one.txt"}
+    second_doc = {"filename": "two.txt"}
+
+    await store.add_documents(
+        chunk_ids=["a", "b", "c"],
+        contents=["alpha", "beta", "gamma"],
+        embeddings=embeddings,
+        source_ids=["one", "one", "two"],
+        source_urls=[None] * 3,
+        metadata_list=[{"chunk_index": 0}, {"chunk_index": 1}, {}],
+        shared_metadata=[first_doc, first_doc, second_doc],
+    )
+
+    result = await store.search(embeddings[2], top_k=3, min_score=0.0)
+    assert isinstance(result, MemoryOutput)
+    by_id = {ctx.chunk_id: ctx.metadata for ctx in result.results}
+    assert by_id == {
+        "a": {"chunk_index": 0, "filename": "one.txt"},
+        "b": {"chunk_index": 1, "filename": "one.txt"},
+        "c": {"filename": "two.txt"},
+    }
+
+
+@pytest.mark.unit
+async def test_delete_by_source_removes_only_matching_rows(tmp_path: Path) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+
+    await store.add_documents(
+        chunk_ids=["a", "b", "c"],
+        contents=["alpha", "beta", "gamma"],
+        embeddings=_unit_rows(3, 4),
+        source_ids=["it's", "it's", "other"],
+        source_urls=[None] * 3,
+        metadata_list=[{}, {}, {}],
+    )
+
+    assert await store.delete_by_source("missing") == 0
+    assert await store.delete_by_source("it's") == 2
+    assert await store.count_documents() == 1
+
+
+@pytest.mark.unit
+async def test_table_handle_is_reused(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+    embeddings = _unit_rows(2, 4)
+    await store.add_documents(
+        chunk_ids=["a", "b"],
+        contents=["alpha", "beta"],
+        embeddings=embeddings,
+        source_ids=["one", "two"],
+        source_urls=[None, None],
+        metadata_list=[{}, {}],
+    )
+
+    reader = LanceDBStore(str(tmp_path), embedding_dim=4)
+    open_table = reader.db.open_table
+    opened: list[str] = []
+
+    def _counting_open(name: str) -> object:
+        opened.append(name)
+        return open_table(name)
+
+    monkeypatch.setattr(reader.db, "open_table", _counting_open)
+
+    assert await reader.count_documents() == 2
+    assert isinstance(await reader.search(embeddings[0], min_score=0.0), MemoryOutput)
+    assert await reader.delete_by_source("one") == 1
+    assert await reader.count_documents() == 1
+    assert opened == ["documents"]
+
+
+@pytest.mark.unit
+async def test_delete_by_source_without_table(tmp_path: Path) -> None:
+    store = LanceDBStore(str(tmp_path), embedding_dim=4)
+
+    assert await store.delete_by_source("doc") == 0
@@ -10,7 +10,7 @@ from typing import Any
 import pytest
 
 from app.memory.agent import MemoryAgent
-from app.schemas import AgentFailure, ErrorCodes, MemoryQuery
+from app.schemas import AgentFailure, ErrorCodes, MemoryOutput, MemoryQuery
 from app.schemas.parser import ParsedChunk
 
 
@@ -136,6 +136,45 @@ class TestMemoryAgent:
         assert len(chunk_ids) == 3
         assert chunk_ids == ["chunk_001", "chunk_002", "chunk_003"]
 
+    @pytest.mark.unit
+    async def test_add_documents_writes_in_windows(
+        self,
+        memory_agent: MemoryAgent,
+        sample_chunks: list[ParsedChunk],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Large documents are embedded and stored one window at a time."""
+        monkeypatch.setattr(MemoryAgent, "WRITE_WINDOW_CHUNKS", 2)
+        window_sizes: list[int] = []
+        add_documents = memory_agent.store.add_documents
+
+        async def _record(**kwargs: Any) -> None:
+            window_sizes.append(len(kwargs["chunk_ids"]))
+            await add_documents(**kwargs)
+
+        monkeypatch.setattr(memory_agent.store, "add_documents", _record)
+
+        await memory_agent.add_documents(sample_chunks, {"source_id": "doc"})
+
+        assert window_sizes == [2, 1]
+        assert await memory_agent.count_documents() == 3
+
+    @pytest.mark.unit
+    async def test_empty_chunks_skip_embedding_and_store(
+        self, memory_agent: MemoryAgent, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Empty inputs return before touching the model or the store."""
+
+        def _fail(*_args: Any, **_kwargs: Any) -> None:
+            raise AssertionError("should not be called")
+
+        monkeypatch.setattr(memory_agent.embedding_generator, "embed_batch", _fail)
+        monkeypatch.setattr(memory_agent.store, "add_documents", _fail)
+
+        source = {"source_id": "doc"}
+        assert await memory_agent.add_documents([], source) == []
+        assert await memory_agent.add_document_batch([([], source)]) == [[]]
+
     @pytest.mark.unit
     async def test_retrieve_no_results(
         self,
@@ -203,6 +242,23 @@ class TestMemoryAgent:
         assert "1234" in top_result.content
         assert top_result.chunk_id == "secret_001"
 
+    @pytest.mark.unit
+    async def test_search_batch_answers_each_query(
+        self,
+        memory_agent: MemoryAgent,
+        sample_chunks: list[ParsedChunk],
+    ) -> None:
+        """Batched queries return one result per query, in input order."""
+        await memory_agent.add_documents(sample_chunks, {"source_id": "doc"})
+
+        results = await memory_agent.search_batch(
+            ["first query", "second query"], top_k=2, min_score=0.0
+        )
+
+        assert len(results) == 2
+        assert all(isinstance(result, MemoryOutput) for result in results)
+        assert await memory_agent.search_batch([]) == []
+
     @pytest.mark.unit
     async def test_metadata_filtering(
         self,
@@ -0,0 +1,50 @@
+"""Unit tests for the shared retry backoff helper."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import pytest
+
+from app.services.backoff import backoff_delay
+
+
+class TestBackoffDelay:
+    """Test suite for the jittered backoff helper."""
+
+    @pytest.mark.unit
+    def test_full_jitter_within_capped_ceiling(self) -> None:
+        """Delays stay between zero and the capped exponential ceiling."""
+        for attempt in range(8):
+            ceiling = min(30, 2 * (2**attempt))
+            for _ in range(50):
+                delay = backoff_delay(attempt, initial_seconds=2, max_seconds=30)
+                assert 0 <= delay <= ceiling
+
+    @pytest.mark.unit
+    def test_jitter_spreads_delays(self) -> None:
+        """Concurrent retries should not all wake on the same tick."""
+        delays = {
+            backoff_delay(3, initial_seconds=1, max_seconds=30) for _ in range(20)
+        }
+        assert len(delays) > 1
+
+    @pytest.mark.unit
+    def test_retry_after_seconds_honored(self) -> None:
+        """A numeric Retry-After header overrides the computed delay."""
+        delay = backoff_delay(0, initial_seconds=1, max_seconds=30, retry_after="7")
+        assert delay == 7.0
+
+    @pytest.mark.unit
+    def test_retry_after_capped_and_dates_parsed(self) -> None:
+        """Retry-After dates are parsed and every delay respects the cap."""
+        when = format_datetime(datetime.now(UTC) + timedelta(seconds=120), usegmt=True)
+        delay = backoff_delay(0, initial_seconds=1, max_seconds=30, retry_after=when)
+        assert delay == 30
+
+    @pytest.mark.unit
+    def test_invalid_retry_after_falls_back_to_jitter(self) -> None:
+        """An unparsable Retry-After header falls back to jittered backoff."""
+        delay = backoff_delay(1, initial_seconds=1, max_seconds=30, retry_after="soon")
+        assert 0 <= delay <= 2
@@ -12,6 +12,7 @@ Reference: docs/04_TEST_PLAN.md Section 3.7
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, Mock, patch
 
 import httpx
@@ -21,7 +22,12 @@ from openai.types.chat import ChatCompletion, ChatCompletionMessage
 from openai.types.chat.chat_completion import Choice
 
 from app.schemas import AgentFailure, ErrorCodes
-from app.services.llm import LLMService
+from app.services.llm import (
+    LLMService,
+    _get_encoder,
+    close_llm_service,
+    get_llm_service,
+)
 
 
 @pytest.mark.unit
@@ -70,13 +76,16 @@ class TestLLMService:
                 mock_openai_class.return_value = mock_client
 
                 service = LLMService()
-                result = await service.generate(
-                    prompt="Test prompt", system="Test system", temperature=0.5
-                )
+                with patch("app.services.llm._get_encoder") as mock_encoder:
+                    result = await service.generate(
+                        prompt="Test prompt", system="Test system", temperature=0.5
+                    )
 
                 assert isinstance(result, str)
                 assert result == "Test response"
                 mock_client.chat.completions.create.assert_called_once()
+                # The request log uses the cheap estimate, never the tokenizer
+                mock_encoder.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_anthropic_generate_success(self) -> None:
@@ -159,6 +168,7 @@ class TestLLMService:
                 # First call raises 429, second succeeds
                 mock_response_429 = Mock(spec=httpx.Response)
                 mock_response_429.status_code = 429
+                mock_response_429.headers = httpx.Headers()
                 mock_response_429.text = "Rate limit exceeded"
 
                 mock_client.chat.completions.create = AsyncMock(
@@ -342,6 +352,7 @@ class TestLLMService:
                 mock_client = AsyncMock()
                 mock_response_500 = Mock(spec=httpx.Response)
                 mock_response_500.status_code = 500
+                mock_response_500.headers = httpx.Headers()
                 mock_response_500.text = "Internal server error"
 
                 # Always raise 500 error
@@ -402,6 +413,7 @@ class TestLLMService:
                 mock_client = AsyncMock()
                 mock_response_503 = Mock(spec=httpx.Response)
                 mock_response_503.status_code = 503
+                mock_response_503.headers = httpx.Headers()
                 mock_response_503.text = "Service unavailable"
 
                 mock_client.chat.completions.create = AsyncMock(
@@ -465,3 +477,228 @@ class TestLLMService:
                 assert result.recoverable is False
                 # Should not retry for 400 error
                 assert mock_client.chat.completions.create.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_service_reuses_one_pooled_client(self) -> None:
+        """Test get_llm_service shares one client that shutdown closes."""
+        with patch("app.services.llm.get_settings") as mock_settings:
+            settings = Mock()
+            settings.llm_provider = "openai"
+            settings.llm_model = "gpt-4o"
+            settings.openai_api_key = "test-key"
+            settings.anthropic_api_key = ""
+            settings.llm_max_retries = 3
+            settings.llm_timeout_seconds = 30
+            mock_settings.return_value = settings
+
+            get_llm_service.cache_clear()
+            try:
+                service = get_llm_service()
+                assert get_llm_service() is service
+
+                client = service._get_client()
+                http_client = client._client
+                pool = http_client._transport._pool
+                assert pool._max_connections == LLMService.MAX_CONNECTIONS
+                assert pool._keepalive_expiry == LLMService.KEEPALIVE_EXPIRY_SECONDS
+
+                await close_llm_service()
+                assert http_client.is_closed
+                assert service._client is None
+            finally:
+                get_llm_service.cache_clear()
+
+    @pytest.mark.asyncio
+    async def test_retry_honors_retry_after_header(self) -> None:
+        """Test a provider Retry-After header sets the backoff delay."""
+        with patch("app.services.llm.get_settings") as mock_settings:
+            settings = Mock()
+            settings.llm_provider = "openai"
+            settings.llm_model = "gpt-4o"
+            settings.openai_api_key = "test-key"
+            settings.anthropic_api_key = ""
+            settings.llm_max_retries = 3
+            settings.llm_timeout_seconds = 30
+            settings.llm_temperature = 0.7
+            settings.llm_max_tokens = 2048
+            mock_settings.return_value = settings
+
+            mock_response_429 = Mock(spec=httpx.Response)
+            mock_response_429.status_code = 429
+            mock_response_429.headers = httpx.Headers({"retry-after": "3"})
+            call = AsyncMock(
+                side_effect=[
+                    httpx.HTTPStatusError(
+                        "Rate limit", request=Mock(), response=mock_response_429
+                    ),
+                    "ok",
+                ]
+            )
+
+            with patch("asyncio.sleep") as mock_sleep:
+                service = LLMService()
+                result = await service._retry_with_backoff(call)
+
+            assert result == "ok"
+            mock_sleep.assert_called_once_with(3.0)
+
+    @pytest.mark.asyncio
+    async def test_deterministic_responses_are_cached(self) -> None:
+        """Test temperature-0 repeats are served from the response cache."""
+        with patch("app.services.llm.get_settings") as mock_settings:
+            settings = Mock()
+            settings.llm_provider = "openai"
+            settings.llm_model = "gpt-4o"
+            settings.openai_api_key = "test-key"
+            settings.anthropic_api_key = ""
+            settings.llm_max_retries = 3
+            settings.llm_timeout_seconds = 30
+            settings.llm_temperature = 0.7
+            settings.llm_max_tokens = 2048
+            settings.llm_cache_policy = "enabled"
+            mock_settings.return_value = settings
+
+            with patch.object(
+                LLMService, "_generate_openai", AsyncMock(return_value="Cached")
+            ) as mock_generate:
+                service = LLMService()
+                first = await service.generate(prompt="Q", temperature=0.0)
+                second = await service.generate(prompt="Q", temperature=0.0)
+                sampled = await service.generate(prompt="Q", temperature=0.5)
+
+            assert first == second == sampled == "Cached"
+            # The sampled request bypasses the cache and hits the provider.
+            assert mock_generate.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_replay_policy_never_calls_provider(self) -> None:
+        """Test replay mode turns a cache miss into an AgentFailure."""
+        with patch("app.services.llm.get_settings") as mock_settings:
+            settings = Mock()
+            settings.llm_provider = "openai"
+            settings.llm_model = "gpt-4o"
+            settings.openai_api_key = "test-key"
+            settings.anthropic_api_key = ""
+            settings.llm_max_retries = 3
+            settings.llm_timeout_seconds = 30
+            settings.llm_temperature = 0.7
+            settings.llm_max_tokens = 2048
+            settings.llm_cache_policy = "replay"
+            mock_settings.return_value = settings
+
+            with patch.object(LLMService, "_generate_openai", AsyncMock()) as mock_gen:
+                service = LLMService()
+                result = await service.generate(prompt="Q", temperature=0.0)
+
+            assert isinstance(result, AgentFailure)
+            assert result.recoverable is False
+            mock_gen.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_token_counting_loads_tokenizer_once(self) -> None:
+        """Test count_tokens uses tiktoken and caches the encoding per model."""
+        with patch("app.services.llm.get_settings") as mock_settings:
+            settings = Mock()
+            settings.llm_provider = "anthropic"
+            settings.llm_model = "claude-test"
+            settings.openai_api_key = ""
+            settings.anthropic_api_key = "test-key"
+            mock_settings.return_value = settings
+
+            encoder = Mock()
+            encoder.encode.side_effect = lambda text, **_: text.split()
+            fake_tiktoken = Mock()
+            fake_tiktoken.encoding_for_model.side_effect = KeyError("claude-test")
+            fake_tiktoken.get_encoding.return_value = encoder
+
+            _get_encoder.cache_clear()
+            try:
+                with patch("app.services.llm.tiktoken", fake_tiktoken):
+                    service = LLMService()
+                    assert await service.count_tokens("one two three") == 3
+                    assert await service.count_tokens("four five") == 2
+            finally:
+                _get_encoder.cache_clear()
+
+            fake_tiktoken.get_encoding.assert_called_once_with("cl100k_base")
+
+    @pytest.mark.asyncio
+    async def test_prompt_cache_hits_are_tracked(self) -> None:
+        """Test OpenAI cached prompt tokens feed the prompt-cache hit rate."""
+        with patch("app.services.llm.get_settings") as mock_settings:
+            settings = Mock()
+            settings.llm_provider = "openai"
+            settings.llm_model = "gpt-4o"
+            settings.openai_api_key = "test-key"
+            settings.anthropic_api_key = ""
+            settings.llm_max_retries = 3
+            settings.llm_timeout_seconds = 30
+            settings.llm_temperature = 0.7
+            settings.llm_max_tokens = 2048
+            mock_settings.return_value = settings
+
+            mock_completion = ChatCompletion(
+                id="test-id",
+                object="chat.completion",
+                created=1234567890,
+                model="gpt-4o",
+                choices=[
+                    Choice(
+                        index=0,
+                        message=ChatCompletionMessage(role="assistant", content="ok"),
+                        finish_reason="stop",
+                    )
+                ],
+                usage={
+                    "prompt_tokens": 2000,
+                    "completion_tokens": 5,
+                    "total_tokens": 2005,
+                    "prompt_tokens_details": {"cached_tokens": 1536},
+                },
+            )
+
+            with patch("app.services.llm.AsyncOpenAI") as mock_openai_class:
+                mock_client = AsyncMock()
+                mock_client.chat.completions.create = AsyncMock(
+                    return_value=mock_completion
+                )
+                mock_openai_class.return_value = mock_client
+
+                service = LLMService()
+                assert service.prompt_cache_hit_rate == 0.0
+                await service.generate(prompt="Test prompt")
+
+            assert service.prompt_cache_hit_rate == pytest.approx(0.768)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_call(self) -> None:
+        """Test in-flight temperature-0 duplicates wait on the same call."""
+        with patch("app.services.llm.get_settings") as mock_settings:
+            settings = Mock()
+            settings.llm_provider = "openai"
+            settings.llm_model = "gpt-4o"
+            settings.openai_api_key = "test-key"
+            settings.anthropic_api_key = ""
+            settings.llm_max_retries = 3
+            settings.llm_timeout_seconds = 30
+            settings.llm_temperature = 0.7
+            settings.llm_max_tokens = 2048
+            settings.llm_cache_policy = "disabled"
+            mock_settings.return_value = settings
+
+            async def slow_generate(*_: object) -> str:
+                await asyncio.sleep(0)
+                return "Shared"
+
+            with patch.object(
+                LLMService, "_generate_openai", AsyncMock(side_effect=slow_generate)
+            ) as mock_generate:
+                service = LLMService()
+                results = await asyncio.gather(
+                    *(service.generate(prompt="Q", temperature=0.0) for _ in range(3)),
+                    service.generate(prompt="Other", temperature=0.0),
+                )
+
+            assert results == ["Shared"] * 4
+            assert mock_generate.call_count == 2
+            assert service._in_flight == {}
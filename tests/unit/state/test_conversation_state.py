@@ -5,6 +5,7 @@ Test Class: TestConversationState
 """
 
 import pytest
+from pydantic import ValidationError
 
 from app.schemas import ConversationState
 
@@ -25,7 +26,7 @@ class TestConversationState:
         assert len(state.history) == 2
         assert state.history[0].role == "user"
         assert state.history[0].content == "Hello"
-        assert state.history[0].timestamp is not None
+        assert state.history[0].timestamp.tzinfo is not None
         assert state.history[1].role == "assistant"
 
     @pytest.mark.unit
@@ -63,3 +64,27 @@ class TestConversationState:
         assert restored.session_id == state.session_id
         assert len(restored.history) == 1
         assert restored.user_preferences == {"theme": "dark"}
+
+    @pytest.mark.unit
+    def test_history_is_bounded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """History keeps only the most recent MAX_HISTORY messages."""
+        monkeypatch.setattr(ConversationState, "MAX_HISTORY", 3)
+        state = ConversationState(session_id="test-session")
+
+        for turn in range(5):
+            state.add_message("user", f"message {turn}")
+
+        assert [message.content for message in state.history] == [
+            "message 2",
+            "message 3",
+            "message 4",
+        ]
+
+    @pytest.mark.unit
+    def test_messages_are_immutable(self) -> None:
+        """Recorded messages cannot be edited after the fact."""
+        state = ConversationState(session_id="test-session")
+        state.add_message("user", "Hello")
+
+        with pytest.raises(ValidationError):
+            state.history[0].content = "edited"  # type: ignore[misc]
@@ -7,6 +7,7 @@ Tests for retrieval, answer generation, and unified query pipeline.
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from pydantic import BaseModel
 
 from brain.engine import RAGEngine
 from brain.schemas import (
@@ -247,6 +248,130 @@ async def test_retrieve_uses_config_defaults(mock_vector_store, mock_llm_client)
     assert kwargs.get("top_k") == 3
 
 
+@pytest.mark.asyncio
+async def test_retrieve_passes_only_supported_search_keywords(
+    mock_llm_client, mock_search_results
+):
+    """Test stores with narrower search() signatures are called without errors."""
+
+    class SimpleStore:
+        def __init__(self):
+            self.calls = []
+
+        async def search(self, query):
+            self.calls.append(query)
+            return mock_search_results
+
+    class TopKStore(SimpleStore):
+        async def search(self, query, top_k=5):
+            self.calls.append((query, top_k))
+            return mock_search_results
+
+    simple, top_k_only = SimpleStore(), TopKStore()
+    filters = {"source": "doc1"}
+
+    for store in (simple, top_k_only):
+        engine = RAGEngine(vector_store=store, llm_client=mock_llm_client)
+        results = await engine.retrieve("test", top_k=2, filters=filters)
+        assert len(results) == 2
+
+    assert simple.calls == ["test"]
+    assert top_k_only.calls == [("test", 2)]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_batch_uses_store_search_batch(mock_llm_client):
+    """Test that retrieve_batch answers all queries with one search_batch call."""
+    # Arrange
+    calls = []
+
+    class BatchStore:
+        async def search(self, query):
+            raise AssertionError(f"search() should not be used for {query!r}")
+
+        async def search_batch(self, queries, top_k=5):
+            calls.append((list(queries), top_k))
+            return [
+                [{"id": f"{query}-1", "content": query, "score": 0.9}]
+                for query in queries
+            ]
+
+    engine = RAGEngine(vector_store=BatchStore(), llm_client=mock_llm_client)
+
+    # Act
+    results = await engine.retrieve_batch(["alpha", "", "beta"], top_k=3)
+
+    # Assert
+    assert calls == [(["alpha", "beta"], 3)]
+    assert [node.text for node in results[0]] == ["alpha"]
+    assert isinstance(results[1], RAGFailure)
+    assert results[1].error_code == RAGErrorCodes.INVALID_QUERY
+    assert [node.text for node in results[2]] == ["beta"]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_batch_reports_malformed_store_results(mock_llm_client):
+    """Test that results not shaped as list[list[dict]] become failures."""
+
+    # Arrange
+    class StoreOutput(BaseModel):
+        results: list[str] = []
+
+    class MismatchedStore:
+        async def search(self, query):
+            raise AssertionError(f"search() should not be used for {query!r}")
+
+        async def search_batch(self, queries):
+            return [StoreOutput(), [("id", "x")]][: len(queries)]
+
+    engine = RAGEngine(vector_store=MismatchedStore(), llm_client=mock_llm_client)
+
+    # Act
+    shaped = await engine.retrieve_batch(["alpha", "beta"])
+    short = await engine.retrieve_batch(["alpha", "beta", "gamma"])
+
+    # Assert
+    assert all(isinstance(result, RAGFailure) for result in shaped + short)
+    assert all(result.error_code == RAGErrorCodes.RETRIEVAL_FAILED for result in shaped)
+    assert "StoreOutput" in shaped[0].message
+    assert "2 result lists for 3 queries" in short[0].message
+
+
+@pytest.mark.asyncio
+async def test_retrieve_batch_falls_back_to_concurrent_search(mock_llm_client):
+    """Test that stores without search_batch are searched per query."""
+
+    # Arrange
+    calls = []
+
+    class SearchOnlyStore:
+        async def search(self, query, top_k=5, filters=None):
+            calls.append((query, top_k, filters))
+            if query == "broken":
+                raise RuntimeError("Connection failed")
+            return [
+                {"id": "hit", "content": query, "score": 0.9},
+                {"id": "miss", "content": "low", "score": 0.1},
+            ]
+
+    engine = RAGEngine(vector_store=SearchOnlyStore(), llm_client=mock_llm_client)
+
+    # Act
+    results = await engine.retrieve_batch(
+        ["alpha", "broken"], top_k=2, min_score=0.5, filters={"source": "doc1"}
+    )
+
+    # Assert
+    assert sorted(calls) == [
+        ("alpha", 2, {"source": "doc1"}),
+        ("broken", 2, {"source": "doc1"}),
+    ]
+    assert [node.text for node in results[0]] == ["alpha"]
+    assert isinstance(results[1], RAGFailure)
+    assert results[1].error_code == RAGErrorCodes.RETRIEVAL_FAILED
+    assert "Connection failed" in results[1].message
+
+
 # =============================================================================
 # NEW: Error Handling Tests
 # =============================================================================
@@ -457,6 +582,52 @@ async def test_truncation_prioritizes_high_score_context(rag_engine, mock_llm_cl
     # Low score content should NOT be in prompt (truncated)
 
 
+def test_truncate_context_orders_by_score_with_stable_ties(rag_engine):
+    """Equal scores keep their input order, like a stable sort."""
+    context = [
+        ContextNode(id="tie-1", text="a" * 10, score=0.8, metadata={}),
+        ContextNode(id="best", text="b" * 10, score=0.9, metadata={}),
+        ContextNode(id="tie-2", text="c" * 10, score=0.8, metadata={}),
+        ContextNode(id="worst", text="d" * 10, score=0.1, metadata={}),
+    ]
+
+    kept = rag_engine._truncate_context(context, max_tokens=8)  # 32 chars
+
+    assert [node.id for node in kept] == ["best", "tie-1", "tie-2"]
+
+
+def test_truncate_context_uses_token_counter(mock_vector_store, mock_llm_client):
+    """An injected token counter sets the budget in tokens, not characters."""
+    engine = RAGEngine(
+        vector_store=mock_vector_store,
+        llm_client=mock_llm_client,
+        token_counter=lambda text: len(text.split()),
+    )
+    context = [
+        ContextNode(id="short", text="two words", score=0.9, metadata={}),
+        ContextNode(id="long", text="w " * 40, score=0.8, metadata={}),
+        ContextNode(id="tiny", text="one", score=0.7, metadata={}),
+    ]
+
+    # A 3-token budget; the 40-token node does not fit and ends packing.
+    kept = engine._truncate_context(context, max_tokens=3)
+
+    assert [node.id for node in kept] == ["short"]
+
+
+def test_truncate_context_skips_duplicate_text(rag_engine):
+    """Repeated chunk text is kept once, at its best score."""
+    context = [
+        ContextNode(id="copy", text="same words", score=0.7, metadata={}),
+        ContextNode(id="original", text="same words", score=0.9, metadata={}),
+        ContextNode(id="other", text="other text", score=0.8, metadata={}),
+    ]
+
+    kept = rag_engine._truncate_context(context, max_tokens=5)  # 20 chars
+
+    assert [node.id for node in kept] == ["original", "other"]
+
+
 # =============================================================================
 # NEW: Citation Tests
 # =============================================================================
@@ -498,6 +669,21 @@ async def test_generate_answer_can_disable_citations(
     assert answer.citations == []
 
 
+def test_build_citations_truncates_long_snippets(rag_engine):
+    """Test snippets over 100 characters are cut and marked with an ellipsis."""
+    context = [
+        ContextNode(id="long", text="a" * 101, score=0.9, source_id="doc"),
+        ContextNode(id="short", text="b" * 100, score=0.8),
+    ]
+
+    citations = rag_engine._build_citations(context)
+
+    assert citations[0].text_snippet == "a" * 100 + "..."
+    assert citations[0].source_id == "doc"
+    assert citations[1].text_snippet == "b" * 100
+    assert citations[1].source_id == "short"
+
+
 # =============================================================================
 # NEW: System Prompt Tests
 # =============================================================================
@@ -521,6 +707,21 @@ async def test_generate_answer_includes_system_prompt(
     assert "You are a helpful assistant" in prompt
 
 
+def test_build_prompt_keeps_shared_prefix_before_request_parts(
+    rag_engine, mock_context_data
+):
+    """Test the system prompt leads and per-request text only follows it."""
+    system = "You are a helpful assistant. Be concise."
+
+    first = rag_engine._build_prompt("first?", mock_context_data, system)
+    second = rag_engine._build_prompt("second?", mock_context_data[:1], system)
+
+    assert first.startswith(f"{system}\n\nContext:\n")
+    assert second.startswith(f"{system}\n\nContext:\n")
+    assert first.endswith("Query: first?")
+    assert rag_engine._build_prompt("q", [], None) == "Query: q"
+
+
 # =============================================================================
 # NEW: Persona and Confidence Tests (per docs/02_AGENT_SPECS.md)
 # =============================================================================
@@ -609,3 +810,56 @@ async def test_retrieve_populates_source_fields(rag_engine, mock_vector_store):
     assert len(results) == 1
     assert results[0].source_id == "doc123"
     assert results[0].source_url == "http://example.com/doc"
+
+
+# =============================================================================
+# NEW: Streaming Query Tests
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_query_stream_yields_llm_chunks(
+    rag_engine, mock_vector_store, mock_llm_client, mock_search_results
+):
+    """Test that query_stream() forwards chunks from stream_complete()."""
+    # Arrange
+    mock_vector_store.search.return_value = mock_search_results
+    prompts: list[str] = []
+
+    async def stream_complete(prompt):
+        prompts.append(prompt)
+        for chunk in ("The sky ", "is blue."):
+            yield chunk
+
+    mock_llm_client.stream_complete = stream_complete
+
+    # Act
+    chunks = [chunk async for chunk in rag_engine.query_stream("Sky colour?")]
+
+    # Assert
+    assert chunks == ["The sky ", "is blue."]
+    assert "The sky is blue." in prompts[0]
+    mock_llm_client.complete.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_query_stream_falls_back_and_reports_failures(
+    mock_vector_store, mock_search_results
+):
+    """Test non-streaming clients yield one chunk and errors yield RAGFailure."""
+    # Arrange
+    llm_client = MagicMock(spec=["complete"])
+    llm_client.complete = AsyncMock(return_value="Whole answer")
+    engine = RAGEngine(vector_store=mock_vector_store, llm_client=llm_client)
+    mock_vector_store.search.return_value = mock_search_results
+
+    # Act
+    chunks = [chunk async for chunk in engine.query_stream("Sky colour?")]
+    mock_vector_store.search.return_value = []
+    empty = [chunk async for chunk in engine.query_stream("Sky colour?")]
+
+    # Assert
+    assert chunks == ["Whole answer"]
+    assert len(empty) == 1
+    assert isinstance(empty[0], RAGFailure)
+    assert empty[0].error_code == RAGErrorCodes.NO_RELEVANT_CONTEXT